@@ -0,0 +1,31 @@
+"""
+Accuracy and speed of the explicit z-models against DAK. Each model is evaluated on a 300 x 100 Pr-Tr grid over its
+own working range (MODEL_RANGES), and compared with DAK on the same grid. Reports the average and maximum absolute
+relative errors, and the cost per point of calc_z_array on 1,000,000 random points of the range.
+
+python benchmarks/bench_explicit.py
+"""
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append('.')
+import gascompressibility as gc
+from gascompressibility.z_correlation import z_helper
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    print('%-12s %-12s %-12s %10s %10s %14s' % ('zmodel', 'Tr', 'Pr', 'AARE (%)', 'max (%)', 'ns per point'))
+    for zmodel in z_helper.explicit_models + ['DAK']:
+        Tr_range = z_helper.MODEL_RANGES[zmodel]['Tr']
+        Pr_range = z_helper.MODEL_RANGES[zmodel]['Pr']
+        Prs, Trs = np.meshgrid(np.linspace(*Pr_range, 300), np.linspace(*Tr_range, 100))
+        expected = gc.calc_z_array(Pr=Prs, Tr=Trs, zmodel='DAK')
+        error = np.abs(gc.calc_z_array(Pr=Prs, Tr=Trs, zmodel=zmodel) - expected) / expected * 100
+
+        Pr = rng.uniform(*Pr_range, 1000000)
+        Tr = rng.uniform(*Tr_range, 1000000)
+        cost = min(timeit.repeat(lambda: gc.calc_z_array(Pr=Pr, Tr=Tr, zmodel=zmodel), number=1, repeat=3)) / Pr.size * 1e9
+        print('%-12s %-12s %-12s %10.3f %10.2f %14.1f' % (zmodel, Tr_range, Pr_range, error.mean(), error.max(), cost))
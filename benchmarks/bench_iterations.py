@@ -0,0 +1,52 @@
+"""
+Compares the number of iterations and function evaluations needed to solve the reduced-density kernels of the implicit
+z-factor models (model_kernels, the functions the solver runs) with the secant method (scipy.optimize.newton without
+fprime), Newton's method with the analytic derivatives, and Halley's method with the analytic first and second
+derivatives, over a grid spanning MODEL_RANGES of each model.
+
+python benchmarks/bench_iterations.py
+"""
+import sys
+
+import numpy as np
+from scipy import optimize
+
+sys.path.append('.')
+from gascompressibility.z_correlation.z_helper import model_kernels, MODEL_RANGES, _get_smart_guess
+
+
+def count(zmodel, method, tol):
+    coefficients, func, fprime, fprime2 = model_kernels[zmodel]
+    if method == 'secant':
+        fprime = fprime2 = None
+    elif method == 'newton':
+        fprime2 = None
+    Prs = np.linspace(*MODEL_RANGES[zmodel]['Pr'], 60)
+    Trs = np.linspace(*MODEL_RANGES[zmodel]['Tr'], 41)
+    iterations = 0
+    funcalls = 0
+    failures = 0
+    for Tr in Trs:
+        c = coefficients(Tr)
+        for Pr in Prs:
+            a = c[0] * Pr
+            guess = _get_smart_guess(Pr, Tr, zmodel)
+            try:
+                _, r = optimize.newton(func, a / guess, fprime=fprime, fprime2=fprime2, args=(a,) + tuple(c[1:]),
+                                       tol=tol, maxiter=50, full_output=True)
+                iterations += r.iterations
+                funcalls += r.function_calls
+            except RuntimeError:
+                failures += 1
+    return iterations, funcalls, failures, Prs.size * Trs.size - failures
+
+
+if __name__ == '__main__':
+    print('(iterations and function calls are averaged over the converged points)')
+    for tol in [1.48e-08, 1e-12]:
+        print('\ntol = %s' % tol)
+        print('%-16s %-8s %12s %12s %10s' % ('zmodel', 'method', 'iterations', 'func calls', 'failures'))
+        for zmodel in model_kernels:
+            for method in ['secant', 'newton', 'halley']:
+                iterations, funcalls, failures, n = count(zmodel, method, tol)
+                print('%-16s %-8s %12.2f %12.2f %10d' % (zmodel, method, iterations / n, funcalls / n, failures))
@@ -0,0 +1,30 @@
+"""
+Per-call cost of a single-point z-factor calculation: the general path of calc_z (pseudo-critical class objects and
+scipy.optimize.newton, forced here with ps_props=True), calc_z with the common argument pattern that dispatches
+to the scalar fast path, and calc_z_scalar called directly.
+
+python benchmarks/bench_scalar.py
+"""
+import sys
+import timeit
+
+sys.path.append('.')
+import gascompressibility as gc
+
+
+def per_call(stmt, number, repeat=5):
+    # the best of many short runs, which filters out the interruptions of a busy machine
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e6
+
+
+if __name__ == '__main__':
+    print('%-16s %-8s %16s %16s %16s' % ('zmodel', 'pmodel', 'general (us)', 'calc_z (us)', 'calc_z_scalar (us)'))
+    for zmodel in ['DAK', 'hall_yarborough', 'londono', 'kareem']:
+        for pmodel in ['piper', 'sutton']:
+            general = per_call(lambda: gc.calc_z(sg=0.7, P=2010, T=75, H2S=0.07, CO2=0.1, pmodel=pmodel,
+                                                 zmodel=zmodel, ps_props=True), 20)
+            dispatched = per_call(lambda: gc.calc_z(sg=0.7, P=2010, T=75, H2S=0.07, CO2=0.1, pmodel=pmodel,
+                                                    zmodel=zmodel), 1000, 100)
+            scalar = per_call(lambda: gc.calc_z_scalar(0.7, 2010, 75, H2S=0.07, CO2=0.1, pmodel=pmodel,
+                                                       zmodel=zmodel), 1000, 100)
+            print('%-16s %-8s %16.1f %16.2f %16.2f' % (zmodel, pmodel, general, dispatched, scalar))
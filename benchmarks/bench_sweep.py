@@ -0,0 +1,57 @@
+"""
+Compares calc_z_array (every point solved from the standard initial guesses) with calc_z_sweep (warm starts from the
+neighbouring solutions) on the quickstart grid of Pr sweeps, and on a long isotherm. Reports the wall time, and the
+number of evaluations of the kernel of the z-model per point, counted on every element of every call.
+
+python benchmarks/bench_sweep.py
+"""
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('.')
+from gascompressibility.z_correlation import z_helper
+
+
+def count_evaluations(f, zmodel, **kwargs):
+    coefficients, func, fprime, fprime2 = z_helper.model_kernels[zmodel]
+    counter = [0]
+
+    def counted(x, *args):
+        counter[0] += np.size(x)
+        return func(x, *args)
+
+    z_helper.model_kernels[zmodel] = (coefficients, counted, fprime, fprime2)
+    try:
+        Z = f(zmodel=zmodel, **kwargs)
+    finally:
+        z_helper.model_kernels[zmodel] = (coefficients, func, fprime, fprime2)
+    return counter[0] / Z.size
+
+
+def timeit(f, repeat=5, **kwargs):
+    best = np.inf
+    for _ in range(repeat):
+        t = time.perf_counter()
+        f(**kwargs)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    cases = {
+        'quickstart grid (16 x 299)': dict(
+            Pr=np.linspace(0.2, 30, 299),
+            Tr=np.array([1.05, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.2, 2.4, 2.6, 2.8, 3.0])[:, np.newaxis],
+        ),
+        'isotherm (100000)': dict(Pr=np.linspace(0.2, 30, 100000), Tr=1.5),
+    }
+    print('%-28s %-16s %-14s %10s %14s' % ('case', 'zmodel', 'function', 'time (ms)', 'evals/point'))
+    for case, kwargs in cases.items():
+        for zmodel in ['DAK', 'hall_yarborough', 'londono']:
+            for f in [z_helper.calc_z_array, z_helper.calc_z_sweep]:
+                print('%-28s %-16s %-14s %10.2f %14.2f' % (
+                    case, zmodel, f.__name__, timeit(f, zmodel=zmodel, **kwargs) * 1000,
+                    count_evaluations(f, zmodel, **kwargs)
+                ))
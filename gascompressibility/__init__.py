@@ -1,6 +1,27 @@
 
+__version__ = '1.0.0'
+
 from gascompressibility import pseudocritical
 from gascompressibility import z_correlation
+from gascompressibility.pseudocritical import piper_pseudocritical
+from gascompressibility.pseudocritical import sutton_pseudocritical
 from gascompressibility.z_correlation.z_helper import calc_z
+from gascompressibility.z_correlation.z_helper import calc_z_array
+from gascompressibility.z_correlation.z_helper import calc_z_scalar
+from gascompressibility.z_correlation.z_helper import calc_z_sweep
+from gascompressibility.z_correlation.z_helper import ZCache
+from gascompressibility.z_correlation.z_helper import ZDiskCache
+from gascompressibility.z_correlation.z_helper import enable_z_cache
+from gascompressibility.z_correlation.z_helper import disable_z_cache
+from gascompressibility.z_correlation.z_helper import get_z_cache
+from gascompressibility.z_correlation.z_result import ZResult
+from gascompressibility.z_correlation.z_table import ZTable
+from gascompressibility.z_correlation.z_table import set_default_table
+from gascompressibility.z_correlation.z_chebyshev import ChebyshevSurrogate
+from gascompressibility.z_correlation.z_chebyshev import fit_chebyshev
+from gascompressibility.z_correlation.z_isotherm import ZIsotherm
+from gascompressibility.z_correlation.z_isotherm import calc_z_isotherm
+from gascompressibility.z_correlation.z_mixture import GasMixture
+from gascompressibility.z_correlation.z_guess import GuessMap
 from gascompressibility.z_correlation.z_helper import quickstart
 from gascompressibility.utilities.utilities import *
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .sutton import Sutton
 from .piper import Piper
-
+from .sutton import sutton_pseudocritical
+from .piper import piper_pseudocritical
@@ -0,0 +1,235 @@
+"""
+Lazy evaluation of the pseudo-critical properties over a declarative dependency graph.
+
+Each pseudo-critical model declares its inputs (``sg``, ``T``, ``P``, and the impurities) and its nodes (``J``,
+``Tpc``, ``Tr``, ...), with the function computing each node and the nodes it reads. A node is computed at most once,
+when it is first needed, and is invalidated only when one of its upstream inputs changes. The keyword arguments are
+checked by walking the same graph from the requested property: a required input the call doesn't provide is missing,
+and an argument of the method computing a node given as input conflicts with that node.
+"""
+
+
+class _Property(object):
+    """attribute of the model object that reads (and lazily computes) a node of the graph"""
+
+    def __init__(self, name, doc=None):
+        self.name = name
+        self.__doc__ = doc
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._peek(self.name)
+
+    def __set__(self, instance, value):
+        instance._assign({self.name: value})
+
+
+def _is_same_value(current, value):
+    """True if an input is set again to its current value. Arrays are compared by identity only"""
+    if current is value:
+        return True
+    return isinstance(current, (int, float)) and isinstance(value, (int, float)) and current == value
+
+
+def _build_graph(inputs, nodes):
+    """
+    Returns the rank of each input and node in a topological order of the graph, and their upstream names,
+    ancestors and descendants.
+
+    :param inputs: dict, name of an input -> default value, or None if the input is required
+    :param nodes: dict, name of a node -> (function of the model object computing the node, names read by the function)
+    """
+    upstream = {name: () for name in inputs}
+    upstream.update({name: tuple(names) for name, (_, names) in nodes.items()})
+
+    order = []
+    def visit(name):
+        if name not in order:
+            for parent in upstream[name]:
+                visit(parent)
+            order.append(name)
+    for name in upstream:
+        visit(name)
+
+    ancestors = {}
+    for name in order:
+        ancestors[name] = set(upstream[name])
+        for parent in upstream[name]:
+            ancestors[name] |= ancestors[parent]
+    descendants = {name: set(child for child in order if name in ancestors[child]) for name in order}
+    rank = {name: i for i, name in enumerate(order)}
+    return rank, upstream, ancestors, descendants
+
+
+class PseudocriticalGraph(object):
+    """
+    Base class of the pseudo-critical models. Subclasses declare ``_inputs``, ``_nodes`` and ``_ps_props_keys``, and
+    build the graph in the class body with ``_build_graph``.
+
+    Keyword arguments passed to the ``calc_...()`` methods update the inputs of the object, or override nodes that
+    would be computed otherwise. Every call must provide the required inputs (sg, T, P) it reads, like a fresh call.
+    Passing the same values again keeps the properties computed by the previous calls, so that they are reused.
+    Optional inputs left to None (the impurities) go back to their defaults, and nodes left to None are computed
+    again.
+
+    The order of the upstream names of each node is the order its arguments are checked in, and ``_calc_arguments``
+    lists the keyword arguments of the method computing each node, which conflict with the node given as input.
+    """
+
+    _inputs = {}
+    _nodes = {}
+    _ps_props_keys = ()
+    # keyword arguments stored under another name in the graph, because the attribute has another unit
+    _aliases = {'T': 'T_f', 'P': 'P_g'}
+    _arguments = {'T_f': 'T', 'P_g': 'P'}
+
+    _rank, _upstream, _ancestors, _descendants = {}, {}, {}, {}
+    # name of a node -> keyword arguments of the calc_...() method computing it, in the order they are checked
+    _calc_arguments = {}
+    # if True, an argument is accepted with a node it conflicts with, as long as the requested property still reads it
+    _allow_used_arguments = False
+
+    # no dictionary of attributes per object: the properties are descriptors of the class reading _values
+    __slots__ = ('_values', '_given', '_caller')
+
+    def __init__(self):
+        self._values = {}
+        """given and computed values of the inputs and the nodes"""
+        self._given = set()
+        """names of the inputs and the nodes set with keyword arguments"""
+        self._caller = None
+
+    @property
+    def ps_props(self):
+        """
+        dictionary of the calculated pseudo-critical properties. Properties given as keyword arguments, or not
+        calculated yet, are None
+        """
+        return dict(zip(self._ps_props_keys, self._ps_props_values()))
+
+    def _ps_props_values(self):
+        """values of ps_props, in the order of _ps_props_keys, without building the dictionary"""
+        return tuple(None if key in self._given else self._values.get(key) for key in self._ps_props_keys)
+
+    def __str__(self):
+        return str(self.ps_props)
+
+    def _calc(self, caller, targets, ignore_conflict, **kwargs):
+        """
+        Sets the keyword arguments that are not None, and returns the values of the target nodes.
+
+        :param caller: string, name of the method reported in the error messages
+            ex1) caller = "calc_Tpc"
+            ex2) caller = "_initialize_Tr_and_Pr"
+        :param targets: tuple of strings, names of the nodes returned
+        :param ignore_conflict: bool, skips the check of the conflicting arguments
+        """
+        given = {}
+        reset = {}
+        for key, value in kwargs.items():
+            name = self._aliases.get(key, key)
+            if value is not None:
+                given[name] = value
+            elif name in self._given and (name in self._nodes or self._inputs[name] is not None):
+                # like a fresh call, the optional inputs left to None go back to their defaults (ex: H2S=0), and the
+                # nodes left to None are computed again instead of keeping the value given by a previous call
+                reset[name] = None
+        self._caller = caller
+        self._check_arguments(targets, given, ignore_conflict)
+        reset.update(given)
+        self._assign(reset)
+        return [self._get(target) for target in targets]
+
+    def _assign(self, given):
+        """sets inputs or overrides nodes, invalidating everything computed downstream of them"""
+        for name in sorted(given, key=self._rank.__getitem__):
+            value = given[name]
+            if name in self._given and _is_same_value(self._values.get(name), value):
+                continue
+            for child in self._descendants[name].intersection(self._values):
+                del self._values[child]
+                self._given.discard(child)
+            if value is None:
+                self._values.pop(name, None)
+                self._given.discard(name)
+            else:
+                self._values[name] = value
+                self._given.add(name)
+
+    def _get(self, name):
+        """returns the value of an input or a node, computing the node on the first call"""
+        value = self._values.get(name)
+        if value is not None:
+            return value
+        if name in self._inputs:
+            value = self._inputs[name]
+            if value is None:
+                raise TypeError(self._missing_argument_message(name))
+            return value
+        value = self._nodes[name][0](self)
+        self._values[name] = value
+        return value
+
+    def _peek(self, name):
+        """value of an input or a node read as an attribute. None if a required input is missing"""
+        try:
+            return self._get(name)
+        except TypeError:
+            return None
+
+    def _is_given(self, *names):
+        """True if any of the inputs or nodes was set with keyword arguments"""
+        return any(name in self._given for name in names)
+
+    def _missing_argument_message(self, name):
+        return 'Missing a required argument, %s' % self._arguments.get(name, name)
+
+    def _conflict_error(self, node, arg):
+        # this is triggered in z_helper.py's calc_z() function
+        caller = 'calc_z' if self._caller == '_initialize_Tr_and_Pr' else self._caller
+        return TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % (
+            caller, self._arguments.get(node, node), self._arguments.get(arg, arg)))
+
+    def _steps(self, name, given):
+        """names read to compute a node, in the order they are checked. Subclasses override the steps that depend on
+        the arguments given"""
+        return self._upstream[name]
+
+    def _check_arguments(self, targets, given, ignore_conflict):
+        """
+        Raises TypeError if a required input is missing, or if an argument conflicts with a node given as input. The
+        graph is walked from each target, so that the first error found is the one raised.
+
+        :param targets: tuple of strings, names of the nodes computed
+        :param given: dict of the keyword arguments that are not None
+        :param ignore_conflict: bool, skips the check of the conflicting arguments
+        """
+        for target in targets:
+            used = self._used_names(target, given) if self._allow_used_arguments else ()
+            self._check_node(target, given, ignore_conflict, used)
+
+    def _check_node(self, name, given, ignore_conflict, used):
+        if name in self._inputs:
+            if self._inputs[name] is None and name not in given:
+                raise TypeError(self._missing_argument_message(name))
+        elif name in given:
+            if not ignore_conflict:
+                for arg in self._calc_arguments[name]:
+                    if arg in given and arg not in used:
+                        raise self._conflict_error(name, arg)
+        else:
+            for step in self._steps(name, given):
+                self._check_node(step, given, ignore_conflict, used)
+
+    def _used_names(self, target, given):
+        """the inputs and nodes the evaluation of the target reads, given the arguments"""
+        used = set()
+        stack = [target]
+        while stack:
+            name = stack.pop()
+            if name not in used:
+                used.add(name)
+                if name not in given:
+                    stack.extend(self._upstream[name])
+        return used
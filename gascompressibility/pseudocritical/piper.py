@@ -1,73 +1,144 @@
-import numpy as np
-import inspect
+import math
 
 from gascompressibility.utilities.utilities import calc_Fahrenheit_to_Rankine
 from gascompressibility.utilities.utilities import calc_psig_to_psia
-
-
-class Piper(object):
+from gascompressibility.utilities.utilities import _as_float_input
+from gascompressibility.pseudocritical.graph import PseudocriticalGraph
+from gascompressibility.pseudocritical.graph import _Property
+from gascompressibility.pseudocritical.graph import _build_graph
+
+# critical pressures (psia) and temperatures (°R) of the impurities
+Pc_H2S = 1306
+Tc_H2S = 672.3
+Pc_CO2 = 1071
+Tc_CO2 = 547.5
+Pc_N2 = 492.4
+Tc_N2 = 227.16
+# Tc / Pc^0.5 of the impurities, used by K
+_Tc_sqrt_Pc_H2S = Tc_H2S / math.sqrt(Pc_H2S)
+_Tc_sqrt_Pc_CO2 = Tc_CO2 / math.sqrt(Pc_CO2)
+_Tc_sqrt_Pc_N2 = Tc_N2 / math.sqrt(Pc_N2)
+
+
+def _calc_J(sg, H2S, CO2, N2):
+    """Stewart-Burkhardt-VOO parameter J (°R/psia). Elementwise on floats or arrays"""
+    return 0.11582 \
+        - 0.45820 * H2S * (Tc_H2S / Pc_H2S) \
+        - 0.90348 * CO2 * (Tc_CO2 / Pc_CO2) \
+        - 0.66026 * N2 * (Tc_N2 / Pc_N2) \
+        + 0.70729 * sg \
+        - 0.099397 * sg ** 2
+
+
+def _calc_K(sg, H2S, CO2, N2):
+    """Stewart-Burkhardt-VOO parameter K (°R/psia^0.5). Elementwise on floats or arrays"""
+    return 3.8216 \
+        - 0.06534 * H2S * _Tc_sqrt_Pc_H2S \
+        - 0.42113 * CO2 * _Tc_sqrt_Pc_CO2 \
+        - 0.91249 * N2 * _Tc_sqrt_Pc_N2 \
+        + 17.438 * sg \
+        - 3.2191 * sg ** 2
+
+
+def piper_pseudocritical(sg, H2S=None, CO2=None, N2=None):
+    """
+    Stateless version of :doc:`Piper <piper>`'s pseudo-critical properties. Works elementwise on NumPy arrays (or
+    lists) of any broadcastable shapes, and on floats. Nothing is stored and the call stack is not inspected, so this
+    is the fast way to compute the pseudo-critical properties of many gas mixtures at once.
+
+    >>> import gascompressibility as gc
+    >>> props = gc.piper_pseudocritical(sg=[0.6, 0.7, 0.8], H2S=0.07, CO2=0.1)
+    >>> props['Tpc']
+    array([344.50890001, 373.61527415, 400.96202414])
+    >>> props['Ppc']
+    array([779.93693686, 747.94681272, 722.0109655 ])
+
+    Parameters
+    ----------
+    sg : float or array
+        specific gravity of gas (dimensionless)
+    H2S : float or array
+        mole fraction of H2S (dimensionless)
+    CO2 : float or array
+        mole fraction of CO2 (dimensionless)
+    N2 : float or array
+        mole fraction of N2 (dimensionless)
+
+    Returns
+    -------
+    dict
+        ``'Tpc'`` pseudo-critical temperature (°R), ``'Ppc'`` pseudo-critical pressure (psia), and the SBV parameters
+        ``'J'`` (°R/psia) and ``'K'`` (°R/psia^0.5). Same keys as ``Piper.ps_props``, without Tr and Pr
+    """
+    if sg is None:
+        raise TypeError("Missing a required argument, sg (specific gravity, dimensionless)")
+    sg = _as_float_input(sg)
+    H2S = _as_float_input(H2S)
+    CO2 = _as_float_input(CO2)
+    N2 = _as_float_input(N2)
+    J = _calc_J(sg, H2S, CO2, N2)
+    K = _calc_K(sg, H2S, CO2, N2)
+    Tpc = K ** 2 / J
+    return {'Tpc': Tpc, 'Ppc': Tpc / J, 'J': J, 'K': K}
+
+
+class Piper(PseudocriticalGraph):
     """
     Class object to calculate pseudo-critical properties based on Piper's method.
 
     The model uses Piper's model (1993) [1]_ to correlate specific gravity (:math:`\gamma_g`) to pseudo-critical pressure (:math:`P_{pc}`) and pseudo-critical
     temperature (:math:`T_{pc}`). It supports corrections for acid gas fractions (:math:`H_2S`, :math:`CO_2`, and :math:`N2`)
+
+    The properties are nodes of a dependency graph (sg, H2S, CO2, N2 → J, K → Tpc → Ppc → Tr, Pr), computed lazily at
+    most once, and invalidated only when an upstream input changes. Keyword arguments of the ``calc_...()`` methods
+    update the inputs of the object, so that the next calls with the same inputs reuse the properties already
+    computed.
     """
 
-    def __init__(self):
-
-        self.sg = None
-        """specific gravity (dimensionless)"""
-        self.T_f = None
-        """temperature (°F)"""
-        self.T = None
-        """temperature (°R)"""
-        self.P_g = None
-        """pressure (psig)"""
-        self.P = None
-        """pressure (psia)"""
-        self.H2S = None
-        """mole fraction of H2S (dimensionless)"""
-        self.CO2 = None
-        """mole fraction of CO2 (dimensionless)"""
-        self.N2 = None
-        """mole fraction of N2 (dimensionless)"""
-
-        self.Pc_H2S = 1306
-        self.Tc_H2S = 672.3
-        self.Pc_CO2 = 1071
-        self.Tc_CO2 = 547.5
-        self.Pc_N2 = 492.4
-        self.Tc_N2 = 227.16
-
-        self.Tpc = None
-        """pseudo-critical temperature, Tpc (°R)"""
-        self.Ppc = None
-        """pseudo-critical pressure, Ppc (psia)"""
-        self.J = None
-        """Stewart-Burkhardt-VOO parameter J, (°R/psia)"""
-        self.K = None
-        """Stewart-Burkhardt-VOO parameter K, (°R/psia^0.5)"""
-        self.Tr = None
-        """pseudo-reduced temperature, Tr (dimensionless)"""
-        self.Pr = None
-        """pseudo-reduced pressure, Pr (dimensionless)"""
-
-        self.ps_props = {
-            'Tpc': None,
-            'Ppc': None,
-            'J': None,
-            'K': None,
-            'Tr': None,
-            'Pr': None,
-        }
-        """dictionary of pseudo-critical properties."""
-
-        self._first_caller_name = None
-        self._first_caller_kwargs = {}
-        self._first_caller_is_saved = False
-
-    def __str__(self):
-        return str(self.ps_props)
+    Pc_H2S = Pc_H2S
+    Tc_H2S = Tc_H2S
+    Pc_CO2 = Pc_CO2
+    Tc_CO2 = Tc_CO2
+    Pc_N2 = Pc_N2
+    Tc_N2 = Tc_N2
+
+    _inputs = {'sg': None, 'T_f': None, 'P_g': None, 'H2S': 0, 'CO2': 0, 'N2': 0}
+    _nodes = {
+        'T': (lambda self: calc_Fahrenheit_to_Rankine(self._get('T_f')), ('T_f',)),
+        'P': (lambda self: calc_psig_to_psia(self._get('P_g')), ('P_g',)),
+        'J': (lambda self: _calc_J(self._get('sg'), self._get('H2S'), self._get('CO2'), self._get('N2')), ('sg', 'H2S', 'CO2', 'N2')),
+        'K': (lambda self: _calc_K(self._get('sg'), self._get('H2S'), self._get('CO2'), self._get('N2')), ('sg', 'H2S', 'CO2', 'N2')),
+        'Tpc': (lambda self: self._get('K') ** 2 / self._get('J'), ('J', 'K')),
+        'Ppc': (lambda self: self._get('Tpc') / self._get('J'), ('Tpc', 'J')),
+        'Tr': (lambda self: self._get('T') / self._get('Tpc'), ('T', 'Tpc')),
+        'Pr': (lambda self: self._get('P') / self._get('Ppc'), ('P', 'Ppc')),
+    }
+    _rank, _upstream, _ancestors, _descendants = _build_graph(_inputs, _nodes)
+    _ps_props_keys = ('Tpc', 'Ppc', 'J', 'K', 'Tr', 'Pr')
+    _calc_arguments = {
+        'J': ('sg', 'H2S', 'CO2', 'N2'),
+        'K': ('sg', 'H2S', 'CO2', 'N2'),
+        'Tpc': ('sg', 'H2S', 'CO2', 'N2', 'J', 'K'),
+        'Ppc': ('sg', 'H2S', 'CO2', 'N2', 'J', 'K', 'Tpc'),
+        'Tr': ('T_f', 'sg', 'Tpc', 'H2S', 'CO2', 'N2', 'J', 'K'),
+        'Pr': ('P_g', 'sg', 'Tpc', 'Ppc', 'H2S', 'CO2', 'N2', 'J', 'K'),
+    }
+    __slots__ = ()
+
+    sg = _Property('sg', """specific gravity (dimensionless)""")
+    T_f = _Property('T_f', """temperature (°F)""")
+    T = _Property('T', """temperature (°R)""")
+    P_g = _Property('P_g', """pressure (psig)""")
+    P = _Property('P', """pressure (psia)""")
+    H2S = _Property('H2S', """mole fraction of H2S (dimensionless)""")
+    CO2 = _Property('CO2', """mole fraction of CO2 (dimensionless)""")
+    N2 = _Property('N2', """mole fraction of N2 (dimensionless)""")
+    Tpc = _Property('Tpc', """pseudo-critical temperature, Tpc (°R)""")
+    Ppc = _Property('Ppc', """pseudo-critical pressure, Ppc (psia)""")
+    J = _Property('J', """Stewart-Burkhardt-VOO parameter J, (°R/psia)""")
+    K = _Property('K', """Stewart-Burkhardt-VOO parameter K, (°R/psia^0.5)""")
+    Tr = _Property('Tr', """pseudo-reduced temperature, Tr (dimensionless)""")
+    Pr = _Property('Pr', """pseudo-reduced pressure, Pr (dimensionless)""")
 
     def __repr__(self):
         description = '<gascompressibility.pseudocritical.Piper> class object with the following calculated attributes:\n{'
@@ -94,21 +165,7 @@ class Piper(object):
         float
             SBV parameter, J, (°R/psia)
         """
-
-
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_sg(sg)
-        self._initialize_H2S(H2S)
-        self._initialize_CO2(CO2)
-        self._initialize_N2(N2)
-        self.J = 0.11582 \
-                 - 0.45820 * self.H2S * (self.Tc_H2S / self.Pc_H2S) \
-                 - 0.90348 * self.CO2 * (self.Tc_CO2 / self.Pc_CO2) \
-                 - 0.66026 * self.N2 * (self.Tc_N2 / self.Pc_N2) \
-                 + 0.70729 * self.sg \
-                 - 0.099397 * self.sg ** 2
-        self.ps_props['J'] = self.J
-        return self.J
+        return self._calc('calc_J', ('J',), False, sg=sg, H2S=H2S, CO2=CO2, N2=N2)[0]
 
     def calc_K(self, sg=None, H2S=None, CO2=None, N2=None):
         """
@@ -130,22 +187,8 @@ class Piper(object):
         float
             SBV parameter, K, (°R/psia^0.5)
         """
+        return self._calc('calc_K', ('K',), False, sg=sg, H2S=H2S, CO2=CO2, N2=N2)[0]
 
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_sg(sg)
-        self._initialize_H2S(H2S)
-        self._initialize_CO2(CO2)
-        self._initialize_N2(N2)
-        self.K = 3.8216 \
-                 - 0.06534 * self.H2S * (self.Tc_H2S / np.sqrt(self.Pc_H2S)) \
-                 - 0.42113 * self.CO2 * (self.Tc_CO2 / np.sqrt(self.Pc_CO2)) \
-                 - 0.91249 * self.N2 * (self.Tc_N2 / np.sqrt(self.Pc_N2)) \
-                 + 17.438 * self.sg \
-                 - 3.2191 * self.sg ** 2
-        self.ps_props['K'] = self.K
-        return self.K
-
-    """pseudo-critical temperature (°R)"""
     def calc_Tpc(self, sg=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
         """
         Calculates pseudo-critical temperature, Tpc (°R)
@@ -172,12 +215,7 @@ class Piper(object):
         float
             pseudo-critical temperature, Tpc (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_J(J, sg=sg, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict)
-        self._initialize_K(K, sg=sg, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict)
-        self.Tpc = self.K ** 2 / self.J
-        self.ps_props['Tpc'] = self.Tpc
-        return self.Tpc
+        return self._calc('calc_Tpc', ('Tpc',), ignore_conflict, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K)[0]
 
     def calc_Ppc(self, sg=None, H2S=None, CO2=None, N2=None, J=None, K=None, Tpc=None, ignore_conflict=False):
         """
@@ -207,20 +245,7 @@ class Piper(object):
         float
             pseudo-critical pressure, Ppc (psia)
         """
-
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-
-        if Tpc is not None:
-            if K is not None:
-                raise TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % (self._first_caller_name, 'Tpc', 'K'))
-            self.Tpc = Tpc  # skips self._check_conflicting_arguments() when initializing Tpc
-        else:
-            self._initialize_Tpc(Tpc, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-
-        self._initialize_J(J, sg=sg, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict)
-        self.Ppc = self.Tpc / self.J
-        self.ps_props['Ppc'] = self.Ppc
-        return self.Ppc
+        return self._calc('calc_Ppc', ('Ppc',), ignore_conflict, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, Tpc=Tpc)[0]
 
     def calc_Tr(self, T=None, sg=None, Tpc=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
         """
@@ -251,14 +276,8 @@ class Piper(object):
             pseudo-reduced temperature, Tr (dimensionless)
 
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_T(T)
-        self._initialize_Tpc(Tpc, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        self.Tr = self.T / self.Tpc
-        self.ps_props['Tr'] = self.Tr
-        return self.Tr
-
-    """pseudo-reduced pressure (psi)"""
+        return self._calc('calc_Tr', ('Tr',), ignore_conflict, T=T, sg=sg, Tpc=Tpc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K)[0]
+
     def calc_Pr(self, P=None, sg=None, Tpc=None, Ppc=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
         """
         Calculates pseudo-reduced pressure, Pr (dimensionless)
@@ -287,159 +306,31 @@ class Piper(object):
         float
             pseudo-reduced pressure, Pr (dimensionless)
         """
-
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_P(P)
-        self._initialize_Ppc(Ppc, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, Tpc=Tpc, ignore_conflict=ignore_conflict)
-        self.Pr = self.P / self.Ppc
-        self.ps_props['Pr'] = self.Pr
-        return self.Pr
+        return self._calc('calc_Pr', ('Pr',), ignore_conflict, P=P, sg=sg, Tpc=Tpc, Ppc=Ppc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K)[0]
 
     """This function is used by z_helper.py's calc_z function to check redundant arguments for Pr and Tr"""
     def _initialize_Tr_and_Pr(self, sg=None, P=None, T=None, Tpc=None, Ppc=None, H2S=None, CO2=None, N2=None, Tr=None, Pr=None, J=None, K=None, ignore_conflict=False):
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_Tr(Tr, T=T, sg=sg, Tpc=Tpc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        self._initialize_Pr(Pr, P=P, sg=sg, Tpc=Tpc, Ppc=Ppc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        return self.Tr, self.Pr
-
-    def _set_first_caller_attributes(self, func_name, func_kwargs):
-        """
-        Helper function to set properties related to the first function called (first in the call stack).
-        This function doesn't do anything for 'calc_...()' functions called inside the first function.
-        For exmaple, if `calc_Pr()' is called, this function is skipped for 'calc_Ppc()' function which is
-        triggered inside `calc_Pr()`.
-        :param func_name: string
-            ex1) func_name= "calc_Tr",
-            ex2) func_name = "calc_Pr",
-        :param func_kwargs: dictionary kwarg parameters passed to 'func_name'
-            ex1) func_kwargs = {'self': ...some_string, 'sg': None, 'Tpc': 377.59, 'H2S': 0.07, 'CO2': 0.1}
-            ex2) func_kwargs = {'self': ...some_string, 'sg': 0.6, 'Tpc': None, 'H2S': 0.07, 'CO2': 0.1}
-        """
-        if not self._first_caller_is_saved:
-            func_kwargs = {key: value for key, value in func_kwargs.items() if key != 'self'}
-            if 'ignore_conflict' in func_kwargs:
-
-                if func_kwargs['ignore_conflict'] is False:
-                    """
-                    This modification is needed for self._check_conflicting_arguments(). 
-                    The exception in self._check_conflicting_arguments() compares if "kwarg is not None"
-                    The default 'ignore_conflict' is a boolean object, so comparing if "ignore_conflict is not None"
-                    will raise type error 
-                    """
-                    func_kwargs['ignore_conflict'] = None
-
-            self._first_caller_name = func_name
-            self._first_caller_kwargs = func_kwargs
-            self._first_caller_is_saved = True
-        else:
-            pass
-
-    def _check_conflicting_arguments(self, func, calculated_var):
-        """
-        :param func: string
-            ex1) func_name = "calc_Tpc",
-            ex2) func_name = "calc_J",
-        :param calculated_var: string
-            ex1) calculated_var = 'Tpc'
-            ex1) calculated_var = 'J'
-        """
-        args = inspect.getfullargspec(func).args[1:]  # arg[0] = 'self', args = arguments defined in "func"
-        for arg in args:
-            if self._first_caller_kwargs[arg] is not None:
-
-                if self._first_caller_name == '_initialize_Tr_and_Pr':
-                    raise TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % ('calc_z', calculated_var, arg))
-
-                raise TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % (self._first_caller_name, calculated_var, arg))
-
-    def _initialize_sg(self, sg):
-        if sg is None:
-            if self._first_caller_name == 'calc_J' or self._first_caller_name == 'calc_K':
-                raise TypeError("Missing a required argument, sg (specific gravity, dimensionless)")
-            else:
-                raise TypeError("Missing a required arguments, sg (specific gravity, dimensionless), or Tpc "
-                                "(pseudo-critical temperature, °R) or Ppc (pseudo-critical pressure, psia). "
-                                "Either both Tpc and Ppc must be inputted, or only sg needs to be inputted. "
-                                "Both Tpc and Ppc can be computed from sg")
-        else:
-            self.sg = sg
-
-    def _initialize_P(self, P):
-        if P is None:
-            raise TypeError("Missing a required argument, P (gas pressure, psig)")
-        else:
-            self.P_a = P  # psia
-            self.P = calc_psig_to_psia(P)
-
-    def _initialize_T(self, T):
-        if T is None:
-            raise TypeError("Missing a required argument, T (gas temperature, °F)")
-        else:
-            self.T_f = T  # °F
-            self.T = calc_Fahrenheit_to_Rankine(T)
-
-    def _initialize_H2S(self, H2S):
-        if H2S is None:
-            self.H2S = 0
-        else:
-            self.H2S = H2S
-
-    def _initialize_CO2(self, CO2):
-        if CO2 is None:
-            self.CO2 = 0
-        else:
-            self.CO2 = CO2
-
-    def _initialize_N2(self, N2):
-        if N2 is None:
-            self.N2 = 0
-        else:
-            self.N2 = N2
-
-    def _initialize_J(self, J, sg=None, H2S=None, CO2=None, N2=None, ignore_conflict=None):
-        if J is None:
-            self.calc_J(sg=sg, H2S=H2S, CO2=CO2, N2=N2)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_J, 'J')
-            self.J = J
-
-    def _initialize_K(self, K, sg=None, H2S=None, CO2=None, N2=None, ignore_conflict=None):
-        if K is None:
-            self.calc_K(sg=sg, H2S=H2S, CO2=CO2, N2=N2)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_K, 'K')
-            self.K = K
-
-    def _initialize_Tpc(self, Tpc, sg=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
-        if Tpc is None:
-            self.calc_Tpc(sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Tpc, 'Tpc')
-            self.Tpc = Tpc
-
-    def _initialize_Ppc(self, Ppc, sg=None, H2S=None, CO2=None, N2=None, J=None, K=None, Tpc=None, ignore_conflict=False):
-        if Ppc is None:
-            self.calc_Ppc(sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, Tpc=Tpc, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Ppc, 'Ppc')
-            self.Ppc = Ppc
-
-    def _initialize_Pr(self, Pr, P=None, sg=None, Tpc=None, Ppc=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
-        if Pr is None:
-            self.calc_Pr(P=P, sg=sg, Tpc=Tpc, Ppc=Ppc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Pr, 'Pr')
-            self.Pr = Pr
-
-    def _initialize_Tr(self, Tr, T, sg=None, Tpc=None, H2S=None, CO2=None, N2=None, J=None, K=None, ignore_conflict=False):
-        if Tr is None:
-            self.calc_Tr(T=T, sg=sg, Tpc=Tpc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Tr, 'Tr')
-            self.Tr = Tr
+        return tuple(self._calc('_initialize_Tr_and_Pr', ('Tr', 'Pr'), ignore_conflict, sg=sg, P=P, T=T, Tpc=Tpc, Ppc=Ppc,
+                                H2S=H2S, CO2=CO2, N2=N2, Tr=Tr, Pr=Pr, J=J, K=K))
+
+    def _steps(self, name, given):
+        if name == 'Ppc' and 'Tpc' in given:
+            # Tpc given with K is a conflict, even with ignore_conflict=True. Otherwise, Tpc is not checked
+            if 'K' in given:
+                raise self._conflict_error('Tpc', 'K')
+            return ('J',)
+        return PseudocriticalGraph._steps(self, name, given)
+
+    def _missing_argument_message(self, name):
+        if name == 'sg':
+            if self._caller == 'calc_J' or self._caller == 'calc_K':
+                return "Missing a required argument, sg (specific gravity, dimensionless)"
+            return ("Missing a required arguments, sg (specific gravity, dimensionless), or Tpc "
+                    "(pseudo-critical temperature, °R) or Ppc (pseudo-critical pressure, psia). "
+                    "Either both Tpc and Ppc must be inputted, or only sg needs to be inputted. "
+                    "Both Tpc and Ppc can be computed from sg")
+        if name == 'P_g':
+            return "Missing a required argument, P (gas pressure, psig)"
+        if name == 'T_f':
+            return "Missing a required argument, T (gas temperature, °F)"
+        return PseudocriticalGraph._missing_argument_message(self, name)
@@ -1,10 +1,105 @@
-import inspect
+import numpy as np
 
 from gascompressibility.utilities.utilities import calc_Fahrenheit_to_Rankine
 from gascompressibility.utilities.utilities import calc_psig_to_psia
+from gascompressibility.utilities.utilities import _as_float_input
+from gascompressibility.pseudocritical.graph import PseudocriticalGraph
+from gascompressibility.pseudocritical.graph import _Property
+from gascompressibility.pseudocritical.graph import _build_graph
 
 
-class Sutton():
+def _calc_Tpc(sg):
+    """pseudo-critical temperature, Tpc (°R). Elementwise on floats or arrays"""
+    return 169.2 + 349.5 * sg - 74.0 * sg ** 2
+
+
+def _calc_Ppc(sg):
+    """pseudo-critical pressure, Ppc (psia). Elementwise on floats or arrays"""
+    return 756.8 - 131.07 * sg - 3.6 * sg ** 2
+
+
+def _calc_e_correction(A, B):
+    """Wichert & Aziz temperature-correction factor, ε (°R), of A = H2S + CO2 and B = H2S"""
+    return 120 * (A ** 0.9 - A ** 1.6) + 15 * (B ** 0.5 - B ** 4)
+
+
+def _calc_Ppc_corrected(Ppc, Tpc, Tpc_corrected, B, e_correction):
+    """corrected pseudo-critical pressure, P'pc (psia). Elementwise on floats or arrays"""
+    return (Ppc * Tpc_corrected) / (Tpc - B * (1 - B) * e_correction)
+
+
+def _is_zero(value):
+    """True if a float, or every element of an array, is zero"""
+    return not np.any(value)
+
+
+def sutton_pseudocritical(sg, H2S=None, CO2=None):
+    """
+    Stateless version of :doc:`Sutton <sutton>`'s pseudo-critical properties, with the Wichert & Aziz correction for
+    acid gases. Works elementwise on NumPy arrays (or lists) of any broadcastable shapes, and on floats. Nothing is
+    stored and the call stack is not inspected, so this is the fast way to compute the pseudo-critical properties of
+    many gas mixtures at once.
+
+    >>> import gascompressibility as gc
+    >>> props = gc.sutton_pseudocritical(sg=[0.6, 0.7, 0.8], H2S=0.07, CO2=0.1)
+    >>> props['Tpc_corrected']
+    array([330.98219397, 356.31219397, 380.16219397])
+    >>> props['Ppc_corrected']
+    array([638.48774637, 628.21430478, 617.3368212 ])
+
+    Parameters
+    ----------
+    sg : float or array
+        specific gravity of gas (dimensionless)
+    H2S : float or array
+        mole fraction of H2S (dimensionless)
+    CO2 : float or array
+        mole fraction of CO2 (dimensionless)
+
+    Returns
+    -------
+    dict
+        ``'Tpc'`` pseudo-critical temperature (°R), ``'Ppc'`` pseudo-critical pressure (psia), ``'e_correction'``
+        temperature-correction factor for acid gases (°R), ``'Tpc_corrected'`` corrected pseudo-critical temperature
+        (°R), and ``'Ppc_corrected'`` corrected pseudo-critical pressure (psia). Same keys as ``Sutton.ps_props``,
+        without Tr and Pr
+    """
+    if sg is None:
+        raise TypeError("Missing a required argument, sg (specific gravity, dimensionless)")
+    sg = _as_float_input(sg)
+    H2S = _as_float_input(H2S)
+    CO2 = _as_float_input(CO2)
+    Tpc = _calc_Tpc(sg)
+    Ppc = _calc_Ppc(sg)
+    e_correction = _calc_e_correction(H2S + CO2, H2S)
+    Tpc_corrected = Tpc - e_correction
+    Ppc_corrected = _calc_Ppc_corrected(Ppc, Tpc, Tpc_corrected, H2S, e_correction)
+    return {
+        'Tpc': Tpc,
+        'Ppc': Ppc,
+        'e_correction': e_correction,
+        'Tpc_corrected': Tpc_corrected,
+        'Ppc_corrected': Ppc_corrected,
+    }
+
+
+def _node_Tpc_corrected(self):
+    e_correction = self._get('e_correction')
+    # correction is not needed if no sour gas is present
+    if _is_zero(e_correction):
+        return self._get('Tpc')
+    return self._get('Tpc') - e_correction
+
+
+def _node_Ppc_corrected(self):
+    # correction is not needed if no sour gas is present, unless T'pc was given
+    if _is_zero(self._get('e_correction')) and not self._is_given('Tpc_corrected'):
+        return self._get('Ppc')
+    return _calc_Ppc_corrected(self._get('Ppc'), self._get('Tpc'), self._get('Tpc_corrected'), self._get('B'),
+                               self._get('e_correction'))
+
+
+class Sutton(PseudocriticalGraph):
 
     """
     Class object to calculate pseudo-critical properties based on Sutton's method.
@@ -12,59 +107,58 @@ class Sutton():
     The model uses Sutton's model (1985) [1]_ to correlate specific gravity (:math:`\gamma_g`) to pseudo-critical pressure (:math:`P_{pc}`) and pseudo-critical
     temperature (:math:`T_{pc}`). It supports corrections for acid gas fractions (:math:`H_2S` and :math:`CO_2`) using
     Wichert & Aziz method (1970) [2]_.
+
+    The properties are nodes of a dependency graph (sg → Tpc, Ppc; H2S, CO2 → A, B → ε → T'pc → P'pc → Tr, Pr),
+    computed lazily at most once, and invalidated only when an upstream input changes. Keyword arguments of the
+    ``calc_...()`` methods update the inputs of the object, so that the next calls with the same inputs reuse the
+    properties already computed.
     """
 
-    def __init__(self):
-
-        self.sg = None
-        """specific gravity (dimensionless)"""
-        self.T_f = None
-        """temperature (°F)"""
-        self.T = None
-        """temperature (°R)"""
-        self.P_g = None
-        """pressure (psig)"""
-        self.P = None
-        """pressure (psia)"""
-        self.H2S = None
-        """mole fraction of H2S (dimensionless)"""
-        self.CO2 = None
-        """mole fraction of CO2 (dimensionless)"""
-
-        self.Tpc = None
-        """pseudo-critical temperature, Tpc (°R)"""
-        self.Ppc = None
-        """pseudo-critical pressure, Ppc (psia)"""
-        self.A = None
-        self.B = None
-        self.e_correction = None
-        """temperature-correction factor for acid gases, ε (°R)"""
-        self.Tpc_corrected = None
-        """corrected pseudo-critical temperature, T'pc (°R)"""
-        self.Ppc_corrected = None
-        """corrected pseudo-critical pressure, P'pc (psia)"""
-        self.Tr = None
-        """pseudo-reduced temperature, Tr (dimensionless)"""
-        self.Pr = None
-        """pseudo-reduced pressure, Pr (dimensionless)"""
-
-        self.ps_props = {
-            'Tpc': None,
-            'Ppc': None,
-            'e_correction': None,
-            'Tpc_corrected': None,
-            'Ppc_corrected': None,
-            'Tr': None,
-            'Pr': None,
-        }
-        """dictionary of pseudo-critical properties."""
-
-        self._first_caller_name = None
-        self._first_caller_kwargs = {}
-        self._first_caller_is_saved = False
-
-    def __str__(self):
-        return str(self.ps_props)
+    _inputs = {'sg': None, 'T_f': None, 'P_g': None, 'H2S': 0, 'CO2': 0}
+    _nodes = {
+        'T': (lambda self: calc_Fahrenheit_to_Rankine(self._get('T_f')), ('T_f',)),
+        'P': (lambda self: calc_psig_to_psia(self._get('P_g')), ('P_g',)),
+        'A': (lambda self: self._get('H2S') + self._get('CO2'), ('H2S', 'CO2')),
+        'B': (lambda self: self._get('H2S'), ('H2S',)),
+        'Tpc': (lambda self: _calc_Tpc(self._get('sg')), ('sg',)),
+        'Ppc': (lambda self: _calc_Ppc(self._get('sg')), ('sg',)),
+        'e_correction': (lambda self: _calc_e_correction(self._get('A'), self._get('B')), ('A', 'B')),
+        'Tpc_corrected': (_node_Tpc_corrected, ('Tpc', 'e_correction')),
+        'Ppc_corrected': (_node_Ppc_corrected, ('Ppc', 'Tpc', 'B', 'e_correction', 'Tpc_corrected')),
+        'Tr': (lambda self: self._get('T') / self._get('Tpc_corrected'), ('T', 'Tpc_corrected')),
+        'Pr': (lambda self: self._get('P') / self._get('Ppc_corrected'), ('P', 'Ppc_corrected')),
+    }
+    _rank, _upstream, _ancestors, _descendants = _build_graph(_inputs, _nodes)
+    _ps_props_keys = ('Tpc', 'Ppc', 'e_correction', 'Tpc_corrected', 'Ppc_corrected', 'Tr', 'Pr')
+    _calc_arguments = {
+        'Tpc': ('sg',),
+        'Ppc': ('sg',),
+        'e_correction': ('H2S', 'CO2'),
+        'Tpc_corrected': ('sg', 'Tpc', 'e_correction', 'H2S', 'CO2'),
+        'Ppc_corrected': ('sg', 'Tpc', 'Ppc', 'e_correction', 'Tpc_corrected', 'H2S', 'CO2'),
+        'Tr': ('T_f', 'Tpc_corrected', 'sg', 'Tpc', 'e_correction', 'H2S', 'CO2'),
+        'Pr': ('P_g', 'Ppc_corrected', 'sg', 'Tpc', 'Ppc', 'e_correction', 'Tpc_corrected', 'H2S', 'CO2'),
+    }
+    # ex: sg with Tpc in calc_Ppc_corrected() is accepted, because Ppc still reads sg
+    _allow_used_arguments = True
+    __slots__ = ()
+
+    sg = _Property('sg', """specific gravity (dimensionless)""")
+    T_f = _Property('T_f', """temperature (°F)""")
+    T = _Property('T', """temperature (°R)""")
+    P_g = _Property('P_g', """pressure (psig)""")
+    P = _Property('P', """pressure (psia)""")
+    H2S = _Property('H2S', """mole fraction of H2S (dimensionless)""")
+    CO2 = _Property('CO2', """mole fraction of CO2 (dimensionless)""")
+    Tpc = _Property('Tpc', """pseudo-critical temperature, Tpc (°R)""")
+    Ppc = _Property('Ppc', """pseudo-critical pressure, Ppc (psia)""")
+    A = _Property('A', """sum of the mole fractions of CO2 and H2S in a gas mixture""")
+    B = _Property('B', """mole fraction of H2S in a gas mixture""")
+    e_correction = _Property('e_correction', """temperature-correction factor for acid gases, ε (°R)""")
+    Tpc_corrected = _Property('Tpc_corrected', """corrected pseudo-critical temperature, T'pc (°R)""")
+    Ppc_corrected = _Property('Ppc_corrected', """corrected pseudo-critical pressure, P'pc (psia)""")
+    Tr = _Property('Tr', """pseudo-reduced temperature, Tr (dimensionless)""")
+    Pr = _Property('Pr', """pseudo-reduced pressure, Pr (dimensionless)""")
 
     def __repr__(self):
         description = '<gascompressibility.pseudocritical.Sutton> class object with the following calculated attributes:\n{'
@@ -73,16 +167,11 @@ class Sutton():
 
     """sum of the mole fractions of CO2 and H2S in a gas mixture"""
     def _calc_A(self, H2S=None, CO2=None):
-        self._initialize_H2S(H2S)
-        self._initialize_CO2(CO2)
-        self.A = self.H2S + self.CO2
-        return self.A
+        return self._calc('_calc_A', ('A',), False, H2S=H2S, CO2=CO2)[0]
 
     """mole fraction of H2S in a gas mixture"""
     def _calc_B(self, H2S=None):
-        self._initialize_H2S(H2S)
-        self.B = self.H2S
-        return self.B
+        return self._calc('_calc_B', ('B',), False, H2S=H2S)[0]
 
     def calc_Tpc(self, sg=None):
         """
@@ -98,11 +187,7 @@ class Sutton():
         float
             pseudo-critical temperature, Tpc (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_sg(sg)
-        self.Tpc = 169.2 + 349.5 * self.sg - 74.0 * self.sg ** 2
-        self.ps_props['Tpc'] = self.Tpc
-        return self.Tpc
+        return self._calc('calc_Tpc', ('Tpc',), False, sg=sg)[0]
 
     def calc_Ppc(self, sg=None):
         """
@@ -118,11 +203,7 @@ class Sutton():
         float
             pseudo-critical pressure, Ppc (psia)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_sg(sg)
-        self.Ppc = 756.8 - 131.07 * self.sg - 3.6 * self.sg ** 2
-        self.ps_props['Ppc'] = self.Ppc
-        return self.Ppc
+        return self._calc('calc_Ppc', ('Ppc',), False, sg=sg)[0]
 
     def calc_e_correction(self, H2S=None, CO2=None):
         """
@@ -140,12 +221,7 @@ class Sutton():
         float
             temperature-correction factor for acid gases, ε (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_A(A=None, H2S=H2S, CO2=CO2)
-        self._initialize_B(B=None, H2S=H2S)
-        self.e_correction = 120 * (self.A ** 0.9 - self.A ** 1.6) + 15 * (self.B ** 0.5 - self.B ** 4)
-        self.ps_props['e_correction'] = self.e_correction
-        return self.e_correction
+        return self._calc('calc_e_correction', ('e_correction',), False, H2S=H2S, CO2=CO2)[0]
 
     def calc_Tpc_corrected(self, sg=None, Tpc=None, e_correction=None, H2S=None, CO2=None, ignore_conflict=False):
         """
@@ -172,19 +248,8 @@ class Sutton():
             corrected pseudo-critical temperature, T'pc (°R)
 
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_Tpc(Tpc, sg=sg, ignore_conflict=ignore_conflict)
-
-        # Correction is not needed if no sour gas is present
-        if e_correction is None and H2S is None and CO2 is None:
-            self.Tpc_corrected = self.Tpc
-            self.ps_props['Tpc_corrected'] = self.Tpc_corrected
-            return self.Tpc_corrected
-
-        self._initialize_e_correction(e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        self.Tpc_corrected = self.Tpc - self.e_correction
-        self.ps_props['Tpc_corrected'] = self.Tpc_corrected
-        return self.Tpc_corrected
+        return self._calc('calc_Tpc_corrected', ('Tpc_corrected',), ignore_conflict, sg=sg, Tpc=Tpc,
+                          e_correction=e_correction, H2S=H2S, CO2=CO2)[0]
 
     def calc_Ppc_corrected(self, sg=None, Tpc=None, Ppc=None, e_correction=None, Tpc_corrected=None, H2S=None, CO2=None, ignore_conflict=False):
         """
@@ -214,22 +279,8 @@ class Sutton():
         float
             corrected pseudo-critical pressure, P'pc (psia)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_Ppc(Ppc, sg=sg, ignore_conflict=ignore_conflict)
-
-        # Correction is not needed if no sour gas is present
-        if e_correction is None and H2S is None and CO2 is None and Tpc is None and Tpc_corrected is None:
-            self.Ppc_corrected = self.Ppc
-            self.ps_props['Ppc_corrected'] = self.Ppc_corrected
-            return self.Ppc_corrected
-
-        self._initialize_Tpc(Tpc, sg=sg, ignore_conflict=ignore_conflict)
-        self._initialize_B(B=None, H2S=H2S)
-        self._initialize_e_correction(e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        self._initialize_Tpc_corrected(Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        self.Ppc_corrected = (self.Ppc * self.Tpc_corrected) / (self.Tpc - self.B * (1 - self.B) * self.e_correction)
-        self.ps_props['Ppc_corrected'] = self.Ppc_corrected
-        return self.Ppc_corrected
+        return self._calc('calc_Ppc_corrected', ('Ppc_corrected',), ignore_conflict, sg=sg, Tpc=Tpc, Ppc=Ppc,
+                          e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2)[0]
 
     def calc_Tr(self, T=None, Tpc_corrected=None, sg=None, Tpc=None, e_correction=None, H2S=None, CO2=None, ignore_conflict=False):
         """
@@ -259,14 +310,9 @@ class Sutton():
         float
             pseudo-reduced temperature, Tr (dimensionless)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_T(T)
-        self._initialize_Tpc_corrected(Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        self.Tr = self.T / self.Tpc_corrected
-        self.ps_props['Tr'] = self.Tr
-        return self.Tr
-
-    """pseudo-reduced pressure (psi)"""
+        return self._calc('calc_Tr', ('Tr',), ignore_conflict, T=T, Tpc_corrected=Tpc_corrected, sg=sg, Tpc=Tpc,
+                          e_correction=e_correction, H2S=H2S, CO2=CO2)[0]
+
     def calc_Pr(self, P=None, Ppc_corrected=None, sg=None, Tpc=None, Ppc=None, e_correction=None, Tpc_corrected=None, H2S=None, CO2=None, ignore_conflict=False):
         """
         Calculates pseudo-reduced pressure, Pr (dimensionless)
@@ -299,184 +345,34 @@ class Sutton():
         float
             pseudo-reduced pressure, Pr (dimensionless)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_P(P)
-        self._initialize_Ppc_corrected(Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        self.Pr = self.P / self.Ppc_corrected
-        self.ps_props['Pr'] = self.Pr
-        return self.Pr
+        return self._calc('calc_Pr', ('Pr',), ignore_conflict, P=P, Ppc_corrected=Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc,
+                          e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2)[0]
 
     """This function is used by z_helper.py's calc_z function to check redundant arguments for Pr and Tr"""
     def _initialize_Tr_and_Pr(self, sg=None, P=None, T=None, Tpc=None, Ppc=None, Tpc_corrected=None, Ppc_corrected=None,
                H2S=None, CO2=None, Tr=None, Pr=None, e_correction=None, ignore_conflict=False):
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
-        self._initialize_Tr(Tr, T, Tpc_corrected=Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S,
-                            CO2=CO2, ignore_conflict=ignore_conflict)
-        self._initialize_Pr(Pr, P=P, Ppc_corrected=Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction,
-                            Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        return self.Tr, self.Pr
-
-
-    def _set_first_caller_attributes(self, func_name, func_kwargs):
-        """
-        Helper function to set properties related to the first function called (first in the call stack).
-        This function doesn't do anything for 'calc_...()' functions called inside the first function.
-        For exmaple, if `calc_Ppc_corrected()' is called, this function is skipped for 'calc_Ppc()' function which is
-        triggered inside `calc_Ppc_corrected()`.
-        :param func_name: string
-            ex1) func_name= "calc_Tpc_corrected",
-            ex2) func_name = "calc_Ppc_corrected",
-        :param func_kwargs: kwarg parameters passed to 'func_name'
-            ex1) func_kwargs = {'self': ...some_string, 'sg': None, 'Tpc': 377.59, 'e_correction': None, 'H2S': 0.07, 'CO2': 0.1}
-            ex2) func_kwargs = {'self': ...some_string, 'sg': 0.6, 'Tpc': None, 'e_correction': None, 'H2S': 0.07, 'CO2': 0.1}
-        """
-        if not self._first_caller_is_saved:
-            func_kwargs = {key: value for key, value in func_kwargs.items() if key != 'self'}
-            if 'ignore_conflict' in func_kwargs:
-
-                if func_kwargs['ignore_conflict'] is False:
-                    """
-                    This modification is needed for self._check_conflicting_arguments(). 
-                    The exception in self._check_conflicting_arguments() compares if "kwarg is not None"
-                    The default 'ignore_conflict' is a boolean object, so comparing if "ignore_conflict is not None"
-                    will raise type error 
-                    """
-                    func_kwargs['ignore_conflict'] = None
-
-            self._first_caller_name = func_name
-            self._first_caller_kwargs = func_kwargs
-            self._first_caller_is_saved = True
-        else:
-            pass
-
-    def _check_conflicting_arguments(self, func, calculated_var):
-        """
-        :param func: string
-            ex1) func_name = "calc_Tpc",
-            ex2) func_name = "calc_J",
-        :param calculated_var: string
-            ex1) calculated_var = 'Tpc'
-            ex1) calculated_var = 'J'
-        """
-
-        args = inspect.getfullargspec(func).args[1:]  # arg[0] = 'self', args = arguments defined in "func"
-        for arg in args:
-            if self._first_caller_kwargs[arg] is not None:
-                # this is triggered in z_helper.py's calc_z() function
-                if self._first_caller_name == '_initialize_Tr_and_Pr':
-                    raise TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % ('calc_z', calculated_var, arg))
-
-                raise TypeError('%s() has conflicting keyword arguments "%s" and "%s"' % (self._first_caller_name, calculated_var, arg))
-
-    def _initialize_sg(self, sg):
-        if sg is None:
-            if self._first_caller_name == 'calc_Ppc' or self._first_caller_name == 'calc_Tpc':
-                raise TypeError("Missing a required argument, sg (specific gravity, dimensionless)")
-            else:
-                raise TypeError("Missing a required arguments, sg (specific gravity, dimensionless), or Tpc "
-                                "(pseudo-critical temperature, °R) or Ppc (pseudo-critical pressure, psia). "
-                                "Either both Tpc and Ppc must be inputted, or only sg needs to be inputted. "
-                                "Both Tpc and Ppc can be computed from sg")
-        else:
-            self.sg = sg
-
-    def _initialize_P(self, P):
-        if P is None:
-            raise TypeError("Missing a required argument, P (gas pressure, psig)")
-        else:
-            self.P_a = P  # psia
-            self.P = calc_psig_to_psia(P)
-
-    def _initialize_T(self, T):
-        if T is None:
-            raise TypeError("Missing a required argument, T (gas temperature, °F)")
-        else:
-            self.T_f = T
-            self.T = calc_Fahrenheit_to_Rankine(T)
-
-    def _initialize_H2S(self, H2S):
-        if H2S is None:
-            self.H2S = 0
-        else:
-            self.H2S = H2S
-
-    def _initialize_CO2(self, CO2):
-        if CO2 is None:
-            self.CO2 = 0
-        else:
-            self.CO2 = CO2
-
-    # The first argument A will always be None when called. However, still defining it for structural consistency
-    def _initialize_A(self, A, H2S=None, CO2=None):
-        if A is None:
-            self._calc_A(H2S=H2S, CO2=CO2)
-        else:
-            self.A = A
-
-    # The first argument B will always be None when called. However, still defining it for structural consistency
-    def _initialize_B(self, B, H2S=None):
-        if B is None:
-            self._calc_B(H2S=H2S)
-        else:
-            self.B = B
-
-    def _initialize_Tpc(self, Tpc, sg=None, ignore_conflict=None):
-        if Tpc is None:
-            self.calc_Tpc(sg=sg)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Tpc, 'Tpc')
-            self.Tpc = Tpc
-
-    def _initialize_Ppc(self, Ppc, sg=None, ignore_conflict=None):
-        if Ppc is None:
-            self.calc_Ppc(sg=sg)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Ppc, 'Ppc')
-            self.Ppc = Ppc
-
-    def _initialize_e_correction(self, e_correction, H2S=None, CO2=None, ignore_conflict=False):
-        if e_correction is None:
-            self.calc_e_correction(H2S=H2S, CO2=CO2)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_e_correction, 'e_correction')
-            self.e_correction = e_correction
-
-    def _initialize_Tpc_corrected(self, Tpc_corrected, sg=None, Tpc=None, e_correction=None, H2S=None, CO2=None, ignore_conflict=False):
-        if Tpc_corrected is None:
-            self.calc_Tpc_corrected(sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Tpc_corrected, 'Tpc_corrected')
-            self.Tpc_corrected = Tpc_corrected
-
-    def _initialize_Ppc_corrected(self, Ppc_corrected, sg=None, Tpc=None, Ppc=None, e_correction=None,
-                                  Tpc_corrected=None, H2S=None, CO2=None, ignore_conflict=False):
-        if Ppc_corrected is None:
-            self.calc_Ppc_corrected(sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Ppc_corrected, 'Ppc_corrected')
-            self.Ppc_corrected = Ppc_corrected
-
-    def _initialize_Pr(self, Pr, P=None, Ppc_corrected=None, sg=None, Tpc=None, Ppc=None, e_correction=None, Tpc_corrected=None, H2S=None, CO2=None, ignore_conflict=False):
-        if Pr is None:
-            self.calc_Pr(P=P, Ppc_corrected=Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Pr, 'Pr')
-            self.Pr = Pr
-
-    def _initialize_Tr(self, Tr, T, Tpc_corrected=None, sg=None, Tpc=None, e_correction=None, H2S=None, CO2=None, ignore_conflict=False):
-        if Tr is None:
-            self.calc_Tr(T=T, Tpc_corrected=Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
-        else:
-            if ignore_conflict is False:
-                self._check_conflicting_arguments(self.calc_Tr, 'Tr')
-            self.Tr = Tr
-
-
-
-
+        return tuple(self._calc('_initialize_Tr_and_Pr', ('Tr', 'Pr'), ignore_conflict, sg=sg, P=P, T=T, Tpc=Tpc, Ppc=Ppc,
+                                Tpc_corrected=Tpc_corrected, Ppc_corrected=Ppc_corrected, H2S=H2S, CO2=CO2, Tr=Tr, Pr=Pr,
+                                e_correction=e_correction))
+
+    def _steps(self, name, given):
+        # the correction is not checked if no argument of the sour gas is given
+        if name == 'Tpc_corrected' and not any(arg in given for arg in ('e_correction', 'H2S', 'CO2')):
+            return ('Tpc',)
+        if name == 'Ppc_corrected' and not any(arg in given for arg in ('e_correction', 'H2S', 'CO2', 'Tpc', 'Tpc_corrected')):
+            return ('Ppc',)
+        return PseudocriticalGraph._steps(self, name, given)
+
+    def _missing_argument_message(self, name):
+        if name == 'sg':
+            if self._caller == 'calc_Ppc' or self._caller == 'calc_Tpc':
+                return "Missing a required argument, sg (specific gravity, dimensionless)"
+            return ("Missing a required arguments, sg (specific gravity, dimensionless), or Tpc "
+                    "(pseudo-critical temperature, °R) or Ppc (pseudo-critical pressure, psia). "
+                    "Either both Tpc and Ppc must be inputted, or only sg needs to be inputted. "
+                    "Both Tpc and Ppc can be computed from sg")
+        if name == 'P_g':
+            return "Missing a required argument, P (gas pressure, psig)"
+        if name == 'T_f':
+            return "Missing a required argument, T (gas temperature, °F)"
+        return PseudocriticalGraph._missing_argument_message(self, name)
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def calc_Fahrenheit_to_Rankine(T):
     if T is None:
         raise TypeError("Missing a required argument, 'T' (gas temperature, °F)")
@@ -9,3 +12,12 @@ def calc_psig_to_psia(P):
         raise TypeError("Missing a required argument, 'P' (gas pressure, psig)")
     return P + 14.7
 
+
+
+def _as_float_input(value, default=0):
+    """None becomes the default, and lists or tuples become arrays, so that the correlations vectorize"""
+    if value is None:
+        return default
+    if isinstance(value, (list, tuple)):
+        return np.asarray(value, dtype=float)
+    return value
@@ -41,3 +41,73 @@ def DAK(z=None, Pr=None, Tr=None):
             ((0.27 * Pr) / (z * Tr)) ** 2 /
             Tr ** 3
     ) * np.exp(-A11 * ((0.27 * Pr) / (z * Tr)) ** 2) - z
+
+
+"""
+Reduced-density kernel. DAK() is solved for the reduced density, rho_r = 0.27 * Pr / (z * Tr), instead of z (the
+standard formulation of Dranchuk and Abou-Kassem):
+
+    F(rho_r) = 1 + C1 * rho_r + C2 * rho_r ** 2 - C3 * rho_r ** 5 + C4 * rho_r ** 2 * (1 + C5 * rho_r ** 2)
+               * exp(-C5 * rho_r ** 2) - a / rho_r = 0,   where a = 0.27 * Pr / Tr, and z = a / rho_r
+
+C1 ~ C5 depend only on Tr. They are computed once per temperature with DAK_coefficients(), and reused for every
+pressure and every iteration. Londono's model shares the same functional form, and uses the same kernel with
+londono_coefficients().
+"""
+
+
+def DAK_coefficients(Tr=None):
+    """
+    Tr-only coefficient groups of DAK(). Returns a tuple of (0.27 / Tr, C1, C2, C3, C4, C5), where the first item
+    converts Pr into a = 0.27 * Pr / Tr
+    """
+    A1 = 0.3265
+    A2 = -1.0700
+    A3 = -0.5339
+    A4 = 0.01569
+    A5 = -0.05165
+    A6 = 0.5475
+    A7 = -0.7361
+    A8 = 0.1844
+    A9 = 0.1056
+    A10 = 0.6134
+    A11 = 0.7210
+
+    C1 = A1 + A2 / Tr + A3 / Tr ** 3 + A4 / Tr ** 4 + A5 / Tr ** 5
+    C2 = A6 + A7 / Tr + A8 / Tr ** 2
+    C3 = A9 * (A7 / Tr + A8 / Tr ** 2)
+    C4 = A10 / Tr ** 3
+    C5 = A11
+
+    return 0.27 / Tr, C1, C2, C3, C4, C5
+
+
+def DAK_rho_r(rho_r=None, a=None, C1=None, C2=None, C3=None, C4=None, C5=None):
+    """Residual of the reduced-density kernel, F(rho_r)"""
+    rho_r2 = rho_r * rho_r
+    return 1 + C1 * rho_r + C2 * rho_r2 - C3 * rho_r2 * rho_r2 * rho_r \
+        + C4 * rho_r2 * (1 + C5 * rho_r2) * np.exp(-C5 * rho_r2) - a / rho_r
+
+
+def DAK_rho_r_fprime(rho_r=None, a=None, C1=None, C2=None, C3=None, C4=None, C5=None):
+    """Derivative of the reduced-density kernel, dF/drho_r"""
+    rho_r2 = rho_r * rho_r
+    return C1 + 2 * C2 * rho_r - 5 * C3 * rho_r2 * rho_r2 \
+        + 2 * C4 * rho_r * (1 + C5 * rho_r2 - C5 * C5 * rho_r2 * rho_r2) * np.exp(-C5 * rho_r2) + a / rho_r2
+
+
+def DAK_rho_r_fprime2(rho_r=None, a=None, C1=None, C2=None, C3=None, C4=None, C5=None):
+    """Second derivative of the reduced-density kernel, d2F/drho_r2"""
+    rho_r2 = rho_r * rho_r
+    return 2 * C2 - 20 * C3 * rho_r2 * rho_r \
+        + 2 * C4 * (1 + C5 * rho_r2 - 7 * C5 * C5 * rho_r2 * rho_r2 + 2 * C5 * C5 * C5 * rho_r2 * rho_r2 * rho_r2) \
+        * np.exp(-C5 * rho_r2) - 2 * a / (rho_r2 * rho_r)
+
+
+def DAK_rho_r_virial(C1=None, C2=None, C3=None, C4=None, C5=None):
+    """
+    Virial coefficients of the reduced-density kernel, (B, C, D) of z = 1 + B * rho_r + C * rho_r ** 2 + D * rho_r ** 3,
+    where z = a / rho_r. The exponential term expands into C4 * rho_r ** 2 + O(rho_r ** 6), so the series is exact up
+    to the -C3 * rho_r ** 5 term
+    """
+    return C1, C2 + C4, 0.0
@@ -0,0 +1,18 @@
+import numpy as np
+
+"""
+Beggs, H.D. and Brill, J.P.: "A Study of Two-Phase Flow in Inclined Pipes," Journal of Petroleum Technology (1973),
+25(05), 607-617
+
+Explicit z-factor correlation fitted to the Standing-Katz chart, for 1.2 <= Tr <= 2.4.
+"""
+
+
+def beggs_brill(Pr=None, Tr=None):
+
+    A = 1.39 * (Tr - 0.92) ** 0.5 - 0.36 * Tr - 0.101
+    B = (0.62 - 0.23 * Tr) * Pr + (0.066 / (Tr - 0.86) - 0.037) * Pr ** 2 + 0.32 * Pr ** 6 / 10 ** (9 * (Tr - 1))
+    C = 0.132 - 0.32 * np.log10(Tr)
+    D = 10 ** (0.3106 - 0.49 * Tr + 0.1824 * Tr ** 2)
+
+    return A + (1 - A) * np.exp(-B) + C * Pr ** D
@@ -20,3 +20,55 @@ def hall_yarborough(z=None, Pr=None, Tr=None):
         + (((A1 * Pr) / z) + ((A1 * Pr) / z) ** 2 + ((A1 * Pr) / z) ** 3 - ((A1 * Pr) / z) ** 4)/(1 - ((A1 * Pr) / z)) ** 3 \
         - A2 * ((A1 * Pr) / z) ** 2 + A3 * ((A1 * Pr) / z) ** A4
 
+
+"""
+Reduced-density kernel. hall_yarborough() is solved for the reduced density, y = A1 * Pr / z, which is the natural
+variable of the Hall-Yarborough equation of state:
+
+    F(y) = -a + (y + y ** 2 + y ** 3 - y ** 4) / (1 - y) ** 3 - A2 * y ** 2 + A3 * y ** A4 = 0,
+    where a = A1 * Pr, and z = a / y
+
+A1 ~ A4 depend only on t = 1 / Tr. They are computed once per temperature with hall_yarborough_coefficients(), and
+reused for every pressure and every iteration.
+"""
+
+
+def hall_yarborough_coefficients(Tr=None):
+    """
+    t-dependent terms of hall_yarborough(). Returns a tuple of (A1, A2, A3, A4), where the first item converts Pr
+    into a = A1 * Pr
+    """
+    t = 1 / Tr
+
+    A1 = 0.06125 * t * np.exp(-1.2 * (1 - t) ** 2)
+    A2 = 14.76 * t - 9.76 * t ** 2 + 4.58 * t ** 3
+    A3 = 90.7 * t - 242.2 * t ** 2 + 42.4 * t ** 3
+    A4 = 2.18 + 2.82 * t
+
+    return A1, A2, A3, A4
+
+
+def hall_yarborough_y(y=None, a=None, A2=None, A3=None, A4=None):
+    """Residual of the reduced-density kernel, F(y)"""
+    y2 = y * y
+    return -a + (y + y2 + y2 * y - y2 * y2) / (1 - y) ** 3 - A2 * y2 + A3 * y ** A4
+
+
+def hall_yarborough_y_fprime(y=None, a=None, A2=None, A3=None, A4=None):
+    """Derivative of the reduced-density kernel, dF/dy"""
+    y2 = y * y
+    return (1 + 4 * y + 4 * y2 - 4 * y2 * y + y2 * y2) / (1 - y) ** 4 - 2 * A2 * y + A4 * A3 * y ** (A4 - 1)
+
+
+def hall_yarborough_y_fprime2(y=None, a=None, A2=None, A3=None, A4=None):
+    """Second derivative of the reduced-density kernel, d2F/dy2"""
+    return (8 + 20 * y - 4 * y * y) / (1 - y) ** 5 - 2 * A2 + A4 * (A4 - 1) * A3 * y ** (A4 - 2)
+
+
+def hall_yarborough_y_virial(A2=None, A3=None, A4=None):
+    """
+    Virial coefficients of the reduced-density kernel, (B, C, D) of z = 1 + B * y + C * y ** 2 + D * y ** 3, where
+    z = a / y. The hard-sphere term expands into 1 + 4 * y + 10 * y ** 2 + 18 * y ** 3 + O(y ** 4). The term
+    A3 * y ** (A4 - 1) isn't a power series of y, and is left to the error of the series
+    """
+    return 4 - A2, 10.0, 18.0
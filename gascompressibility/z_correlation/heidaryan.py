@@ -0,0 +1,39 @@
+import numpy as np
+
+"""
+Heidaryan, E., Moghadasi, J., and Rahimi, M.: "New correlations to predict natural gas viscosity and compressibility
+factor," Journal of Petroleum Science and Engineering (2010), 73(1-2), 67-72
+
+https://doi.org/10.1016/j.petrol.2010.05.008
+
+Explicit z-factor correlation, a rational function of ln(Pr) and 1/Tr, with separate coefficients for Pr <= 3 and
+Pr > 3.
+"""
+
+# A1 ~ A11 (rows), for 0.2 <= Pr <= 3 and 3 < Pr <= 15 (columns)
+_COEFFICIENTS = np.array([
+    [2.827793, 3.252838],
+    [-0.4688191, -0.1306424],
+    [-1.262288, -0.6449194],
+    [-1.536524, -1.518028],
+    [-4.535045, -5.391019],
+    [0.06895104, -0.01379588],
+    [0.1903869, 0.06600633],
+    [0.6200089, 0.6120783],
+    [1.838479, 2.317431],
+    [0.4052367, 0.1632223],
+    [1.073574, 0.5660595],
+])
+
+
+def heidaryan(Pr=None, Tr=None):
+
+    A1, A2, A3, A4, A5, A6, A7, A8, A9, A10, A11 = _COEFFICIENTS[:, (np.asarray(Pr) > 3).astype(np.intp)]
+
+    ln_Pr = np.log(Pr)
+    t = 1 / Tr
+
+    numerator = A1 + A3 * ln_Pr + A5 * t + A7 * ln_Pr ** 2 + A9 * t ** 2 + A11 * ln_Pr * t
+    denominator = 1 + A2 * ln_Pr + A4 * t + A6 * ln_Pr ** 2 + A8 * t ** 2 + A10 * ln_Pr * t
+
+    return np.log(numerator / denominator)
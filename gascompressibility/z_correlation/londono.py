@@ -41,4 +41,30 @@ def londono(z=None, Pr=None, Tr=None):
     ) * (
             ((0.27 * Pr) / (z * Tr)) ** 2 /
             Tr ** 3
-    ) * np.exp(-A11 * ((0.27 * Pr) / (z * Tr)) ** 2) - z
\ No newline at end of file
+    ) * np.exp(-A11 * ((0.27 * Pr) / (z * Tr)) ** 2) - z
+
+
+def londono_coefficients(Tr=None):
+    """
+    Tr-only coefficient groups of londono(), for the reduced-density kernel shared with DAK (DAK_rho_r). Returns a tuple
+    of (0.27 / Tr, C1, C2, C3, C4, C5)
+    """
+    A1 = 0.3024696
+    A2 = -1.046964
+    A3 = -0.1078916
+    A4 = -0.7694186
+    A5 = 0.1965439
+    A6 = 0.6527819
+    A7 = -1.118884
+    A8 = 0.3951957
+    A9 = 0.09313593
+    A10 = 0.8483081
+    A11 = 0.7880011
+
+    C1 = A1 + A2 / Tr + A3 / Tr ** 3 + A4 / Tr ** 4 + A5 / Tr ** 5
+    C2 = A6 + A7 / Tr + A8 / Tr ** 2
+    C3 = A9 * (A7 / Tr + A8 / Tr ** 2)
+    C4 = A10 / Tr ** 3
+    C5 = A11
+
+    return 0.27 / Tr, C1, C2, C3, C4, C5
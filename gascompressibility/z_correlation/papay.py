@@ -0,0 +1,10 @@
+"""
+Papay, J.: "A Termelestechnologiai Parameterek Valtozasa a Gazlelepk Muvelese Soran,"
+OGIL MUSZ, Tud, Kuzl., Budapest (1968), 267-273
+
+Explicit z-factor correlation, quadratic in Pr. Accurate only at moderate pressures and away from the critical point.
+"""
+
+
+def papay(Pr=None, Tr=None):
+    return 1 - 3.53 * Pr / 10 ** (0.9813 * Tr) + 0.274 * Pr ** 2 / 10 ** (0.8157 * Tr)
@@ -0,0 +1,310 @@
+import numpy as np
+from numpy.polynomial import chebyshev
+
+# module import, because z_helper imports this module for calc_z(..., engine='chebyshev')
+from gascompressibility.z_correlation import z_helper
+
+"""
+Piecewise Chebyshev surrogates of the z-factor.
+
+The working range of a z-model is split into rectangular patches by repeated bisections, and z(Pr, Tr) is
+approximated on each patch by a tensor-product Chebyshev expansion, z = sum c[j, i] * T_j(y) * T_i(x), where x and y
+are Pr and Tr mapped onto [-1, 1]. A patch is bisected until its expansion reproduces the solved z-factor to the
+requested tolerance. Near the critical point the implicit models jump from one root to another, and no polynomial can
+follow the jump. Patches that reach the minimum size without meeting the tolerance are kept, but not used: the points
+in them are solved instead.
+"""
+
+SURROGATE_FORMAT_VERSION = 2
+
+# fraction of the tolerance a patch must meet on its check grid, so that the tolerance still holds between the points
+# of the grid
+_TOL_MARGIN = 0.5
+
+
+def _chebyshev_nodes(degree):
+    """Chebyshev-Gauss-Lobatto points on [-1, 1], in increasing order"""
+    return -np.cos(np.pi * np.arange(degree + 1) / degree)
+
+
+def _to_unit(x, lo, hi):
+    return (2 * x - (lo + hi)) / (hi - lo)
+
+
+def _from_unit(x, lo, hi):
+    return ((lo + hi) + (hi - lo) * x) / 2
+
+
+def _chop(c, tol):
+    """drops the trailing rows and columns of c whose absolute sum is below tol / 4 each"""
+    a = np.abs(c)
+    row_tail = np.cumsum(a.sum(axis=1)[::-1])[::-1]
+    n_rows = max(1, int(np.count_nonzero(row_tail >= tol / 4)))
+    col_tail = np.cumsum(a[:n_rows].sum(axis=0)[::-1])[::-1]
+    n_cols = max(1, int(np.count_nonzero(col_tail >= tol / 4)))
+    return c[:n_rows, :n_cols]
+
+
+class ChebyshevSurrogate(object):
+    """
+    Piecewise tensor-product Chebyshev approximation of the z-factor over a Pr-Tr box. Created with
+    :ref:`fit_chebyshev <fit_chebyshev>`, or loaded from disk with ``ChebyshevSurrogate.load()``.
+
+    >>> import gascompressibility as gc
+    >>> surrogate = gc.fit_chebyshev(zmodel='DAK', tol=1e-8)
+    >>> surrogate(Pr=3.0647, Tr=1.4395)
+    0.7366716759213483
+    >>> surrogate.nbytes
+    50192
+
+    Evaluation is pure polynomial arithmetic. Points outside of the box, or in the patches near the critical point
+    that didn't meet the tolerance, get NaN. ``calc_z(..., engine='chebyshev')`` solves those points instead.
+
+    Attributes
+    ----------
+    zmodel : str
+        z-correlation model the surrogate approximates
+    tol : float
+        absolute tolerance of the surrogate. The patches were fitted to half of it on their check grids
+    Pr_range : tuple
+        (min, max) of the reduced pressure
+    Tr_range : tuple
+        (min, max) of the reduced temperature
+    bounds : array
+        array of shape (n_patches, 4) of (Pr_min, Pr_max, Tr_min, Tr_max) of each patch
+    coefficients : list
+        2-D arrays of Chebyshev coefficients of each patch, c[j, i] of T_j(Tr) * T_i(Pr)
+    errors : array
+        largest absolute error of each patch found on its check grid. The patches whose error is above half of
+        ``tol`` (see ``converged``) aren't used
+    patch_map : array
+        2-D array of the index of the patch of each cell of a uniform grid as fine as the smallest patch. The patches
+        are bisections of the box, so every patch covers whole cells of the grid, and a point finds its patch with a
+        single lookup
+    """
+
+    def __init__(self, zmodel, tol, Pr_range, Tr_range, bounds, coefficients, errors):
+        self.zmodel = zmodel
+        self.tol = float(tol)
+        self.Pr_range = tuple(float(x) for x in Pr_range)
+        self.Tr_range = tuple(float(x) for x in Tr_range)
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.coefficients = [np.asarray(c, dtype=float) for c in coefficients]
+        self.errors = np.asarray(errors, dtype=float)
+        self.patch_map = self._build_patch_map()
+
+    def __repr__(self):
+        return '<gascompressibility.ChebyshevSurrogate> zmodel="%s", tol=%s, Pr_range=%s, Tr_range=%s, patches=%d, ' \
+               'unconverged patches=%d, nbytes=%d' % (
+                   self.zmodel, self.tol, self.Pr_range, self.Tr_range, len(self.coefficients),
+                   np.count_nonzero(~self.converged), self.nbytes
+               )
+
+    @property
+    def converged(self):
+        """boolean array of the patches that met the tolerance, with the margin of the fit, and are used"""
+        return self.errors <= _TOL_MARGIN * self.tol
+
+    @property
+    def nbytes(self):
+        """memory used by the coefficients, bounds, errors and the patch map"""
+        return sum(c.nbytes for c in self.coefficients) + self.bounds.nbytes + self.errors.nbytes + self.patch_map.nbytes
+
+    def _cells(self, Pr_min, Pr_max, Tr_min, Tr_max, n_Pr, n_Tr):
+        """cell indices (floats) of the corners of a rectangle, on a grid of n_Pr by n_Tr cells"""
+        i = (np.array([Pr_min, Pr_max]) - self.Pr_range[0]) / (self.Pr_range[1] - self.Pr_range[0]) * n_Pr
+        j = (np.array([Tr_min, Tr_max]) - self.Tr_range[0]) / (self.Tr_range[1] - self.Tr_range[0]) * n_Tr
+        return np.rint(i).astype(np.intp), np.rint(j).astype(np.intp)
+
+    def _build_patch_map(self):
+        Pr_width = self.bounds[:, 1] - self.bounds[:, 0]
+        Tr_width = self.bounds[:, 3] - self.bounds[:, 2]
+        n_Pr = int(round((self.Pr_range[1] - self.Pr_range[0]) / Pr_width.min()))
+        n_Tr = int(round((self.Tr_range[1] - self.Tr_range[0]) / Tr_width.min()))
+        patch_map = np.zeros((n_Tr, n_Pr), dtype=np.int16 if len(self.bounds) < 2 ** 15 else np.int32)
+        for p, bounds in enumerate(self.bounds):
+            i, j = self._cells(*bounds, n_Pr=n_Pr, n_Tr=n_Tr)
+            patch_map[j[0]:j[1], i[0]:i[1]] = p
+        return patch_map
+
+    def _locate(self, Pr, Tr):
+        """index of the patch of each point"""
+        n_Tr, n_Pr = self.patch_map.shape
+        i = (Pr - self.Pr_range[0]) * (n_Pr / (self.Pr_range[1] - self.Pr_range[0]))
+        j = (Tr - self.Tr_range[0]) * (n_Tr / (self.Tr_range[1] - self.Tr_range[0]))
+        i = np.minimum(i.astype(np.intp), n_Pr - 1)
+        j = np.minimum(j.astype(np.intp), n_Tr - 1)
+        return self.patch_map[j, i]
+
+    def __call__(self, Pr=None, Tr=None):
+        """
+        Evaluates the z-factor. Pr and Tr are broadcast against each other. Points outside of the box, or in the
+        patches that didn't meet the tolerance, get NaN. Returns a float for scalar inputs, and an array otherwise
+        """
+        Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+        shape = Pr.shape
+        Pr = Pr.ravel()
+        Tr = Tr.ravel()
+        Z = np.full(Pr.size, np.nan)
+
+        inside = np.flatnonzero(
+            (Pr >= self.Pr_range[0]) & (Pr <= self.Pr_range[1]) & (Tr >= self.Tr_range[0]) & (Tr <= self.Tr_range[1])
+        )
+        patch = self._locate(Pr[inside], Tr[inside])
+
+        # group the points by patch, and evaluate each group with the coefficients of its patch
+        order = np.argsort(patch, kind='stable')
+        patches, starts = np.unique(patch[order], return_index=True)
+        converged = self.converged
+        for p, points in zip(patches, np.split(inside[order], starts[1:])):
+            if not converged[p]:
+                continue
+            Pr_min, Pr_max, Tr_min, Tr_max = self.bounds[p]
+            x = _to_unit(Pr[points], Pr_min, Pr_max)
+            y = _to_unit(Tr[points], Tr_min, Tr_max)
+            c = self.coefficients[p]
+            # sum over j, i of T_j(y) * c[j, i] * T_i(x), as a matrix product of the Chebyshev-Vandermonde matrices
+            Z[points] = np.einsum('nj,nj->n', chebyshev.chebvander(y, c.shape[0] - 1) @ c, chebyshev.chebvander(x, c.shape[1] - 1))
+
+        Z = Z.reshape(shape)
+        if Z.ndim == 0:
+            return float(Z)
+        return Z
+
+    def save(self, path):
+        """Saves the surrogate into ``path`` (a ``.npz`` file)"""
+        shapes = np.array([c.shape for c in self.coefficients], dtype=np.intp)
+        np.savez(
+            path,
+            format_version=SURROGATE_FORMAT_VERSION,
+            zmodel=self.zmodel,
+            tol=self.tol,
+            Pr_range=self.Pr_range,
+            Tr_range=self.Tr_range,
+            bounds=self.bounds,
+            shapes=shapes,
+            coefficients=np.concatenate([c.ravel() for c in self.coefficients]),
+            errors=self.errors,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Loads a surrogate saved with ``save()``"""
+        with np.load(path) as data:
+            if int(data['format_version']) != SURROGATE_FORMAT_VERSION:
+                raise ValueError('Surrogate "%s" has format version %s, expected %s' % (
+                    path, int(data['format_version']), SURROGATE_FORMAT_VERSION))
+            sizes = np.prod(data['shapes'], axis=1)
+            coefficients = [
+                c.reshape(shape) for c, shape in zip(np.split(data['coefficients'], np.cumsum(sizes)[:-1]), data['shapes'])
+            ]
+            return cls(str(data['zmodel']), float(data['tol']), data['Pr_range'], data['Tr_range'], data['bounds'],
+                       coefficients, data['errors'])
+
+
+def _fit_patch(zmodel, Pr_range, Tr_range, degree, tol):
+    """fits a single patch. Returns the (chopped) coefficients and the largest error on the check grid"""
+    nodes = _chebyshev_nodes(degree)
+    Pr = _from_unit(nodes, *Pr_range)
+    Tr = _from_unit(nodes, *Tr_range)
+    Z = z_helper.calc_z_array(Pr=Pr, Tr=Tr[:, np.newaxis], zmodel=zmodel)
+
+    # interpolation at the nodes, c = V^-1 Z V^-T, where V is the Chebyshev-Vandermonde matrix of the nodes
+    V_inv = np.linalg.inv(chebyshev.chebvander(nodes, degree))
+    c = _chop(V_inv @ Z @ V_inv.T, tol)
+
+    # the error is checked at the centers of a uniform grid three times as dense as the nodes, which are away from the
+    # nodes where the interpolation is exact
+    check = (2 * np.arange(3 * degree) + 1) / (3 * degree) - 1
+    Z_check = z_helper.calc_z_array(Pr=_from_unit(check, *Pr_range), Tr=_from_unit(check, *Tr_range)[:, np.newaxis], zmodel=zmodel)
+    error = np.abs(chebyshev.chebgrid2d(check, check, c) - Z_check).max()
+    if not np.isfinite(error):
+        error = np.inf
+    return c, float(error)
+
+
+def fit_chebyshev(zmodel='DAK', tol=1e-8, Pr_range=None, Tr_range=None, degree=16, min_size=1 / 64):
+    """
+    Fits a piecewise Chebyshev surrogate of the z-factor of ``zmodel``, bisecting the patches until each one meets
+    ``tol``. Re-run this to regenerate the coefficients when a z-model changes.
+
+    >>> import gascompressibility as gc
+    >>> surrogate = gc.fit_chebyshev(zmodel='hall_yarborough', tol=1e-8)
+    >>> surrogate.save('hall_yarborough.npz')
+    >>> surrogate = gc.ChebyshevSurrogate.load('hall_yarborough.npz')
+    >>> gc.calc_z(sg=0.7, P=2010, T=75, zmodel='hall_yarborough', engine=surrogate)
+    0.7353497316972147
+
+    Parameters
+    ----------
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'``
+    tol : float
+        largest absolute error allowed on each patch. The patches are fitted to half of it on their check grids, so that
+        it also holds between the points of the grids
+    Pr_range : tuple
+        (min, max) of the reduced pressure. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Pr']``
+    Tr_range : tuple
+        (min, max) of the reduced temperature. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Tr']``
+    degree : int
+        degree of the Chebyshev expansion along each axis, before the trailing coefficients below the tolerance are
+        dropped
+    min_size : float
+        patches aren't bisected below this fraction of the box along each axis. Patches of this size that still don't
+        meet ``tol`` (near the critical point) aren't used by the surrogate
+
+    Returns
+    -------
+    ChebyshevSurrogate
+    """
+    if zmodel not in z_helper.models.keys():
+        raise KeyError(
+            'Z-factor model "%s" is not implemented. Choose from the list of available models: %s' % (zmodel, z_helper.zmodels_ks)
+        )
+    Pr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Pr'] if Pr_range is None else Pr_range))
+    Tr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Tr'] if Tr_range is None else Tr_range))
+    min_width = (min_size * (Pr_range[1] - Pr_range[0]), min_size * (Tr_range[1] - Tr_range[0]))
+
+    bounds = []
+    coefficients = []
+    errors = []
+
+    # depth-first bisection of the box
+    stack = [(Pr_range, Tr_range)]
+    while stack:
+        Pr_range_, Tr_range_ = stack.pop()
+        c, error = _fit_patch(zmodel, Pr_range_, Tr_range_, degree, _TOL_MARGIN * tol)
+
+        # a patch is bisected only if both halves are at least min_width wide
+        can_split = [Pr_range_[1] - Pr_range_[0] > 1.999 * min_width[0], Tr_range_[1] - Tr_range_[0] > 1.999 * min_width[1]]
+        if error <= _TOL_MARGIN * tol or not any(can_split):
+            bounds.append(Pr_range_ + Tr_range_)
+            coefficients.append(c)
+            errors.append(error)
+            continue
+
+        # bisect the axis along which the expansion converges slower (larger trailing coefficients)
+        tail_Pr = np.abs(c[:, -3:]).max() if c.shape[1] > degree - 2 else 0
+        tail_Tr = np.abs(c[-3:, :]).max() if c.shape[0] > degree - 2 else 0
+        if (tail_Pr >= tail_Tr and can_split[0]) or not can_split[1]:
+            split = (Pr_range_[0] + Pr_range_[1]) / 2
+            stack.append(((Pr_range_[0], split), Tr_range_))
+            stack.append(((split, Pr_range_[1]), Tr_range_))
+        else:
+            split = (Tr_range_[0] + Tr_range_[1]) / 2
+            stack.append((Pr_range_, (Tr_range_[0], split)))
+            stack.append((Pr_range_, (split, Tr_range_[1])))
+
+    return ChebyshevSurrogate(zmodel, tol, Pr_range, Tr_range, bounds, coefficients, errors)
+
+
+# default surrogates used by calc_z(..., engine='chebyshev'), fitted on first use for each z-model
+_default_surrogates = {}
+
+
+def get_default_surrogate(zmodel):
+    """returns the default ChebyshevSurrogate of "zmodel", and fits it on the first call"""
+    if zmodel not in _default_surrogates:
+        _default_surrogates[zmodel] = fit_chebyshev(zmodel=zmodel)
+    return _default_surrogates[zmodel]
@@ -0,0 +1,243 @@
+import json
+
+import numpy as np
+
+# module import, because z_helper imports this module
+from gascompressibility.z_correlation import z_helper
+
+"""
+Explicit initial-guess models of the z-factor for the implicit z-models.
+
+The "kareem" model, which makes the smart guesses of calc_z, works up to Pr = 15. Above it the isotherms of the
+z-factor are nearly straight lines in Pr, so each implicit z-model gets a fitted polynomial, quadratic in Pr and
+quartic in t = 1 / Tr, that covers 15 <= Pr <= 30 and 1 <= Tr <= 3 with a largest error of ~3e-3. That is close enough
+for Newton's method to converge in two or three iterations, instead of the six or more needed from a fixed guess.
+"""
+
+
+HIGH_PRESSURE_GUESS_RANGE = {'Pr': (15, 30), 'Tr': (1, 3)}
+
+# coefficients c[i][j] of Pr ** i * t ** j, least squares fit of each z-model on a 61 x 81 grid over
+# HIGH_PRESSURE_GUESS_RANGE. Refit with _fit_high_pressure_guess()
+_HIGH_PRESSURE_GUESS_COEFFICIENTS = {
+    'DAK': (
+        (7.3540772685929609e-02, 7.4728129409852890e+00, -2.2506397390402295e+01, 2.3617706293029805e+01, -8.4982478564884651e+00),
+        (9.1220941899122068e-02, -5.6004321803492119e-01, 1.6227014282496137e+00, -1.5815672457570367e+00, 5.4128554599472212e-01),
+        (-1.5485042499427987e-03, 1.0988948459674377e-02, -2.6423294439283328e-02, 2.5174300844125082e-02, -8.5050394080646140e-03),
+    ),
+    'hall_yarborough': (
+        (5.9598956347045406e-01, 3.6876929784554799e+00, -1.2743248516332654e+01, 1.3054706513299097e+01, -4.4538535250398281e+00),
+        (3.1086762993305192e-02, -1.4454215506648016e-01, 5.9603734246374651e-01, -5.0206456014758272e-01, 1.3232508157343548e-01),
+        (-4.6537814151563197e-04, 3.5719638969594594e-03, -9.4363940738734740e-03, 9.1441454678714684e-03, -3.0331806605440243e-03),
+    ),
+    'londono': (
+        (1.1105070535951876e-01, 7.3187049091643912e+00, -2.2523921235689787e+01, 2.3938052474624687e+01, -8.7081859646860380e+00),
+        (9.6283085526731094e-02, -6.0225362107169811e-01, 1.7498929282771218e+00, -1.7231560979276539e+00, 5.9403273494779230e-01),
+        (-1.6893512976862437e-03, 1.2134895815912160e-02, -2.9418222358283192e-02, 2.8339341227346441e-02, -9.6742200332858921e-03),
+    ),
+}
+
+
+def high_pressure_guess(Pr=None, Tr=None, zmodel='DAK'):
+    """
+    Explicit estimate of the z-factor of the implicit z-model "zmodel" for 15 <= Pr <= 30 and 1 <= Tr <= 3, used as
+    the initial guess of the smart guesses above the working range of "kareem". Works on floats and arrays alike.
+    Outside of HIGH_PRESSURE_GUESS_RANGE the polynomial is extrapolated, and shouldn't be used
+    """
+    c = _HIGH_PRESSURE_GUESS_COEFFICIENTS[zmodel]
+    t = 1 / Tr
+    # Horner's method in t for each power of Pr, and then in Pr
+    c_0, c_1, c_2 = [(((c_i[4] * t + c_i[3]) * t + c_i[2]) * t + c_i[1]) * t + c_i[0] for c_i in c]
+    return c_0 + Pr * (c_1 + Pr * c_2)
+
+
+def _fit_high_pressure_guess(zmodel, n_Pr=61, n_Tr=81):
+    """least squares fit of the coefficients of high_pressure_guess() to the solved z-factor of "zmodel" """
+    Pr, Tr = np.meshgrid(np.linspace(*HIGH_PRESSURE_GUESS_RANGE['Pr'], n_Pr), np.linspace(*HIGH_PRESSURE_GUESS_RANGE['Tr'], n_Tr))
+    z = z_helper.calc_z_array(Pr=Pr, Tr=Tr, zmodel=zmodel).ravel()
+    t = 1 / Tr.ravel()
+    A = np.stack([Pr.ravel() ** i * t ** j for i in range(3) for j in range(5)], axis=1)
+    c = np.linalg.lstsq(A, z, rcond=None)[0].reshape(3, 5)
+    return tuple(tuple(float(x) for x in row) for row in c)
+
+
+GUESS_MAP_FORMAT_VERSION = 1
+
+
+class GuessMap(object):
+    """
+    Adaptive index of initial guesses over a coarse Pr-Tr grid of cells. Each cell remembers the z-factor of the first
+    point solved in it, and the initial guess that converged there. Solves passed the map with
+    ``calc_z(..., guess_map=guess_map)`` (or ``calc_z_array``) start from the stored values of their cell, so the retry
+    path of the guess cascade (ex: near Tr = 1.05, where the "kareem" guess often fails) runs only once per cell.
+
+    >>> import gascompressibility as gc
+    >>> guess_map = gc.GuessMap(zmodel='DAK').warm()
+    >>> gc.calc_z(sg=0.7, P=2010, T=75, guess_map=guess_map)
+    0.7366562810878986
+    >>> guess_map.save('DAK_guess_map.npz')
+    >>> guess_map = gc.GuessMap.load('DAK_guess_map.npz')
+
+    A root reached from a stored value is accepted only if it is within ``max_dz`` of the stored z-factor, otherwise
+    the standard guesses are tried. This keeps cells that straddle the jump between roots near the critical point from
+    pulling points onto the wrong root. Maps are pickled with their contents, and ``merge()`` combines the maps warmed
+    by several worker processes.
+
+    Parameters
+    ----------
+    zmodel : str
+        choice of an implicit z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``
+    Pr_range : tuple
+        (min, max) of the reduced pressure. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Pr']``
+    Tr_range : tuple
+        (min, max) of the reduced temperature. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Tr']``
+    n_Pr : int
+        number of cells along Pr
+    n_Tr : int
+        number of cells along Tr
+    max_dz : float
+        largest distance of a root from the stored z-factor of its cell to be accepted
+
+    Attributes
+    ----------
+    z : array
+        array of shape (n_Tr, n_Pr) of the stored z-factor of each cell. NaN for empty cells
+    guess : array
+        array of shape (n_Tr, n_Pr) of the first initial guess that converged in each cell. NaN for empty cells, and
+        for cells solved by the bracketed fallback or the low-pressure branch
+    """
+
+    def __init__(self, zmodel='DAK', Pr_range=None, Tr_range=None, n_Pr=300, n_Tr=200, max_dz=0.1):
+        if zmodel not in z_helper.models.keys() or zmodel in z_helper.explicit_models:
+            raise KeyError(
+                'Guess maps are available only for the implicit z-models. Model "%s" is not implemented. Choose from '
+                'the list of available models: %s' % (zmodel, '["DAK", "hall_yarborough", "londono"]')
+            )
+        self.zmodel = zmodel
+        self.Pr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Pr'] if Pr_range is None else Pr_range))
+        self.Tr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Tr'] if Tr_range is None else Tr_range))
+        self.n_Pr = int(n_Pr)
+        self.n_Tr = int(n_Tr)
+        self.max_dz = float(max_dz)
+        self.z = np.full((self.n_Tr, self.n_Pr), np.nan)
+        self.guess = np.full((self.n_Tr, self.n_Pr), np.nan)
+
+    def __repr__(self):
+        return '<gascompressibility.GuessMap> zmodel="%s", Pr_range=%s, Tr_range=%s, shape=(%d, %d), coverage=%.3f' % (
+            self.zmodel, self.Pr_range, self.Tr_range, self.n_Tr, self.n_Pr, self.coverage
+        )
+
+    @property
+    def coverage(self):
+        """fraction of the cells that store a z-factor"""
+        return float(np.isfinite(self.z).mean())
+
+    @property
+    def Pr(self):
+        """centers of the cells along Pr"""
+        edges = np.linspace(self.Pr_range[0], self.Pr_range[1], self.n_Pr + 1)
+        return (edges[1:] + edges[:-1]) / 2
+
+    @property
+    def Tr(self):
+        """centers of the cells along Tr"""
+        edges = np.linspace(self.Tr_range[0], self.Tr_range[1], self.n_Tr + 1)
+        return (edges[1:] + edges[:-1]) / 2
+
+    def _cells(self, Pr, Tr):
+        """flat indices of the cells of the points, -1 outside of the map"""
+        u = (np.asarray(Pr, dtype=float) - self.Pr_range[0]) / (self.Pr_range[1] - self.Pr_range[0]) * self.n_Pr
+        v = (np.asarray(Tr, dtype=float) - self.Tr_range[0]) / (self.Tr_range[1] - self.Tr_range[0]) * self.n_Tr
+        inside = (u >= 0) & (u <= self.n_Pr) & (v >= 0) & (v <= self.n_Tr)
+        with np.errstate(invalid='ignore'):
+            i = np.clip(np.where(inside, u, 0).astype(np.intp), 0, self.n_Pr - 1)
+            j = np.clip(np.where(inside, v, 0).astype(np.intp), 0, self.n_Tr - 1)
+        return np.where(inside, j * self.n_Pr + i, -1)
+
+    def lookup(self, Pr, Tr):
+        """returns the stored (z, guess) of the cells of the points. NaN for empty cells and points outside the map"""
+        k = self._cells(Pr, Tr)
+        z = np.where(k >= 0, self.z.ravel()[np.maximum(k, 0)], np.nan)
+        guess = np.where(k >= 0, self.guess.ravel()[np.maximum(k, 0)], np.nan)
+        return z, guess
+
+    def _cell_scalar(self, Pr, Tr):
+        """scalar version of _cells(), without the overhead of numpy on scalars. Returns (j, i), or None outside the map"""
+        u = (Pr - self.Pr_range[0]) / (self.Pr_range[1] - self.Pr_range[0]) * self.n_Pr
+        v = (Tr - self.Tr_range[0]) / (self.Tr_range[1] - self.Tr_range[0]) * self.n_Tr
+        if not (0 <= u <= self.n_Pr and 0 <= v <= self.n_Tr):
+            return None
+        return min(int(v), self.n_Tr - 1), min(int(u), self.n_Pr - 1)
+
+    def _lookup_scalar(self, Pr, Tr):
+        """scalar version of lookup()"""
+        cell = self._cell_scalar(Pr, Tr)
+        if cell is None:
+            return np.nan, np.nan
+        return float(self.z[cell]), float(self.guess[cell])
+
+    def _record_scalar(self, Pr, Tr, z, guess):
+        """scalar version of record()"""
+        cell = self._cell_scalar(Pr, Tr)
+        if cell is not None and np.isnan(self.z[cell]):
+            self.z[cell] = z
+            self.guess[cell] = guess
+
+    def record(self, Pr, Tr, z, guess):
+        """stores the converged z-factors, and the initial guesses that converged, into the empty cells of the points"""
+        Pr, Tr, z, guess = [np.ravel(x).astype(float) for x in np.broadcast_arrays(Pr, Tr, z, guess)]
+        k = self._cells(Pr, Tr)
+        z_ = self.z.reshape(-1)
+        guess_ = self.guess.reshape(-1)
+        new = (k >= 0) & np.isfinite(z)
+        new[new] = np.isnan(z_[k[new]])
+        # the first point of each cell within the batch wins
+        k, first = np.unique(k[new], return_index=True)
+        z_[k] = z[new][first]
+        guess_[k] = guess[new][first]
+
+    def warm(self):
+        """solves the z-factor at the center of every empty cell, and records it. Returns the map itself"""
+        Pr, Tr = np.meshgrid(self.Pr, self.Tr)
+        empty = np.isnan(self.z)
+        z_helper.calc_z_array(Pr=Pr[empty], Tr=Tr[empty], zmodel=self.zmodel, guess_map=self)
+        return self
+
+    def clear(self):
+        """empties every cell"""
+        self.z[...] = np.nan
+        self.guess[...] = np.nan
+
+    def merge(self, other):
+        """fills the empty cells with the values of another map of the same zmodel and grid. Returns the map itself"""
+        if (other.zmodel, other.Pr_range, other.Tr_range, other.n_Pr, other.n_Tr) != \
+                (self.zmodel, self.Pr_range, self.Tr_range, self.n_Pr, self.n_Tr):
+            raise ValueError('Guess maps of different z-models or grids can\'t be merged: %s, %s' % (self, other))
+        empty = np.isnan(self.z) & np.isfinite(other.z)
+        self.z[empty] = other.z[empty]
+        self.guess[empty] = other.guess[empty]
+        return self
+
+    def save(self, path):
+        """saves the map into ``path`` (a ``.npz`` file)"""
+        meta = {
+            'format_version': GUESS_MAP_FORMAT_VERSION,
+            'zmodel': self.zmodel,
+            'Pr_range': self.Pr_range,
+            'Tr_range': self.Tr_range,
+            'max_dz': self.max_dz,
+        }
+        np.savez(path, meta=json.dumps(meta), z=self.z, guess=self.guess)
+
+    @classmethod
+    def load(cls, path):
+        """loads a map saved with ``save()``"""
+        with np.load(path) as f:
+            meta = json.loads(str(f['meta']))
+            if meta['format_version'] != GUESS_MAP_FORMAT_VERSION:
+                raise ValueError('Guess map "%s" has format version %s, expected %s' % (path, meta['format_version'], GUESS_MAP_FORMAT_VERSION))
+            guess_map = cls(zmodel=meta['zmodel'], Pr_range=meta['Pr_range'], Tr_range=meta['Tr_range'],
+                            n_Pr=f['z'].shape[1], n_Tr=f['z'].shape[0], max_dz=meta['max_dz'])
+            guess_map.z[...] = f['z']
+            guess_map.guess[...] = f['guess']
+        return guess_map
@@ -1,13 +1,43 @@
 from scipy import optimize
 import numpy as np
+import ast
+import collections
+import functools
+import math
+import os
+import sqlite3
+import threading
 import matplotlib.pyplot as plt
 
 from gascompressibility.z_correlation.DAK import DAK
+from gascompressibility.z_correlation.DAK import DAK_coefficients
+from gascompressibility.z_correlation.DAK import DAK_rho_r
+from gascompressibility.z_correlation.DAK import DAK_rho_r_fprime
+from gascompressibility.z_correlation.DAK import DAK_rho_r_fprime2
+from gascompressibility.z_correlation.DAK import DAK_rho_r_virial
 from gascompressibility.z_correlation.hall_yarborough import hall_yarborough
+from gascompressibility.z_correlation.hall_yarborough import hall_yarborough_coefficients
+from gascompressibility.z_correlation.hall_yarborough import hall_yarborough_y
+from gascompressibility.z_correlation.hall_yarborough import hall_yarborough_y_fprime
+from gascompressibility.z_correlation.hall_yarborough import hall_yarborough_y_fprime2
+from gascompressibility.z_correlation.hall_yarborough import hall_yarborough_y_virial
 from gascompressibility.z_correlation.londono import londono
+from gascompressibility.z_correlation.londono import londono_coefficients
 from gascompressibility.z_correlation.kareem import kareem
+from gascompressibility.z_correlation.papay import papay
+from gascompressibility.z_correlation.beggs_brill import beggs_brill
+from gascompressibility.z_correlation.heidaryan import heidaryan
 from gascompressibility.pseudocritical import Piper
 from gascompressibility.pseudocritical import Sutton
+from gascompressibility.z_correlation.z_guess import high_pressure_guess
+from gascompressibility.z_correlation.z_guess import HIGH_PRESSURE_GUESS_RANGE
+from gascompressibility.z_correlation.z_guess import _HIGH_PRESSURE_GUESS_COEFFICIENTS
+from gascompressibility.z_correlation.z_solver import newton_array
+from gascompressibility.z_correlation.z_solver import bracket_array
+from gascompressibility.z_correlation.z_solver import bracket_newton_array
+from gascompressibility.z_correlation.z_result import ZResult
+from gascompressibility.z_correlation import z_table
+from gascompressibility.z_correlation import z_chebyshev
 
 
 models = {
@@ -15,6 +45,34 @@ models = {
     'hall_yarborough': hall_yarborough,
     'londono': londono,
     'kareem': kareem,
+    'papay': papay,
+    'beggs_brill': beggs_brill,
+    'heidaryan': heidaryan,
+}
+# models evaluated directly, with no root-finding
+explicit_models = ['kareem', 'papay', 'beggs_brill', 'heidaryan']
+# reduced-density kernels of the implicit models: (coefficients, residual, fprime, fprime2). coefficients(Tr) returns
+# the Tr-only terms of the model, whose first item converts Pr into "a", such that z = a / x, where x is the reduced
+# density solved for. The residual and its derivatives are called as func(x, a, *coefficients(Tr)[1:])
+model_kernels = {
+    'DAK': (DAK_coefficients, DAK_rho_r, DAK_rho_r_fprime, DAK_rho_r_fprime2),
+    'hall_yarborough': (hall_yarborough_coefficients, hall_yarborough_y, hall_yarborough_y_fprime, hall_yarborough_y_fprime2),
+    'londono': (londono_coefficients, DAK_rho_r, DAK_rho_r_fprime, DAK_rho_r_fprime2),
+}
+# virial coefficients of the kernels, (B, C, D) of z = 1 + B * x + C * x ** 2 + D * x ** 3, called as
+# virial(*coefficients(Tr)[1:]). Used by the low-pressure branch, _calc_z_virial_helper()
+model_kernel_virials = {
+    'DAK': DAK_rho_r_virial,
+    'hall_yarborough': hall_yarborough_y_virial,
+    'londono': DAK_rho_r_virial,
+}
+# the low-pressure branch is tried only below this Pr. Above it, the series never meets the default tolerance
+VIRIAL_PR_MAX = 1.2
+# upper bounds of the reduced densities solved for by the kernels. Hall-Yarborough's y has a pole at y = 1
+model_kernel_x_max = {
+    'DAK': np.inf,
+    'hall_yarborough': 1.0,
+    'londono': np.inf,
 }
 MODEL_RANGES = {
     'DAK': {
@@ -33,6 +91,19 @@ MODEL_RANGES = {
         'Tr': (1, 3),
         'Pr': (0.2, 15)
     },
+    # Papay's paper gives no range. Within this one, its average error against DAK is below 1%
+    'papay': {
+        'Tr': (1.4, 3),
+        'Pr': (0.2, 5)
+    },
+    'beggs_brill': {
+        'Tr': (1.2, 2.4),
+        'Pr': (0.2, 13)
+    },
+    'heidaryan': {
+        'Tr': (1.2, 3),
+        'Pr': (0.2, 15)
+    },
 }
 
 
@@ -45,8 +116,48 @@ def _check_working_Pr_Tr_range(Pr, Tr, zmodel_str):
     return Pr_is_in_range and Tr_is_in_range
 
 
-zmodels_ks = '["DAK", "hall_yarborough", "londono", "kareem"]'
+def _get_smart_guess(Pr, Tr, zmodel_str):
+    """
+    first of the smart guesses of the implicit z-model "zmodel_str" for scalar Pr and Tr: the explicit "kareem" model
+    within its working range, and the fitted high-pressure guess model (z_guess.py) above it. None outside of both
+    """
+    if _check_working_Pr_Tr_range(Pr, Tr, 'kareem'):
+        return kareem(Pr=Pr, Tr=Tr)
+    if zmodel_str in _HIGH_PRESSURE_GUESS_COEFFICIENTS and \
+            HIGH_PRESSURE_GUESS_RANGE['Pr'][0] <= Pr <= HIGH_PRESSURE_GUESS_RANGE['Pr'][1] and \
+            HIGH_PRESSURE_GUESS_RANGE['Tr'][0] <= Tr <= HIGH_PRESSURE_GUESS_RANGE['Tr'][1]:
+        return high_pressure_guess(Pr=Pr, Tr=Tr, zmodel=zmodel_str)
+    return None
+
+
+def _get_smart_guess_array(Pr, Tr, zmodel_str):
+    """array version of _get_smart_guess(), with NaN outside of both ranges"""
+    guess = np.full(Pr.size, np.nan)
+    in_range = _get_working_Pr_Tr_mask(Pr, Tr, 'kareem')
+    guess[in_range] = kareem(Pr=Pr[in_range], Tr=Tr[in_range])
+    if zmodel_str in _HIGH_PRESSURE_GUESS_COEFFICIENTS:
+        high_pressure = ~in_range & \
+            (Pr >= HIGH_PRESSURE_GUESS_RANGE['Pr'][0]) & (Pr <= HIGH_PRESSURE_GUESS_RANGE['Pr'][1]) & \
+            (Tr >= HIGH_PRESSURE_GUESS_RANGE['Tr'][0]) & (Tr <= HIGH_PRESSURE_GUESS_RANGE['Tr'][1])
+        guess[high_pressure] = high_pressure_guess(Pr=Pr[high_pressure], Tr=Tr[high_pressure], zmodel=zmodel_str)
+    return guess
+
+
+def _get_working_Pr_Tr_mask(Pr, Tr, zmodel_str):
+    """element-wise version of _check_working_Pr_Tr_range()"""
+    Pr_is_in_range = np.logical_and(Pr >= MODEL_RANGES[zmodel_str]['Pr'][0], Pr <= MODEL_RANGES[zmodel_str]['Pr'][1])
+    Tr_is_in_range = np.logical_and(Tr >= MODEL_RANGES[zmodel_str]['Tr'][0], Tr <= MODEL_RANGES[zmodel_str]['Tr'][1])
+    return Pr_is_in_range & Tr_is_in_range
+
+
+zmodels_ks = '["DAK", "hall_yarborough", "londono", "kareem", "papay", "beggs_brill", "heidaryan"]'
 pmodels_ks = '["sutton", "piper"]'
+solvers_ks = '["newton", "halley", "bracket"]'
+engines_ks = '["solver", "table", "chebyshev"]'
+ps_props_formats_ks = '["dict", "structured"]'
+
+# z-values scanned from high to low (low to high reduced density) to bracket the physical root of the implicit models
+_BRACKET_Z_CANDIDATES = np.array([10, 5, 3, 2, 1.5, 1.2, 1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1, 0.05])
 
 
 def _get_guess_constant():
@@ -63,6 +174,12 @@ def _get_z_model(model='DAK'):
     return models[model]
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_cached_coefficients(zmodel_str, Tr):
+    """Tr-only coefficients of the reduced-density kernel, computed once per temperature for scalar calls"""
+    return model_kernels[zmodel_str][0](Tr)
+
+
 def _construct_guess_list_order(guess):
     """reorder t in an order closest to the provided guess"""
     t = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
@@ -74,16 +191,136 @@ def _construct_guess_list_order(guess):
         t.pop(t.index(match))
         reordered.append(match)
         count += 1
-    return list(set(reordered))
+    # drop duplicates (guess may be one of t) while keeping the order
+    return list(dict.fromkeys(reordered))
+
+
+def _construct_guess_array_order(guess):
+    """vectorized version of _construct_guess_list_order(). Each row i is [guess[i], t sorted by closeness to guess[i]]"""
+    t = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    order = np.argsort(np.abs(t[np.newaxis, :] - guess[:, np.newaxis]), axis=1, kind='stable')
+    return np.column_stack([guess, t[order]])
+
+
+def _get_newton_array_kwargs(newton_kwargs):
+    """translates scipy.optimize.newton style kwargs into z_solver.newton_array kwargs"""
+    newton_array_kwargs = {'tol': 1.48e-08, 'rtol': 0.0, 'maxiter': 50}
+    if newton_kwargs is None:
+        return newton_array_kwargs
+    for key, value in newton_kwargs.items():
+        if key not in newton_array_kwargs:
+            raise KeyError(
+                'newton_kwargs "%s" is not supported for array inputs. Supported keys: %s' % (key, list(newton_array_kwargs.keys()))
+            )
+        newton_array_kwargs[key] = value
+    return newton_array_kwargs
+
+
+def _check_zmodel_arguments(zmodel, guess, newton_kwargs, smart_guess, solver, guess_map=None):
+    if solver not in [None, 'newton', 'halley', 'bracket']:
+        raise KeyError(
+            'Solver "%s" is not implemented. Choose from the list of available solvers: %s' % (solver, solvers_ks)
+        )
+    if zmodel in explicit_models:
+        if guess is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "guess"' % zmodel)
+        if newton_kwargs is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "newton_kwargs"' % zmodel)
+        if smart_guess is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "smart_guess"' % zmodel)
+        if solver is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "solver"' % zmodel)
+        if guess_map is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "guess_map"' % zmodel)
+    if guess_map is not None and guess_map.zmodel != ('DAK' if zmodel == 'auto' else zmodel):
+        raise KeyError('calc_z(zmodel="%s") got a guess map of zmodel "%s"' % (zmodel, guess_map.zmodel))
+
+
+# single numbers taken by the scalar fast path of calc_z()
+_SCALAR_TYPES = (float, int, np.number)
+_OPTIONAL_SCALAR_TYPES = (float, int, np.number, type(None))
+
+
+def _is_array_input(*values):
+    for value in values:
+        if value is not None and not isinstance(value, (int, float)) and np.ndim(value) > 0:
+            return True
+    return False
 
-def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+
+def _check_ps_props_format(ps_props_format):
+    if ps_props_format not in ['dict', 'structured']:
+        raise KeyError(
+            'ps_props_format "%s" is not implemented. Choose from the list of available formats: %s' % (ps_props_format, ps_props_formats_ks)
+        )
+
+
+def _select_ps_props(names, ps_props):
+    """names of the properties requested with ps_props, which is True (all of them) or a list of names"""
+    if ps_props is True:
+        return names
+    for name in ps_props:
+        if name not in names:
+            raise KeyError(
+                'Property "%s" is not available. Choose from the list of available properties: %s' % (name, list(names))
+            )
+    return tuple(ps_props)
+
+
+def _make_z_result(names, values):
+    """ZResult of scalar properties. numpy scalars and 0-d arrays are converted to Python scalars"""
+    return ZResult._make(names, [value.item() if isinstance(value, (np.generic, np.ndarray)) and np.ndim(value) == 0
+                                 else value for value in values])
+
+
+def _build_ps_props_columns(props, ps_props, ps_props_format):
+    """
+    Columns of the properties requested with ps_props, broadcast to the shape of the z-factors. Returns a dictionary of
+    contiguous arrays, or a structured array with one field per property. The properties not requested are skipped
+    """
+    names = _select_ps_props(tuple(props), ps_props)
+    shape = np.shape(props['z'])
+    if ps_props_format == 'structured':
+        # properties given as inputs instead of calculated (None) are NaN
+        dtype = [(name, float if props[name] is None else np.result_type(props[name])) for name in names]
+        columns = np.empty(shape, dtype=dtype)
+        for name in names:
+            columns[name] = np.nan if props[name] is None else props[name]
+        return columns
+    return {name: None if props[name] is None else _as_column(props[name], shape) for name in names}
+
+
+def _as_column(value, shape):
+    """value as a C-contiguous array of the given shape, copied only if it is broadcast or not contiguous"""
+    value = np.asarray(value)
+    if value.shape == shape and value.flags.c_contiguous:
+        return value
+    return np.broadcast_to(value, shape).copy()
+
+
+def _initialize_pseudocritical_Tr_and_Pr(pmodel, sg, P, T, H2S, CO2, N2, Pr, Tr, ignore_conflict, **kwargs):
+    """returns the pseudo-critical model instance used, and the computed Tr and Pr"""
+    if pmodel == 'piper':
+        pc_instance = Piper()
+        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict, **kwargs)
+    elif pmodel == 'sutton':
+        if N2 is not None:
+            raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
+        pc_instance = Sutton()
+        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict, **kwargs)
+    else:
+        raise KeyError(
+            'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, pmodels_ks)
+        )
+    return pc_instance, Tr, Pr
+
+def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, guess_map=None):
 
     maxiter = 50
     Z = None
-    smart_guess_model = 'kareem'
 
     # Explicit models
-    if zmodel_str in ['kareem']:
+    if zmodel_str in explicit_models:
         Z = zmodel_func(Pr=Pr, Tr=Tr)
 
     # Implicit models: they require iterative convergence
@@ -93,9 +330,8 @@ def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, new
             if Pr < 15:
                 guess = 0.9
             else:
-                # Todo: z-factor after Pr shows linear trend. So fit a linear regression model for each TR and get
-                #  better estimate of initial guess for Pr range greater than 15, which is the working bound of the
-                #  explicit "kareem" model. But for now, guess = 2 gets the job done
+                # fallback of the smart guesses above the working range of "kareem", where the fitted high-pressure
+                # guess model (z_guess.py) makes the first guess
                 guess = 2
         if smart_guess is None:
             smart_guess = True
@@ -103,42 +339,742 @@ def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, new
         worked = False
 
         if smart_guess:
-            # if Pr and Tr is in the range of the "smart_guess_model" (explicit z-model), use that to make first guess
-            if _check_working_Pr_Tr_range(Pr, Tr, smart_guess_model):
-                guess_zmodel_func = _get_z_model(model=smart_guess_model)
-                guess_ = guess_zmodel_func(Pr=Pr, Tr=Tr)
-                guesses = [guess_] + [guess] + _construct_guess_list_order(guess)
+            # if Pr and Tr is in the range of the "kareem" model (explicit z-model), use that to make first guess, and
+            # the fitted high-pressure guess model above it
+            guess_ = _get_smart_guess(Pr, Tr, zmodel_str)
+            if guess_ is not None:
+                guesses = [guess_, guess]
             else:
-                guesses = [guess] + _construct_guess_list_order(guess)
+                guesses = [guess]
 
         else:
             guesses = _construct_guess_list_order(guess)
 
-        for guess_ in guesses:
-            try:
-                if newton_kwargs is None:  # apply default value of max iteration if newton_kwargs is not provided
-                    Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), maxiter=maxiter)
-                else:
-                    if 'maxiter' in newton_kwargs:
-                        Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), **newton_kwargs)
-                    else:
-                        newton_kwargs.pop('maxiter', None)
-                        Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), maxiter=maxiter, **newton_kwargs)
+        # the values stored in the cell of the guess map are tried first, and their roots are accepted only near the
+        # stored z-factor
+        n_stored = 0
+        if guess_map is not None:
+            z_stored, guess_stored = guess_map._lookup_scalar(Pr, Tr)
+            stored = [value for value in [z_stored, guess_stored] if not math.isnan(value)]
+            n_stored = len(stored)
+            guesses = stored + guesses
+
+        # solve for the reduced density, x = a / z
+        _, func, fprime, fprime2 = model_kernels[zmodel_str]
+        coefficients = _get_cached_coefficients(zmodel_str, Tr)
+        a = coefficients[0] * Pr
+        args = (a,) + coefficients[1:]
+
+        # apply default value of max iteration and the analytic derivative, unless overridden by newton_kwargs
+        newton_kwargs_ = {'maxiter': maxiter, 'fprime': fprime}
+        if newton_kwargs is not None:
+            newton_kwargs_.update(newton_kwargs)
+
+        attempts = [newton_kwargs_]
+        if solver == 'halley':
+            # Halley's method can overshoot into a non-physical root (z <= 0) near Tr = 1. Fall back to Newton's method
+            # from the same guess when that happens, or when it fails to converge.
+            attempts = [dict(newton_kwargs_, fprime2=fprime2), newton_kwargs_]
+        elif solver == 'bracket':
+            attempts = []
+
+        guess_worked = np.nan
+        if smart_guess and attempts and Pr <= VIRIAL_PR_MAX:
+            # low-pressure branch: explicit, if the virial series meets the tolerance
+            Z, worked = _calc_z_virial_helper(zmodel_str, args, newton_kwargs_.get('tol', 1.48e-08), newton_kwargs_.get('rtol', 0.0))
+            Z, worked = float(Z), bool(worked)
+
+        if not worked:
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                for i, guess_ in enumerate(guesses):
+                    for newton_kwargs__ in attempts:
+                        try:
+                            Z = a / optimize.newton(func, a / guess_, args=args, **newton_kwargs__)
+                            worked = Z > 0 and (i >= n_stored or abs(Z - z_stored) <= guess_map.max_dz)
+                        except (RuntimeError, ArithmeticError):
+                            pass
+                        if worked:
+                            break
+                    if worked:
+                        guess_worked = guess_
+                        break
+
+        if not worked:
+            # Newton's method failed from every guess (or solver='bracket'). Bracket the physical root and solve it with
+            # the safeguarded Newton-bisection method, which can't diverge
+            args = tuple(np.array([arg], dtype=float) for arg in args)
+            newton_array_kwargs = {key: value for key, value in newton_kwargs_.items() if key in ['tol', 'rtol', 'maxiter']}
+            z, converged = _calc_z_bracket_helper(zmodel_str, args, np.array([guesses[0]], dtype=float), newton_array_kwargs)
+            if converged[0]:
+                Z = z[0]
                 worked = True
-            except:
-                pass
-            if worked:
-                break
 
         if not worked:
             raise RuntimeError("Failed to converge")
 
+        if guess_map is not None:
+            guess_map._record_scalar(Pr, Tr, Z, guess_worked)
+
     return Z
 
 
+def _calc_z_virial_helper(zmodel_str, args, tol=1.48e-08, rtol=0.0):
+    """
+    Explicit low-pressure branch of the implicit models, on scalars or arrays. The virial series of the kernel,
+    z = 1 + B * x + C * x ** 2 + D * x ** 3, is inverted into the pressure series
+    z = 1 + B * a + (C - B ** 2) * a ** 2 + (D - 3 * B * C + 2 * B ** 3) * a ** 3, which is refined with one Newton step
+    of the kernel. The step bounds the error of the series, and a point is accepted if the step is within the tolerance,
+    which is the convergence test of Newton's method itself. The error after the step is of the order of the square of
+    the step. Returns z and a boolean (mask) of the accepted points
+    """
+    a = args[0]
+    _, func, fprime, _ = model_kernels[zmodel_str]
+    B, C, D = model_kernel_virials[zmodel_str](*args[1:])
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        x = a / (1 + a * (B + a * (C - B * B + a * (D - 3 * B * C + 2 * B * B * B))))
+        step = func(x, *args) / fprime(x, *args)
+        x = x - step
+        return a / x, (np.abs(step) <= tol + rtol * np.abs(x)) & (x > 0)
+
+
+def _calc_z_bracket_helper(zmodel_str, args, guess, newton_array_kwargs):
+    """
+    Brackets the physical (lowest reduced density) root of the kernel of the implicit model "zmodel_str", and solves it
+    with the safeguarded Newton-bisection method. args = (a, *coefficients[1:]) and guess (initial guess of z) are
+    1-D arrays. Returns arrays of z and a boolean mask of the points that converged.
+    """
+    _, func, fprime, _ = model_kernels[zmodel_str]
+    a = args[0]
+    x_max = model_kernel_x_max[zmodel_str]
+
+    x_candidates = np.minimum(a[:, np.newaxis] / _BRACKET_Z_CANDIDATES, x_max * (1 - 1e-12))
+    lo, hi, found = bracket_array(func, x_candidates, args=args)
+
+    x = np.full(a.size, np.nan)
+    converged = np.zeros(a.size, dtype=bool)
+    args = tuple(arg[found] for arg in args)
+    x_found, converged_found = bracket_newton_array(
+        func, fprime, lo[found], hi[found], x0=args[0] / guess[found], args=args,
+        **{key: value for key, value in newton_array_kwargs.items() if key in ['tol', 'rtol', 'maxiter']}
+    )
+    # the last step of the bracketing method may be a bisection, which leaves an error of up to the tolerance in the
+    # reduced density, and more in z = a / x at low densities. One Newton step polishes the converged roots to the
+    # accuracy of Newton's method
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        step = func(x_found, *args) / fprime(x_found, *args)
+    polish = converged_found & (np.abs(step) <= 1e-3 * np.abs(x_found))
+    x[found] = np.where(polish, x_found - step, x_found)
+    converged[found] = converged_found
+    return a / x, converged
+
+
+def _newton_multistart_array(func, guesses, args, newton_array_kwargs):
+    """
+    Solves the kernel "func" for z from all candidate initial guesses at once, with the guesses as an extra array axis.
+    guesses is a 2-D array of shape (n, k) in the order of preference, where NaN marks a missing candidate. Returns
+    arrays of z, a boolean mask of the points that converged, and the winning guesses, where z is the root reached by
+    the first (in the order of guesses) candidate that converged to a physical root (z > 0)
+    """
+    n, k = guesses.shape
+    z = np.full((n, k), np.nan)
+    valid = np.isfinite(guesses)
+    rows = np.broadcast_to(np.arange(n)[:, np.newaxis], (n, k))[valid]
+    args_ = tuple(arg[rows] for arg in args)
+
+    x, converged_ = newton_array(func, args_[0] / guesses[valid], args=args_, **newton_array_kwargs)
+    z_ = args_[0] / x
+    z[valid] = np.where(converged_ & (z_ > 0), z_, np.nan)
+
+    converged = np.isfinite(z)
+    first = np.argmax(converged, axis=1)
+    return z[np.arange(n), first], converged.any(axis=1), guesses[np.arange(n), first]
+
+
+def _calc_z_array_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, guess_map=None):
+    """
+    Array version of _calc_z_explicit_implicit_helper(). Pr and Tr are broadcast against each other, and all points are
+    solved at once with an element-wise Newton loop. With smart_guess, points that fail to converge from the kareem
+    guess are retried from the user guess. Without it, all candidate guesses of _construct_guess_list_order() are
+    advanced in parallel as an extra array axis, and the first one that converged is kept. The points that are still
+    unsolved are bracketed and solved with the safeguarded Newton-bisection method, like the scalar version. With a
+    guess map, the points of its filled cells are first solved from the stored values, and the converged z-factors and
+    winning guesses are recorded into its empty cells.
+    """
+    Pr = np.asarray(Pr, dtype=float)
+    Tr = np.asarray(Tr, dtype=float)
+    shape = np.broadcast_shapes(Pr.shape, Tr.shape)
+
+    # Explicit models
+    if zmodel_str in explicit_models:
+        return zmodel_func(Pr=np.broadcast_to(Pr, shape), Tr=np.broadcast_to(Tr, shape))
+
+    # Implicit models: they require iterative convergence
+    # solve for the reduced density, x = a / z. The Tr-only coefficients are computed before broadcasting, so an
+    # isotherm (scalar Tr) computes them only once
+    _, func, fprime, fprime2 = model_kernels[zmodel_str]
+    coefficients = [np.broadcast_to(c, shape).ravel() for c in model_kernels[zmodel_str][0](Tr)]
+    Pr = np.broadcast_to(Pr, shape).ravel()
+    Tr = np.broadcast_to(Tr, shape).ravel()
+    a = coefficients[0] * Pr
+    args = [a] + coefficients[1:]
+
+    newton_array_kwargs = _get_newton_array_kwargs(newton_kwargs)
+    newton_array_kwargs['fprime'] = fprime
+
+    attempts = [newton_array_kwargs]
+    if solver == 'halley':
+        # same safeguard as the scalar version: fall back to Newton's method on non-physical roots or failures
+        attempts = [dict(newton_array_kwargs, fprime2=fprime2), newton_array_kwargs]
+
+    if guess is None:
+        guess = np.where(Pr < 15, 0.9, 2.0)
+    else:
+        guess = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()
+    if smart_guess is None:
+        smart_guess = True
+
+    if smart_guess:
+        # "kareem" within its working range, and the fitted high-pressure guess model above it. Points
+        # outside of both get NaN, which fails immediately
+        guesses = np.column_stack([_get_smart_guess_array(Pr, Tr, zmodel_str), guess])
+    else:
+        guesses = _construct_guess_array_order(guess)
+
+    if solver == 'bracket':
+        attempts = []
+
+    # most points converge from the kareem guess, so the two smart guesses are tried one after another. The candidates
+    # of the multi-start are solved all at once, which makes the cost independent of which guess works
+    guess_groups = [guesses[:, [i]] for i in range(guesses.shape[1])] if smart_guess else [guesses]
+
+    Z = np.full(Pr.size, np.nan)
+    guess_worked = np.full(Pr.size, np.nan)
+    unsolved = np.arange(Pr.size)
+
+    if smart_guess and attempts:
+        # low-pressure branch: the points where the virial series meets the tolerance are solved explicitly
+        low = np.flatnonzero(Pr <= VIRIAL_PR_MAX)
+        if low.size > 0:
+            z, accepted = _calc_z_virial_helper(
+                zmodel_str, tuple(arg[low] for arg in args), newton_array_kwargs['tol'], newton_array_kwargs['rtol']
+            )
+            Z[low[accepted]] = z[accepted]
+            unsolved = unsolved[np.isnan(Z)]
+
+    if guess_map is not None:
+        # the values stored in the cells of the guess map are tried first, and their roots are accepted only near the
+        # stored z-factors
+        z_stored, guess_stored = guess_map.lookup(Pr, Tr)
+        for stored in [z_stored, guess_stored]:
+            for newton_array_kwargs_ in attempts:
+                tried = unsolved[np.isfinite(stored[unsolved])]
+                if tried.size == 0:
+                    break
+                z, converged, guess_ = _newton_multistart_array(
+                    func, stored[tried, np.newaxis], tuple(arg[tried] for arg in args), newton_array_kwargs_
+                )
+                converged &= np.abs(z - z_stored[tried]) <= guess_map.max_dz
+                Z[tried[converged]] = z[converged]
+                guess_worked[tried[converged]] = guess_[converged]
+                unsolved = unsolved[np.isnan(Z[unsolved])]
+
+    for guesses_ in guess_groups:
+        for newton_array_kwargs_ in attempts:
+            if unsolved.size == 0:
+                break
+            # non-physical roots (z <= 0) are left to the next attempt, and then to the bracketed solve
+            z, converged, guess_ = _newton_multistart_array(
+                func, guesses_[unsolved], tuple(arg[unsolved] for arg in args), newton_array_kwargs_
+            )
+            Z[unsolved[converged]] = z[converged]
+            guess_worked[unsolved[converged]] = guess_[converged]
+            unsolved = unsolved[~converged]
+
+    if unsolved.size > 0:
+        # Newton's method failed from every guess (or solver='bracket'). Bracket the physical root and solve it with
+        # the safeguarded Newton-bisection method, which can't diverge
+        guess_ = np.where(np.isfinite(guesses[unsolved, 0]), guesses[unsolved, 0], guesses[unsolved, 1])
+        z, converged = _calc_z_bracket_helper(zmodel_str, tuple(arg[unsolved] for arg in args), guess_, newton_array_kwargs)
+        Z[unsolved[converged]] = z[converged]
+        unsolved = unsolved[~converged]
+
+    if unsolved.size > 0:
+        raise RuntimeError("Failed to converge for %d out of %d points" % (unsolved.size, Pr.size))
+
+    if guess_map is not None:
+        guess_map.record(Pr, Tr, Z, guess_worked)
+
+    return Z.reshape(shape)
+
+
+
+def _calc_z_sweep_helper(Pr, Tr, zmodel_func, zmodel_str, newton_kwargs, solver=None, stride=8, max_dz=0.1):
+    """
+    Solves ordered sweeps of (Pr, Tr) along the last axis with warm starts. Every "stride"-th point of each sweep (the
+    anchors, and the last point) is solved with _calc_z_array_explicit_implicit_helper(). The points between two
+    anchors start Newton's method from the z-factor interpolated between them, which usually converges in one or two
+    iterations. Points whose anchors differ by more than max_dz (ex: across a jump between roots near the critical
+    point), that fail to converge, or that converge farther than max_dz from the interpolated guess are re-solved from
+    the standard guesses. All other axes are solved side by side.
+    """
+    Pr = np.asarray(Pr, dtype=float)
+    Tr = np.asarray(Tr, dtype=float)
+    shape = np.broadcast_shapes(Pr.shape, Tr.shape)
+    n = shape[-1] if len(shape) > 0 else 1
+    if zmodel_str in explicit_models or solver == 'bracket' or n <= stride:
+        return _calc_z_array_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, None, newton_kwargs, None, solver)
+
+    Pr = np.broadcast_to(Pr, shape).reshape(-1, n)
+    Tr = np.broadcast_to(Tr, shape).reshape(-1, n)
+    anchors = np.arange(0, n, stride)
+    if anchors[-1] != n - 1:
+        anchors = np.append(anchors, n - 1)
+    Z = np.empty(Pr.shape)
+    Z[:, anchors] = _calc_z_array_explicit_implicit_helper(
+        Pr[:, anchors], Tr[:, anchors], zmodel_func, zmodel_str, None, newton_kwargs, None, solver
+    )
+
+    # interpolate the guesses by the distance travelled along the sweep, which works for sweeps of Pr, Tr, or both
+    s = np.zeros(Pr.shape)
+    s[:, 1:] = np.cumsum(np.abs(np.diff(Pr, axis=1)) + np.abs(np.diff(Tr, axis=1)), axis=1)
+    interior = np.flatnonzero(np.arange(n) % stride != 0)
+    interior = interior[interior != n - 1]
+    left = interior - interior % stride
+    right = np.minimum(left + stride, n - 1)
+    ds = s[:, right] - s[:, left]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.where(ds > 0, (s[:, interior] - s[:, left]) / ds, 0.5)
+    guess = (Z[:, left] + w * (Z[:, right] - Z[:, left])).ravel()
+    warm = (np.abs(Z[:, right] - Z[:, left]) <= max_dz).ravel()
+
+    Pr_ = Pr[:, interior].ravel()
+    Tr_ = Tr[:, interior].ravel()
+    Z_ = np.full(Pr_.size, np.nan)
+    _, func, fprime, fprime2 = model_kernels[zmodel_str]
+    coefficients = [np.broadcast_to(c, Tr_[warm].shape) for c in model_kernels[zmodel_str][0](Tr_[warm])]
+    args = tuple([coefficients[0] * Pr_[warm]] + coefficients[1:])
+    newton_array_kwargs = _get_newton_array_kwargs(newton_kwargs)
+    newton_array_kwargs['fprime'] = fprime
+    if solver == 'halley':
+        newton_array_kwargs['fprime2'] = fprime2
+    x, converged = newton_array(func, args[0] / guess[warm], args=args, **newton_array_kwargs)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = args[0] / x
+    Z_[warm] = np.where(converged & (z > 0) & (np.abs(z - guess[warm]) <= max_dz), z, np.nan)
+
+    cold = np.isnan(Z_)
+    if cold.any():
+        Z_[cold] = _calc_z_array_explicit_implicit_helper(Pr_[cold], Tr_[cold], zmodel_func, zmodel_str, None, newton_kwargs, None, solver)
+    Z[:, interior] = Z_.reshape(-1, interior.size)
+    return Z.reshape(shape)
+
+
+def _get_engine(engine, zmodel):
+    """returns a callable, engine(Pr=..., Tr=...), that evaluates the z-factor of "zmodel" without solving it"""
+    if isinstance(engine, (z_table.ZTable, z_chebyshev.ChebyshevSurrogate)):
+        if engine.zmodel != zmodel:
+            raise KeyError('calc_z(zmodel="%s") got an engine of zmodel "%s"' % (zmodel, engine.zmodel))
+        return engine
+    if engine == 'table':
+        return z_table.get_default_table(zmodel)
+    if engine == 'chebyshev':
+        return z_chebyshev.get_default_surrogate(zmodel)
+    raise KeyError(
+        'Engine "%s" is not implemented. Choose from the list of available engines: %s' % (engine, engines_ks)
+    )
+
+
+def _calc_z_scalar_engine_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, engine=None, guess_map=None):
+    """scalar version of _calc_z_array_engine_helper()"""
+    if engine is None or engine == 'solver':
+        return _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, guess_map)
+    Z = _get_engine(engine, zmodel_str)(Pr=Pr, Tr=Tr)
+    if np.isnan(Z):
+        Z = _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, guess_map)
+    return Z
+
+
+def _calc_z_array_engine_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, engine=None, guess_map=None):
+    """
+    Evaluates the z-factor with the chosen engine. The points the engine can't evaluate (ex: outside of a table) are
+    solved with _calc_z_array_explicit_implicit_helper(), and so are all points with engine=None or engine='solver'
+    """
+    if engine is None or engine == 'solver':
+        return _calc_z_array_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, guess_map)
+
+    engine = _get_engine(engine, zmodel_str)
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    Z = np.array(engine(Pr=Pr, Tr=Tr), dtype=float)
+    missing = np.isnan(Z)
+    if missing.any():
+        if guess is not None:
+            guess = np.broadcast_to(np.asarray(guess, dtype=float), Z.shape)[missing]
+        Z[missing] = _calc_z_array_explicit_implicit_helper(
+            Pr[missing], Tr[missing], zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, guess_map
+        )
+    return Z
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class ZCache(object):
+    """
+    Bounded LRU cache of z-factors keyed on the quantized (Pr, Tr), the z-model, and the solver settings. Enabled with
+    :ref:`enable_z_cache <enable_z_cache>`, it is shared by ``calc_z``, ``calc_z_array`` and ``calc_z_scalar``.
+
+    The key is taken after the pseudo-critical step, so gas mixtures of different compositions that map to the same
+    reduced state share the cached z-factor. Pr and Tr are rounded to ``decimals`` digits, and the z-factor is solved at
+    the rounded point, so that the results don't depend on the order of the calls. Fewer decimals give more hits at the
+    cost of precision: the error of the rounding is about ``0.5 * 10 ** -decimals * (|dZ/dPr| + |dZ/dTr|)``.
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of cached z-factors. The least recently used entries are evicted first
+    decimals : int
+        number of decimals Pr and Tr are rounded to
+
+    Attributes
+    ----------
+    hits : int
+        number of points read from the cache
+    misses : int
+        number of points solved and stored in the cache. Points repeated within one array are solved once
+    """
+
+    def __init__(self, maxsize=65536, decimals=6):
+        self.maxsize = int(maxsize)
+        self.decimals = int(decimals)
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '<gascompressibility.ZCache> %s, decimals=%d' % (self.cache_info(), self.decimals)
+
+    def cache_info(self):
+        """returns the statistics of the cache, (hits, misses, maxsize, currsize), like functools.lru_cache"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        """removes all entries and resets the statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, maxsize):
+        """changes the maximum number of entries, evicting the least recently used entries that don't fit"""
+        with self._lock:
+            self.maxsize = int(maxsize)
+            while len(self._data) > max(self.maxsize, 0):
+                self._data.popitem(last=False)
+
+    def _insert(self, items):
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            for key, Z in items:
+                self._data[key] = Z
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def _load(self, keys):
+        """returns {key: Z} of the keys missing from memory found in a backing store. ZCache has none"""
+        return {}
+
+    def _store(self, items):
+        """writes (key, Z) pairs of newly solved points to a backing store. ZCache has none"""
+        pass
+
+    def _get_or_solve_scalar(self, Pr, Tr, settings, solve, *args):
+        """returns the cached z-factor of (Pr, Tr), or solves it with solve(Pr, Tr, *args) at the rounded point"""
+        Pr = round(float(Pr), self.decimals)
+        Tr = round(float(Tr), self.decimals)
+        key = (Pr, Tr, settings)
+        with self._lock:
+            Z = self._data.get(key)
+            if Z is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return Z
+        Z = self._load([key]).get(key)
+        solved = Z is None
+        if solved:
+            Z = float(solve(Pr, Tr, *args))
+            self._store([(key, Z)])
+        with self._lock:
+            self.misses += solved
+            self.hits += not solved
+        self._insert([(key, Z)])
+        return Z
+
+    def _get_or_solve_array(self, Pr, Tr, settings, solve, *args):
+        """vectorized version of _get_or_solve_scalar(). The points missing from the cache are solved in one batch"""
+        Pr, Tr = np.broadcast_arrays(np.round(np.asarray(Pr, dtype=float), self.decimals),
+                                     np.round(np.asarray(Tr, dtype=float), self.decimals))
+        shape = Pr.shape
+        # repeated points are looked up, and solved, once
+        unique, inverse = np.unique(np.column_stack([Pr.ravel(), Tr.ravel()]), axis=0, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), minlength=len(unique))
+        keys = [Pr_Tr + (settings,) for Pr_Tr in map(tuple, unique.tolist())]
+        Z = np.empty(len(unique))
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._data.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._data.move_to_end(key)
+                    Z[i] = value
+        unsolved = []
+        if missing:
+            loaded = self._load([keys[i] for i in missing])
+            for i in missing:
+                value = loaded.get(keys[i])
+                if value is None:
+                    unsolved.append(i)
+                else:
+                    Z[i] = value
+            if unsolved:
+                Z[unsolved] = solve(unique[unsolved, 0], unique[unsolved, 1], *args)
+            values = Z.tolist()
+            self._store([(keys[i], values[i]) for i in unsolved])
+            self._insert([(keys[i], values[i]) for i in missing])
+        with self._lock:
+            self.hits += Pr.size - int(counts[unsolved].sum())
+            self.misses += len(unsolved)
+        return Z[inverse.ravel()].reshape(shape)
+
+
+# points looked up per query by ZDiskCache. Two parameters per point, within the 999 parameters of old sqlite builds
+_LOAD_CHUNK_SIZE = 490
+
+
+class ZDiskCache(ZCache):
+    """
+    :ref:`ZCache <ZCache>` backed by a sqlite3 database on disk, so that the solved z-factors survive restarts and are
+    shared by the worker processes of batch jobs. Enabled with ``enable_z_cache(path=...)``.
+
+    The in-memory LRU cache is consulted first, then the database, and the points found in neither are solved and
+    written to both. The database runs in WAL mode, which allows concurrent readers alongside a writer, and each
+    process opens its own connection. Rows record the z-model, the solver settings and the version of the library, and
+    rows of other versions are ignored. Points solved with an engine object (ex: a ``ZTable`` instance) are cached
+    in memory only, because the object can't be identified across processes.
+
+    Parameters
+    ----------
+    path : str
+        path of the sqlite3 database. Created if it doesn't exist
+    maxsize : int
+        maximum number of z-factors cached in memory. The database has no size limit
+    decimals : int
+        number of decimals Pr and Tr are rounded to
+    preload : bool
+        set this to True to load the entries of the database into memory at startup (up to ``maxsize``), so that the
+        first calls are as fast as the later ones
+    timeout : float
+        seconds to wait for a lock held by another process before raising ``sqlite3.OperationalError``
+    """
+
+    def __init__(self, path, maxsize=65536, decimals=6, preload=False, timeout=30.0):
+        from gascompressibility import __version__
+
+        super(ZDiskCache, self).__init__(maxsize=maxsize, decimals=decimals)
+        self.path = path
+        self.version = __version__
+        self.timeout = timeout
+        self._connection = None
+        self._pid = None
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS z_cache (Pr REAL NOT NULL, Tr REAL NOT NULL, zmodel TEXT NOT NULL, '
+                'settings TEXT NOT NULL, version TEXT NOT NULL, z REAL NOT NULL, '
+                'PRIMARY KEY (Pr, Tr, zmodel, settings, version))'
+            )
+        if preload:
+            self.preload()
+
+    def __repr__(self):
+        return '<gascompressibility.ZDiskCache> "%s", %s, decimals=%d' % (self.path, self.cache_info(), self.decimals)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared with forked processes, so each process opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _is_persistent(settings):
+        return isinstance(settings[-1], (str, type(None)))
+
+    def _load(self, keys):
+        # the keys of each settings are looked up together, _LOAD_CHUNK_SIZE points per query
+        groups = collections.defaultdict(list)
+        for Pr, Tr, settings in keys:
+            groups[settings] += Pr, Tr
+        loaded = {}
+        with self._lock:
+            connection = self._connect()
+            for settings, values in groups.items():
+                if not self._is_persistent(settings):
+                    continue
+                for i in range(0, len(values), 2 * _LOAD_CHUNK_SIZE):
+                    chunk = values[i:i + 2 * _LOAD_CHUNK_SIZE]
+                    rows = connection.execute(
+                        'WITH points(Pr, Tr) AS (VALUES %s) SELECT z_cache.Pr, z_cache.Tr, z FROM points JOIN z_cache '
+                        'ON z_cache.Pr = points.Pr AND z_cache.Tr = points.Tr WHERE zmodel = ? AND settings = ? AND '
+                        'version = ?' % ', '.join(['(?, ?)'] * (len(chunk) // 2)),
+                        chunk + [settings[0], repr(settings[1:]), self.version]
+                    ).fetchall()
+                    loaded.update(((Pr, Tr, settings), Z) for Pr, Tr, Z in rows)
+        return loaded
+
+    def _store(self, items):
+        rows = [(Pr, Tr, settings[0], repr(settings[1:]), self.version, Z)
+                for (Pr, Tr, settings), Z in items if self._is_persistent(settings)]
+        if not rows:
+            return
+        with self._lock:
+            with self._connect() as connection:
+                connection.executemany('INSERT OR IGNORE INTO z_cache VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def preload(self):
+        """loads the most recently written entries of the current version from the database into memory"""
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT Pr, Tr, zmodel, settings, z FROM z_cache WHERE version = ? ORDER BY rowid DESC LIMIT ?',
+                (self.version, max(self.maxsize, 0))
+            ).fetchall()
+        self._insert([((Pr, Tr, (zmodel,) + ast.literal_eval(settings)), Z) for Pr, Tr, zmodel, settings, Z in reversed(rows)])
+
+    def clear_disk(self):
+        """deletes all entries of the database, of all versions. The entries in memory are kept"""
+        with self._lock:
+            with self._connect() as connection:
+                connection.execute('DELETE FROM z_cache')
+
+    def close(self):
+        """closes the connection of this process to the database"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+_z_cache = None
+
+
+def enable_z_cache(maxsize=65536, decimals=6, path=None, preload=False):
+    """
+    Enables the LRU cache of z-factors (:ref:`ZCache <ZCache>`), replacing the cache enabled before. Useful when the
+    same conditions are computed over and over (ex: telemetry of a field). With ``path``, the cache is persisted to a
+    sqlite3 database shared by all processes that enable it with the same path (:ref:`ZDiskCache <ZDiskCache>`).
+
+    >>> import gascompressibility as gc
+    >>> cache = gc.enable_z_cache(maxsize=10000, decimals=6)
+    >>> gc.calc_z(sg=0.7, P=2010, T=75)
+    0.7366563865111273
+    >>> gc.calc_z(sg=0.7, P=2010, T=75)
+    0.7366563865111273
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=10000, currsize=1)
+    >>> gc.disable_z_cache()
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of cached z-factors
+    decimals : int
+        number of decimals Pr and Tr are rounded to in the keys of the cache
+    path : str
+        path of a sqlite3 database to persist the cache to. The cache is kept in memory only if not provided
+    preload : bool
+        set this to True to load the entries of the database at ``path`` into memory at startup
+
+    >>> cache = gc.enable_z_cache(path='z_cache.sqlite', preload=True)
+
+    Returns
+    -------
+    ZCache or ZDiskCache
+    """
+    global _z_cache
+    if path is None:
+        _z_cache = ZCache(maxsize=maxsize, decimals=decimals)
+    else:
+        _z_cache = ZDiskCache(path, maxsize=maxsize, decimals=decimals, preload=preload)
+    return _z_cache
+
+
+def disable_z_cache():
+    """disables the cache of z-factors enabled with enable_z_cache(), and drops its entries in memory"""
+    global _z_cache
+    if isinstance(_z_cache, ZDiskCache):
+        _z_cache.close()
+    _z_cache = None
+
+
+def get_z_cache():
+    """returns the enabled ZCache object, or None if the cache is disabled"""
+    return _z_cache
+
+
+def _get_cache_settings(zmodel_str, guess, newton_kwargs, smart_guess, solver, engine):
+    """solver settings part of the keys of ZCache"""
+    if newton_kwargs is not None:
+        newton_kwargs = tuple(sorted(newton_kwargs.items()))
+    if engine == 'solver':
+        engine = None
+    return zmodel_str, guess, newton_kwargs, smart_guess, solver, engine
+
+
+def _calc_z_scalar_cache_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, engine=None, guess_map=None):
+    """_calc_z_scalar_engine_helper() behind the cache of z-factors, if enabled"""
+    if _z_cache is None:
+        return _calc_z_scalar_engine_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+    settings = _get_cache_settings(zmodel_str, guess, newton_kwargs, smart_guess, solver, engine)
+    return _z_cache._get_or_solve_scalar(Pr, Tr, settings, _calc_z_scalar_engine_helper, zmodel_func, zmodel_str, guess,
+                                         newton_kwargs, smart_guess, solver, engine, guess_map)
+
+
+def _calc_z_array_cache_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver=None, engine=None, guess_map=None):
+    """_calc_z_array_engine_helper() behind the cache of z-factors, if enabled. Per-point guesses bypass the cache"""
+    if _z_cache is None or np.ndim(guess) > 0:
+        return _calc_z_array_engine_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+    settings = _get_cache_settings(zmodel_str, guess, newton_kwargs, smart_guess, solver, engine)
+    return _z_cache._get_or_solve_array(Pr, Tr, settings, _calc_z_array_engine_helper, zmodel_func, zmodel_str, guess,
+                                        newton_kwargs, smart_guess, solver, engine, guess_map)
+
+
+def _calc_z_array_auto_helper(Pr, Tr, guess, newton_kwargs, smart_guess, solver=None, engine=None, guess_map=None):
+    """
+    zmodel='auto' of calc_z_array(). The explicit "kareem" model is evaluated on the points within its working range,
+    and "DAK" is solved only on the rest. Returns the z-factors, and an array of the names of the models used per point
+    """
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    explicit = _get_working_Pr_Tr_mask(Pr, Tr, 'kareem')
+    Z = np.empty(Pr.shape)
+    Z[explicit] = kareem(Pr=Pr[explicit], Tr=Tr[explicit])
+    if not explicit.all():
+        if np.ndim(guess) > 0:
+            guess = np.broadcast_to(np.asarray(guess, dtype=float), Pr.shape)[~explicit]
+        Z[~explicit] = _calc_z_array_cache_helper(Pr[~explicit], Tr[~explicit], DAK, 'DAK', guess, newton_kwargs,
+                                                  smart_guess, solver, engine, guess_map)
+    return Z, np.where(explicit, 'kareem', 'DAK')
+
 
 def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper', zmodel='DAK',
-           guess=None, newton_kwargs=None, smart_guess=None, ps_props=False, ignore_conflict=False, **kwargs):
+           guess=None, newton_kwargs=None, smart_guess=None, solver=None, engine=None, guess_map=None, ps_props=False,
+           ps_props_format='dict', ignore_conflict=False, **kwargs):
     """
     Calculates the gas compressibility factor, :math:`Z`.
 
@@ -168,7 +1104,12 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
     **Returning all associated pseudo-critical properties computed**
 
     >>> gc.calc_z(sg=0.7, T=75, P=2010, ps_props=True)
-    {'z': 0.7366562810878984, 'Tpc': 371.4335560823552, 'Ppc': 660.6569792741872, 'J': 0.56221847, 'K': 14.450840999999999, 'Tr': 1.4394768357478496, 'Pr': 3.0646766226921294}
+    ZResult(z=0.7366562810878985, Tpc=371.4335560823552, Ppc=660.6569792741872, J=0.56221847, K=14.450840999999999, Tr=1.4394768357478496, Pr=3.0646766226921294)
+
+    **Array inputs are forwarded to** :ref:`gascompressibility.calc_z_array <calc_z_array>`
+
+    >>> gc.calc_z(sg=0.7, T=75, P=[1000, 2010, 3000])
+    array([0.83183139, 0.73665628, 0.76244066])
 
 
 
@@ -203,7 +1144,10 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
     zmodel : str
         choice of a z-correlation model.
         Check :ref:`Theories 2: Z-Factor Correlation Models <theories:2. Z-Factor Correlation Models>` for more information.
-        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'``
+        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` | ``'kareem'`` | ``'papay'`` |
+        ``'beggs_brill'`` | ``'heidaryan'`` | ``'auto'``. ``'auto'`` uses ``'kareem'`` within its working range and
+        ``'DAK'`` outside of it. See
+        :ref:`gascompressibility.calc_z_array <calc_z_array>`
     guess : float
         initial guess of z-value for z-correlation models using iterative convergence (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``).
         NOT RECOMMENDED to manually set this parameter unless the computed :math:`P_r` exceeds 15. If so a default ``guess=2`` is applied, which
@@ -211,7 +1155,11 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
         automatically provide a good initial guess that's fast and accurate.
     newton_kwargs : dict
         dictonary of keyword-arguments used by ``scipy.optimize.newton`` method for z-correlation models that use
-        iterative convergence (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``).
+        iterative convergence (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``). These models are solved for the
+        reduced density, :math:`x`, instead of z (:math:`z = a / x`, where :math:`a` is proportional to :math:`P_r`).
+        Therefore ``'tol'`` and ``'rtol'`` are tolerances on the steps of :math:`x`, not of z. The error of z is about
+        ``tol * z / x``. For a tolerance on z, pass ``tol`` scaled by :math:`x / z`, which ranges over ~0.02-9
+        (``'DAK'`` | ``'londono'``) and ~0.002-1.6 (``'hall_yarborough'``) within ``MODEL_RANGES``
 
         >>> gc.calc_z(sg=0.7, P=2010, T=75, newton_kwargs={'maxiter': 10000})
         0.7366562810878984
@@ -224,9 +1172,48 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
         solution, and improves speed. It provides *"smart"* initial guess with explicit z-models (like ``zmodel='kareem'``)
         for :math:`P_r < 15`. For :math:`P_r > 15`, smart guess is turned off and uses a fixed value of ``guess=2``,
         which is shown to work well. Check :ref:`Theories 2.6: Caveats <theories:2.6. Caveats>` for more information.
-    ps_props : bool
-        set this to `True` to return a dictionary of all associated pseudo-critical properties computed during calculation
-        of the z-factor.
+        At low pressures (:math:`P_r` below ``VIRIAL_PR_MAX = 1.2``), the smart guess first tries an explicit
+        low-pressure branch: the virial series of the z-model, refined by a single Newton step. It is used if that step
+        is within the tolerance of the solver (``newton_kwargs['tol']``), and skips the iterations entirely. This covers
+        most surface and separator conditions.
+    solver : str
+        choice of a root-finding method for z-correlation models using iterative convergence
+        (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``). ``'newton'`` (default) uses the analytic first derivative
+        of the model. ``'halley'`` additionally uses the analytic second derivative for cubic convergence, which
+        typically saves 1~2 iterations per point, and falls back to the Newton step if the Halley step is unsafe.
+        ``'bracket'`` brackets the physical (lowest density) root and solves it with the safeguarded Newton-bisection
+        method, which can't diverge. Regardless of the choice, points where Newton's (or Halley's) method fails from the
+        initial guesses are re-solved with ``'bracket'``.
+        Accepted inputs: ``'newton'`` | ``'halley'`` | ``'bracket'``
+
+        >>> gc.calc_z(sg=0.7, P=2010, T=75, solver='halley')
+        0.7366562810878985
+    engine : str or ZTable or ChebyshevSurrogate
+        ``'solver'`` (default) solves the z-model at every point. ``'table'`` interpolates the z-factor from a
+        precomputed Pr-Tr table of the z-model (:ref:`ZTable <ZTable>`) with no iteration, which is built on the first
+        call and reused afterwards. A ``ZTable`` object (ex: loaded from disk with ``ZTable.load()``) may be passed
+        instead. Points outside of the table are solved. Check ``ZTable.max_error`` for the accuracy of the table. The
+        default tables leave out the cells with interpolation errors above 1e-5 (near the critical point, where they
+        reach ~0.1), whose points are solved, so the errors of ``'table'`` stay below ~1e-5.
+        ``'chebyshev'`` evaluates piecewise Chebyshev expansions of the z-model fitted to an error of 1e-8
+        (:ref:`fit_chebyshev <fit_chebyshev>`), which are fitted on the first call. A ``ChebyshevSurrogate`` object
+        may be passed instead. Points where the expansions don't meet their tolerance (near the critical point) are
+        solved. Accepted inputs: ``'solver'`` | ``'table'`` | ``'chebyshev'`` | ``ZTable`` or ``ChebyshevSurrogate`` object
+
+        >>> gc.calc_z(sg=0.7, P=2010, T=75, engine='table')
+        0.7366562814917523
+    guess_map : GuessMap
+        a :ref:`GuessMap <GuessMap>` of the same ``zmodel``. The solve starts from the z-factor and the initial guess
+        stored in the cell of the point, and records them into the cell if it is empty. Useful for repeated solves near
+        Tr = 1.05 (ex: near-critical gas processing), where the standard guesses often fail before one converges.
+        Applies only to the points solved by the solver (see ``engine``)
+    ps_props : bool or list
+        set this to `True` to return all associated pseudo-critical properties computed during calculation of the
+        z-factor, as a :ref:`ZResult <ZResult>`. It is indexed like the dictionary returned before (ex:
+        ``ps_props['z']``), and ``ps_props.as_dict()`` returns that dictionary. A list of names (ex: ``['z', 'Pr']``)
+        returns only those properties
+    ps_props_format : str
+        layout of the properties of array inputs. Same as ``calc_z_array``
     ignore_conflict : bool
         set this to True to override calculated variables with input keyword arguments.
     kwargs : dict
@@ -250,54 +1237,504 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
 
     Returns
     -------
-    float
-        gas compressibility factor, :math:`Z` (dimensionless)
+    float or ZResult
+        gas compressibility factor, :math:`Z` (dimensionless), or a :ref:`ZResult <ZResult>` with ``ps_props=True``
 
     """
 
-    if zmodel in ['kareem']:
-        if guess is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "guess"' % zmodel)
-        if newton_kwargs is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "newton_kwargs"' % zmodel)
-        if smart_guess is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "smart_guess"' % zmodel)
+    # the most common pattern, calc_z(sg=..., P=..., T=...) with single numbers, skips the array checks, the
+    # pseudo-critical class objects and scipy. N2 with pmodel='sutton' is left to the general path, which raises the
+    # KeyError
+    if isinstance(sg, _SCALAR_TYPES) and isinstance(P, _SCALAR_TYPES) and isinstance(T, _SCALAR_TYPES) and \
+            isinstance(H2S, _OPTIONAL_SCALAR_TYPES) and isinstance(CO2, _OPTIONAL_SCALAR_TYPES) and \
+            isinstance(N2, _OPTIONAL_SCALAR_TYPES) and Pr is None and Tr is None and zmodel != 'auto' and \
+            guess is None and newton_kwargs is None and smart_guess is None and solver is None and engine is None and \
+            guess_map is None and ps_props is False and not kwargs and (N2 is None or pmodel != 'sutton'):
+        return calc_z_scalar(sg, P, T, H2S or 0, CO2 or 0, N2 or 0, pmodel, zmodel)
+
+    if _is_array_input(sg, P, T, H2S, CO2, N2, Pr, Tr, *kwargs.values()):
+        return calc_z_array(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel, zmodel=zmodel,
+                            guess=guess, newton_kwargs=newton_kwargs, smart_guess=smart_guess, solver=solver,
+                            engine=engine, guess_map=guess_map, ps_props=ps_props, ps_props_format=ps_props_format,
+                            ignore_conflict=ignore_conflict, **kwargs)
+
+    if zmodel == 'auto':
+        # the dispatch of zmodel='auto' is vectorized. A single point picks its model the same way
+        result = calc_z_array(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel, zmodel=zmodel,
+                              guess=guess, newton_kwargs=newton_kwargs, smart_guess=smart_guess, solver=solver,
+                              engine=engine, guess_map=guess_map, ps_props=ps_props, ignore_conflict=ignore_conflict,
+                              **kwargs)
+        if ps_props:
+            return _make_z_result(tuple(result), result.values())
+        return float(result)
+
+    _check_zmodel_arguments(zmodel, guess, newton_kwargs, smart_guess, solver, guess_map)
+
+    z_model = _get_z_model(model=zmodel)
+
+    # Pr and Tr are already provided:
+    if Pr is not None and Tr is not None:
+        Z = _calc_z_scalar_cache_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+        if ps_props:
+            props = {'z': Z, 'Pr': Pr, 'Tr': Tr}
+            names = _select_ps_props(('z', 'Pr', 'Tr'), ps_props)
+            return _make_z_result(names, [props[name] for name in names])
+        else:
+            return Z
+
+    # Pr and Tr are NOT provided:
+    pc_instance, Tr, Pr = _initialize_pseudocritical_Tr_and_Pr(pmodel, sg, P, T, H2S, CO2, N2, Pr, Tr, ignore_conflict, **kwargs)
+
+    Z = _calc_z_scalar_cache_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+
+    if ps_props:
+        # the last two pseudo-critical properties are Tr and Pr, which may have been given
+        fields = ('z',) + pc_instance._ps_props_keys
+        values = (Z,) + pc_instance._ps_props_values()[:-2] + (Tr, Pr)
+        if ps_props is not True:
+            names = _select_ps_props(fields, ps_props)
+            values = [values[fields.index(name)] for name in names]
+            fields = names
+        return _make_z_result(fields, values)
+    else:
+        return Z
+
+
+def calc_z_array(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper', zmodel='DAK',
+                 guess=None, newton_kwargs=None, smart_guess=None, solver=None, engine=None, guess_map=None,
+                 ps_props=False, ps_props_format='dict', ignore_conflict=False, **kwargs):
+    """
+    Calculates the gas compressibility factor, :math:`Z`, for arrays of inputs at once.
+
+    Takes the same arguments as :ref:`gascompressibility.calc_z <calc_z>`, but every numeric argument may be a scalar
+    or an array. The arguments are broadcast against each other following the NumPy broadcasting rules, and all points
+    are solved together with an element-wise Newton loop in which converged points drop out of the active set. This
+    is orders of magnitude faster than calling ``calc_z`` in a Python loop.
+
+    **Basic usage:**
+
+    >>> import gascompressibility as gc
+    >>>
+    >>> gc.calc_z_array(sg=0.7, T=75, P=[1000, 2010, 3000])
+    array([0.83183139, 0.73665628, 0.76244066])
+
+    **Broadcasting:**
+
+    >>> import numpy as np
+    >>>
+    >>> Prs = np.linspace(0.2, 30, 299)
+    >>> Trs = np.array([1.05, 1.5, 2.0])[:, np.newaxis]
+    >>> gc.calc_z_array(Pr=Prs, Tr=Trs).shape
+    (3, 299)
+
+    Parameters
+    ----------
+    sg : float or array
+        specific gravity of gas (dimensionless)
+    P : float or array
+        pressure of gas (psig)
+    T : float or array
+        temperature of gas (°F)
+    H2S : float or array
+        mole fraction of H2S (dimensionless)
+    CO2 : float or array
+        mole fraction of CO2 (dimensionless)
+    N2 : float or array
+        mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
+    Pr : float or array
+        pseudo-reduced pressure, Pr (dimensionless)
+    Tr : float or array
+        pseudo-reduced temperature, Tr (dimensionless)
+    pmodel : str
+        choice of a pseudo-critical model. Accepted inputs: ``'sutton'`` | ``'piper'``
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'`` | ``'auto'``. ``'auto'`` evaluates the explicit
+        ``'kareem'`` model on the points within its working range (``MODEL_RANGES['kareem']``: 0.2 <= Pr <= 15,
+        1 <= Tr <= 3), and solves ``'DAK'`` only on the other points. The two models differ by about 0.004 on average
+        inside that range, and by more near the critical point. With ``ps_props=True``, the returned dictionary
+        includes ``'zmodel'``, an array of the model used for each point
+
+        >>> gc.calc_z_array(Pr=[5, 20], Tr=1.5, zmodel='auto', ps_props=True)['zmodel']
+        array(['kareem', 'DAK'], dtype='<U6')
+    guess : float or array
+        initial guess of z-value for z-correlation models using iterative convergence. Same as ``calc_z``
+    newton_kwargs : dict
+        dictionary of keyword-arguments for the element-wise Newton solver. Supported keys: ``'tol'`` | ``'rtol'`` |
+        ``'maxiter'``, with the same meaning as in ``scipy.optimize.newton``. Like ``calc_z``, ``'tol'`` and ``'rtol'``
+        apply to the steps of the reduced density, :math:`x`, and the error of z is about ``tol * z / x``
+    smart_guess : bool
+        ``True`` by default. Same as ``calc_z``
+    solver : str
+        choice of a root-finding method. Accepted inputs: ``'newton'`` | ``'halley'`` | ``'bracket'``. Same as ``calc_z``
+    engine : str or ZTable or ChebyshevSurrogate
+        ``'solver'`` (default) | ``'table'`` | ``'chebyshev'`` | ``ZTable`` or ``ChebyshevSurrogate`` object. Same as
+        ``calc_z``
+    guess_map : GuessMap
+        a :ref:`GuessMap <GuessMap>` of the same ``zmodel``, read and filled by the solve. Same as ``calc_z``
+    ps_props : bool or list
+        set this to `True` to return the columns of all associated pseudo-critical properties computed during
+        calculation of the z-factor, with the same keys as ``calc_z``. A list of names (ex: ``['z', 'Tr', 'Pr']``)
+        returns only those columns, and the others are skipped entirely
+    ps_props_format : str
+        layout of the columns returned with ``ps_props``. Accepted inputs: ``'dict'`` (default), a dictionary of
+        contiguous arrays | ``'structured'``, a NumPy structured array with one field per property. Each column has
+        the shape of the z-factors, and the properties given as inputs instead of calculated are None (NaN in a
+        structured array)
+
+        >>> props = gc.calc_z_array(sg=0.7, T=75, P=[1000, 2010], ps_props=['z', 'Tpc', 'Pr'], ps_props_format='structured')
+        >>> props['Pr']
+        array([1.53589538, 3.06467662])
+        >>> props.dtype.names
+        ('z', 'Tpc', 'Pr')
+    ignore_conflict : bool
+        set this to True to override calculated variables with input keyword arguments.
+    kwargs : dict
+        optional kwargs used by pseudo-critical models. Same as ``calc_z``
+
+    Returns
+    -------
+    array
+        gas compressibility factor, :math:`Z` (dimensionless), in the broadcast shape of the inputs
+
+    """
+    _check_zmodel_arguments(zmodel, guess, newton_kwargs, smart_guess, solver, guess_map)
+    _check_ps_props_format(ps_props_format)
+
+    if zmodel == 'auto':
+        z_model = None
+    else:
+        z_model = _get_z_model(model=zmodel)
+
+    sg, P, T, H2S, CO2, N2, Pr, Tr = [
+        None if value is None else np.asarray(value, dtype=float) for value in [sg, P, T, H2S, CO2, N2, Pr, Tr]
+    ]
+    kwargs = {key: None if value is None else np.asarray(value, dtype=float) for key, value in kwargs.items()}
+
+    # Pr and Tr are already provided:
+    if Pr is not None and Tr is not None:
+        pc_instance = None
+    # Pr and Tr are NOT provided:
+    else:
+        pc_instance, Tr, Pr = _initialize_pseudocritical_Tr_and_Pr(pmodel, sg, P, T, H2S, CO2, N2, Pr, Tr, ignore_conflict, **kwargs)
+
+    if zmodel == 'auto':
+        Z, zmodels = _calc_z_array_auto_helper(Pr, Tr, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+    else:
+        Z = _calc_z_array_cache_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess, solver, engine, guess_map)
+
+    if ps_props:
+        props = {'z': Z}
+        if pc_instance is not None:
+            props.update(pc_instance.ps_props)
+        props['Tr'] = Tr
+        props['Pr'] = Pr
+        if zmodel == 'auto':
+            props['zmodel'] = zmodels
+        return _build_ps_props_columns(props, ps_props, ps_props_format)
+    else:
+        return Z
+
+
+def calc_z_sweep(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper', zmodel='DAK',
+                 newton_kwargs=None, solver=None, stride=8, max_dz=0.1, ps_props=False, ps_props_format='dict',
+                 ignore_conflict=False, **kwargs):
+    """
+    Calculates the gas compressibility factor, :math:`Z`, of ordered sweeps, like pressure depletion histories,
+    wellbore traverses, or the :math:`P_r` axis of ``quickstart``. The inputs are broadcast like ``calc_z_array``,
+    and the last axis of the broadcast shape must be the sweep: consecutive points along it must be close to each other
+    (ex: sorted pressures).
+
+    Only every ``stride``-th point of each sweep is solved from the standard initial guesses. The points in between
+    start from the z-factor interpolated between their two solved neighbours, and converge in one or two Newton
+    iterations instead of five or more. Points whose neighbours are more than ``max_dz`` apart (ex: across the jump
+    between roots near the critical point), or that don't converge close to the interpolated guess, fall back to the
+    standard guesses. The results are the same as ``calc_z_array`` within the tolerance of the solver.
+
+    >>> import gascompressibility as gc
+    >>> import numpy as np
+    >>>
+    >>> Prs = np.linspace(0.2, 30, 299)
+    >>> Trs = np.array([1.05, 1.5, 2.0])[:, np.newaxis]
+    >>> gc.calc_z_sweep(Pr=Prs, Tr=Trs).shape
+    (3, 299)
+    >>> gc.calc_z_sweep(sg=0.7, T=75, P=np.arange(5000, 0, -100))[:3]
+    array([0.95325628, 0.94224222, 0.9312998 ])
+
+    Parameters
+    ----------
+    sg : float or array
+        specific gravity of gas (dimensionless)
+    P : float or array
+        pressure of gas (psig)
+    T : float or array
+        temperature of gas (°F)
+    H2S : float or array
+        mole fraction of H2S (dimensionless)
+    CO2 : float or array
+        mole fraction of CO2 (dimensionless)
+    N2 : float or array
+        mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
+    Pr : float or array
+        pseudo-reduced pressure, Pr (dimensionless)
+    Tr : float or array
+        pseudo-reduced temperature, Tr (dimensionless)
+    pmodel : str
+        choice of a pseudo-critical model. Accepted inputs: ``'sutton'`` | ``'piper'``
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'``
+    newton_kwargs : dict
+        dictionary of keyword-arguments for the element-wise Newton solver. Same as ``calc_z_array``
+    solver : str
+        choice of a root-finding method. Accepted inputs: ``'newton'`` | ``'halley'`` | ``'bracket'``. Same as
+        ``calc_z``. ``'bracket'`` doesn't use warm starts
+    stride : int
+        spacing of the points of each sweep solved from the standard initial guesses
+    max_dz : float
+        largest difference of the z-factor between two solved neighbours for the points between them to be warm
+        started, and largest distance of a warm-started root from its initial guess
+    ps_props : bool or list
+        set this to `True` to return the columns of all associated pseudo-critical properties computed during
+        calculation of the z-factor, or a list of the names of the columns returned. Same as ``calc_z_array``
+    ps_props_format : str
+        ``'dict'`` (default) | ``'structured'``. Same as ``calc_z_array``
+    ignore_conflict : bool
+        set this to True to override calculated variables with input keyword arguments.
+    kwargs : dict
+        optional kwargs used by pseudo-critical models. Same as ``calc_z``
+
+    Returns
+    -------
+    array
+        gas compressibility factor, :math:`Z` (dimensionless), in the broadcast shape of the inputs
+    """
+    _check_zmodel_arguments(zmodel, None, newton_kwargs, None, solver)
+    if int(stride) < 2:
+        raise TypeError('stride must be 2 or greater. Use calc_z_array() to solve every point from the standard guesses')
 
     z_model = _get_z_model(model=zmodel)
 
+    sg, P, T, H2S, CO2, N2, Pr, Tr = [
+        None if value is None else np.asarray(value, dtype=float) for value in [sg, P, T, H2S, CO2, N2, Pr, Tr]
+    ]
+    kwargs = {key: None if value is None else np.asarray(value, dtype=float) for key, value in kwargs.items()}
+
     # Pr and Tr are already provided:
     if Pr is not None and Tr is not None:
-        Z = _calc_z_explicit_implicit_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
-        if ps_props is True:
-            ps_props = {'z': Z, 'Pr': Pr, 'Tr': Tr}
-            return ps_props
+        Z = _calc_z_sweep_helper(Pr, Tr, z_model, zmodel, newton_kwargs, solver, int(stride), max_dz)
+        if ps_props:
+            return _build_ps_props_columns({'z': Z, 'Pr': Pr, 'Tr': Tr}, ps_props, ps_props_format)
         else:
             return Z
 
     # Pr and Tr are NOT provided:
+    pc_instance, Tr, Pr = _initialize_pseudocritical_Tr_and_Pr(pmodel, sg, P, T, H2S, CO2, N2, Pr, Tr, ignore_conflict, **kwargs)
+
+    Z = _calc_z_sweep_helper(Pr, Tr, z_model, zmodel, newton_kwargs, solver, int(stride), max_dz)
+
+    if ps_props:
+        props = {'z': Z}
+        props.update(pc_instance.ps_props)
+        props['Tr'] = Tr
+        props['Pr'] = Pr
+        return _build_ps_props_columns(props, ps_props, ps_props_format)
+    else:
+        return Z
+
+
+# Piper's J and K terms of the impurities, and the ranges of the smart guesses, precomputed for calc_z_scalar()
+_PIPER_J_H2S = 0.45820 * 672.3 / 1306
+_PIPER_J_CO2 = 0.90348 * 547.5 / 1071
+_PIPER_J_N2 = 0.66026 * 227.16 / 492.4
+_PIPER_K_H2S = 0.06534 * 672.3 / math.sqrt(1306)
+_PIPER_K_CO2 = 0.42113 * 547.5 / math.sqrt(1071)
+_PIPER_K_N2 = 0.91249 * 227.16 / math.sqrt(492.4)
+_KAREEM_PR_MIN, _KAREEM_PR_MAX = MODEL_RANGES['kareem']['Pr']
+_KAREEM_TR_MIN, _KAREEM_TR_MAX = MODEL_RANGES['kareem']['Tr']
+_HP_PR_MIN, _HP_PR_MAX = HIGH_PRESSURE_GUESS_RANGE['Pr']
+_HP_TR_MIN, _HP_TR_MAX = HIGH_PRESSURE_GUESS_RANGE['Tr']
+
+
+def _kareem_scalar(Pr, Tr):
+    """kareem() on Python floats, using the math module instead of numpy, with the powers expanded into products"""
+    t = 1 / Tr
+    t2 = t * t
+    t3 = t2 * t
+    u2 = (1 - t) * (1 - t)
+    Pr2 = Pr * Pr
+    A2 = (0.317842 * t * math.exp(0.382216 * u2) * Pr) ** 2
+    B = -7.768354 * t + 14.290531 * t2 + 0.000002 * t3 * t3 * Pr2 * Pr2 * Pr2
+    C = 0.966910 + 0.166720 * t * Pr + 0.096254 * t2 * Pr2 - 0.004693 * t3 * Pr2 * Pr
+    D_Pr = 0.063069 * t * math.exp(-1.966847 * u2) * Pr
+    E = 21.0581 * t - 27.0246 * t2 + 16.23 * t3
+    F = 207.783 * t - 488.161 * t2 + 176.29 * t3
+    G = 1.88453 + 3.05921 * t
+    y = D_Pr / ((1 + A2) / C - A2 * B / (C * C * C))
+    y2 = y * y
+    one_y = 1 - y
+    return D_Pr * (1 + y + y2 - y2 * y) / ((D_Pr + E * y2 - F * y ** G) * one_y * one_y * one_y)
+
+
+def calc_z_scalar(sg, P, T, H2S=0, CO2=0, N2=0, pmodel='piper', zmodel='DAK'):
+    """
+    Low-overhead version of :ref:`gascompressibility.calc_z <calc_z>` for a single point of Python floats.
+
+    Computes the pseudo-critical properties and solves the z-model inline with the ``math`` module, without creating
+    the pseudo-critical class objects, inspecting the call stack, or calling ``scipy.optimize.newton``. It is meant for
+    services that compute one point at a time. ``calc_z`` itself uses this fast path when only ``sg``, ``P``, ``T``,
+    the impurities, ``pmodel`` and ``zmodel`` are passed.
+
+    ``benchmarks/bench_scalar.py`` compares the per-call cost against the general path, which this is about 30 times
+    faster than. The implicit models (``'DAK'``, ``'hall_yarborough'``, ``'londono'``) cost about twice as much as
+    ``'kareem'``, because their time goes to the ``'kareem'`` initial guess and 2-4 Newton iterations.
+
+    >>> import gascompressibility as gc
+    >>> gc.calc_z_scalar(sg=0.7, P=2010, T=75)
+    0.7366562810878984
+
+    The initial guess is made with the ``'kareem'`` model, like ``smart_guess=True`` of ``calc_z``. If Newton's method
+    doesn't converge to a physical root, the point is re-solved with the general solver of ``calc_z``.
+
+    Parameters
+    ----------
+    sg : float
+        specific gravity of gas (dimensionless)
+    P : float
+        pressure of gas (psig)
+    T : float
+        temperature of gas (°F)
+    H2S : float
+        mole fraction of H2S (dimensionless)
+    CO2 : float
+        mole fraction of CO2 (dimensionless)
+    N2 : float
+        mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
+    pmodel : str
+        choice of a pseudo-critical model. Accepted inputs: ``'sutton'`` | ``'piper'``
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'``
+
+    Returns
+    -------
+    float
+        gas compressibility factor, :math:`Z` (dimensionless)
+    """
+    T = T + 459.67
+    P = P + 14.7
+
     if pmodel == 'piper':
-        pc_instance = Piper()
-        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict, **kwargs)
+        J = 0.11582 - _PIPER_J_H2S * H2S - _PIPER_J_CO2 * CO2 - _PIPER_J_N2 * N2 + 0.70729 * sg - 0.099397 * sg * sg
+        K = 3.8216 - _PIPER_K_H2S * H2S - _PIPER_K_CO2 * CO2 - _PIPER_K_N2 * N2 + 17.438 * sg - 3.2191 * sg * sg
+        Tpc = K * K / J
+        Tr = T / Tpc
+        Pr = P * J / Tpc
     elif pmodel == 'sutton':
-        if N2 is not None:
+        if N2:
             raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
-        pc_instance = Sutton()
-        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict, **kwargs)
+        Tpc = 169.2 + 349.5 * sg - 74.0 * sg * sg
+        Ppc = 756.8 - 131.07 * sg - 3.6 * sg * sg
+        A = H2S + CO2
+        e_correction = 120 * (A ** 0.9 - A ** 1.6) + 15 * (H2S ** 0.5 - H2S ** 4)
+        Tpc_corrected = Tpc - e_correction
+        Tr = T / Tpc_corrected
+        Pr = P * (Tpc - H2S * (1 - H2S) * e_correction) / (Ppc * Tpc_corrected)
     else:
         raise KeyError(
             'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, pmodels_ks)
         )
 
-    Z = _calc_z_explicit_implicit_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
+    if _z_cache is None:
+        return _solve_z_scalar(Pr, Tr, zmodel)
+    return _solve_z_scalar_cached(Pr, Tr, zmodel)
 
-    if ps_props is True:
-        ps_props = {'z': Z}
-        ps_props.update(pc_instance.ps_props)
-        ps_props['Tr'] = Tr
-        ps_props['Pr'] = Pr
-        return ps_props
+
+def _solve_z_scalar_cached(Pr, Tr, zmodel):
+    """
+    _solve_z_scalar() through the z-factor cache, if enabled. Used by calc_z_scalar() and GasMixture.z(). Entries are
+    keyed by the settings of calc_z() with its default arguments, which solves the same z-factors
+    """
+    if _z_cache is not None:
+        settings = _get_cache_settings(zmodel, None, None, None, None, None)
+        return _z_cache._get_or_solve_scalar(Pr, Tr, settings, _solve_z_scalar, zmodel)
+    return _solve_z_scalar(Pr, Tr, zmodel)
+
+
+def _solve_z_scalar(Pr, Tr, zmodel):
+    """z-factor solve of calc_z_scalar() on Python floats"""
+    if zmodel in explicit_models and zmodel != 'kareem':
+        return float(models[zmodel](Pr=Pr, Tr=Tr))
+    if Pr <= VIRIAL_PR_MAX and zmodel in model_kernel_virials:
+        # low-pressure branch, like the general solver
+        coefficients = _get_cached_coefficients(zmodel, Tr)
+        Z, accepted = _calc_z_virial_helper(zmodel, (coefficients[0] * Pr,) + coefficients[1:])
+        if accepted:
+            return float(Z)
+
+    if _KAREEM_PR_MIN <= Pr <= _KAREEM_PR_MAX and _KAREEM_TR_MIN <= Tr <= _KAREEM_TR_MAX:
+        guess = _kareem_scalar(Pr, Tr)
+    elif zmodel == 'kareem':
+        return kareem(Pr=Pr, Tr=Tr)
+    elif _HP_PR_MIN <= Pr <= _HP_PR_MAX and _HP_TR_MIN <= Tr <= _HP_TR_MAX and zmodel in _HIGH_PRESSURE_GUESS_COEFFICIENTS:
+        guess = high_pressure_guess(Pr=Pr, Tr=Tr, zmodel=zmodel)
+    elif Pr < 15:
+        guess = 0.9
     else:
-        return Z
+        guess = 2.0
+
+    # inlined Newton's method on the reduced-density kernels, with the same tolerance as scipy.optimize.newton
+    if zmodel == 'DAK' or zmodel == 'londono':
+        a, C1, C2, C3, C4, C5 = DAK_coefficients(Tr) if zmodel == 'DAK' else londono_coefficients(Tr)
+        a = a * Pr
+        x = a / guess
+        for _ in range(50):
+            if x <= 0:
+                break
+            x2 = x * x
+            C5_x2 = C5 * x2
+            e_x = C4 * math.exp(-C5_x2) * x
+            a_x = a / x
+            C3_x4 = C3 * x2 * x2
+            f = 1 + C1 * x + C2 * x2 - C3_x4 * x + e_x * x * (1 + C5_x2) - a_x
+            fprime = C1 + 2 * C2 * x - 5 * C3_x4 + 2 * e_x * (1 + C5_x2 - C5_x2 * C5_x2) + a_x / x
+            step = f / fprime
+            x -= step
+            if abs(step) <= 1.48e-08:
+                if x > 0:
+                    return a / x
+                break
+
+    elif zmodel == 'hall_yarborough':
+        t = 1 / Tr
+        a = 0.06125 * t * math.exp(-1.2 * (1 - t) ** 2) * Pr
+        A2 = 14.76 * t - 9.76 * t * t + 4.58 * t * t * t
+        A3 = 90.7 * t - 242.2 * t * t + 42.4 * t * t * t
+        A4 = 2.18 + 2.82 * t
+        y = a / guess
+        for _ in range(50):
+            if not 0 < y < 1:
+                break
+            y2 = y * y
+            one_y = 1 - y
+            y_A4 = A3 * y ** (A4 - 1)
+            f = -a + (y + y2 + y2 * y - y2 * y2) / (one_y * one_y * one_y) - A2 * y2 + y_A4 * y
+            fprime = (1 + 4 * y + 4 * y2 - 4 * y2 * y + y2 * y2) / (one_y * one_y * one_y * one_y) - 2 * A2 * y + A4 * y_A4
+            step = f / fprime
+            y -= step
+            if abs(step) <= 1.48e-08:
+                if 0 < y < 1:
+                    return a / y
+                break
+
+    elif zmodel == 'kareem':
+        return guess
+
+    else:
+        _get_z_model(model=zmodel)
+
+    # didn't converge to a physical root: re-solve with the general solver, which falls back to the bracketed solve
+    return _calc_z_explicit_implicit_helper(Pr, Tr, models[zmodel], zmodel, None, None, None)
 
 
 def quickstart(
@@ -372,7 +1809,8 @@ def quickstart(
     zmodel : str
         choice of a z-correlation model.
         Check :ref:`Theories 2: Z-Factor Correlation Models <theories:2. Z-Factor Correlation Models>` for more information.
-        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'``
+        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` | ``'kareem'`` | ``'papay'`` |
+        ``'beggs_brill'`` | ``'heidaryan'``
     prmin : float
         minimum value of the :math:`P_r` range
     prmax : float
@@ -433,16 +1871,25 @@ def quickstart(
         'Z': np.array([])
     } for Tr in Trs}
 
-    for Tr in Trs:
-        for Pr in Prs:
+    if 'guess' in kwargs or 'smart_guess' in kwargs or 'engine' in kwargs or 'guess_map' in kwargs:
+        # user-defined initial guesses are solved point by point, exactly like calc_z()
+        for Tr in Trs:
+            for Pr in Prs:
 
-            if zmodel == 'kareem':
-                z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, **kwargs)
-            else:
-                z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, newton_kwargs={'maxiter': 50}, **kwargs)
+                if zmodel in explicit_models:
+                    z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, **kwargs)
+                else:
+                    z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, newton_kwargs={'maxiter': 50}, **kwargs)
 
-            results[Tr]['Z'] = np.append(results[Tr]['Z'], [z], axis=0)
-            results[Tr]['Pr'] = np.append(results[Tr]['Pr'], [Pr], axis=0)
+                results[Tr]['Z'] = np.append(results[Tr]['Z'], [z], axis=0)
+                results[Tr]['Pr'] = np.append(results[Tr]['Pr'], [Pr], axis=0)
+    else:
+        # each isotherm is a sorted sweep of Pr, which is solved with warm starts from the neighbouring points
+        newton_kwargs = None if zmodel in explicit_models else {'maxiter': 50}
+        Zs = calc_z_sweep(Tr=Trs[:, np.newaxis], Pr=Prs, zmodel=zmodel, newton_kwargs=newton_kwargs, **kwargs)
+        for Tr, Z in zip(Trs, Zs):
+            results[Tr]['Z'] = Z
+            results[Tr]['Pr'] = Prs.copy()
 
     label_fontsize = 12
 
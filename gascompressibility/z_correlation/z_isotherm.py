@@ -0,0 +1,166 @@
+import numpy as np
+
+# module import, because z_helper is the public entry point of the z-factor calculations
+from gascompressibility.z_correlation import z_helper
+from gascompressibility.z_correlation.z_table import _hermite_basis
+
+"""
+Isothermal z(P) splines of a fixed gas mixture.
+
+At a fixed temperature and composition, the pseudo-critical properties, Tr, and the Tr-only coefficients of the
+z-model are constant, and the z-factor is a smooth function of pressure alone. It is solved once on an adaptive
+pressure grid, and evaluated anywhere on the grid with a piecewise cubic Hermite spline.
+"""
+
+
+class ZIsotherm(object):
+    """
+    Piecewise cubic Hermite spline of the z-factor against pressure, for a fixed gas mixture at a fixed temperature.
+    Created with :ref:`calc_z_isotherm <calc_z_isotherm>`.
+
+    Evaluating the spline costs about as much as ``np.interp``: one binary search and a cubic polynomial per point.
+
+    Attributes
+    ----------
+    P : array
+        pressures of the nodes of the spline (psig)
+    z : array
+        z-factors at the nodes
+    dz_dP : array
+        derivatives of the z-factor against pressure at the nodes (1/psi)
+    T : float
+        temperature of gas (°F)
+    Tr : float
+        reduced temperature
+    Ppc : float
+        pseudo-critical pressure used to compute the reduced pressure, Pr = P(psia) / Ppc. This is the corrected
+        pseudo-critical pressure for ``pmodel='sutton'``
+    zmodel : str
+        z-correlation model
+    pmodel : str
+        pseudo-critical model
+    max_error : float
+        largest absolute error of the spline found at the midpoints of the intervals while refining the grid
+    """
+
+    def __init__(self, P, z, dz_dP, T, Tr, Ppc, zmodel, pmodel, max_error):
+        self.P = P
+        self.z = z
+        self.dz_dP = dz_dP
+        self.T = T
+        self.Tr = Tr
+        self.Ppc = Ppc
+        self.zmodel = zmodel
+        self.pmodel = pmodel
+        self.max_error = max_error
+
+    def __repr__(self):
+        return '<gascompressibility.ZIsotherm> zmodel="%s", pmodel="%s", T=%s, Tr=%s, P_range=(%s, %s), nodes=%d, max_error=%s' % (
+            self.zmodel, self.pmodel, self.T, self.Tr, self.P[0], self.P[-1], self.P.size, self.max_error
+        )
+
+    def __call__(self, P):
+        """
+        Evaluates the z-factor at pressures P (psig). Points outside of the pressure range of the spline get NaN.
+        Returns a float for scalar inputs, and an array otherwise
+        """
+        P = np.asarray(P, dtype=float)
+        i = np.clip(np.searchsorted(self.P, P, side='right') - 1, 0, self.P.size - 2)
+        P_0 = self.P[i]
+        dP = self.P[i + 1] - P_0
+        h = _hermite_basis((P - P_0) / dP)
+        Z = h[0] * self.z[i] + h[1] * self.z[i + 1] + (h[2] * self.dz_dP[i] + h[3] * self.dz_dP[i + 1]) * dP
+        Z = np.where((P >= self.P[0]) & (P <= self.P[-1]), Z, np.nan)
+        if Z.ndim == 0:
+            return float(Z)
+        return Z
+
+
+def _hermite_midpoints(P, z, dz_dP):
+    """values of the cubic Hermite spline at the midpoints of the intervals"""
+    dP = np.diff(P)
+    return (z[:-1] + z[1:]) / 2 + (dz_dP[:-1] - dz_dP[1:]) * dP / 8
+
+
+def calc_z_isotherm(sg=None, T=None, H2S=None, CO2=None, N2=None, P_range=(0, 10000), pmodel='piper', zmodel='DAK',
+                    tol=1e-8, max_nodes=4096, ignore_conflict=False, **kwargs):
+    """
+    Builds a spline of the z-factor against pressure for a fixed gas mixture at a fixed temperature. The
+    pseudo-critical model runs only once, the z-factor is solved on a pressure grid that is refined until the spline
+    meets ``tol``, and the returned :ref:`ZIsotherm <ZIsotherm>` evaluates the z-factor at any pressure in ``P_range``
+    for about the cost of ``np.interp``. This is meant for depletion forecasts of a reservoir at a constant
+    temperature, where only the pressure changes.
+
+    >>> import gascompressibility as gc
+    >>> isotherm = gc.calc_z_isotherm(sg=0.7, T=75, H2S=0.07, CO2=0.1, P_range=(0, 5000))
+    >>> isotherm(2010)
+    0.7410426230885495
+    >>> isotherm([1000, 2010, 3000])
+    array([0.84656984, 0.74104262, 0.73848559])
+
+    Parameters
+    ----------
+    sg : float
+        specific gravity of gas (dimensionless)
+    T : float
+        temperature of gas (°F)
+    H2S : float
+        mole fraction of H2S (dimensionless)
+    CO2 : float
+        mole fraction of CO2 (dimensionless)
+    N2 : float
+        mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
+    P_range : tuple
+        (min, max) of the pressure of gas covered by the spline (psig)
+    pmodel : str
+        choice of a pseudo-critical model. Accepted inputs: ``'sutton'`` | ``'piper'``
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'``
+    tol : float
+        largest absolute error of the spline allowed at the midpoints of the intervals of the grid
+    max_nodes : int
+        the grid isn't refined beyond this number of nodes. Check ``ZIsotherm.max_error`` if the tolerance can't be
+        met (ex: near the critical point, where the implicit models jump from one root to another)
+    ignore_conflict : bool
+        set this to True to override calculated variables with input keyword arguments.
+    kwargs : dict
+        optional kwargs used by pseudo-critical models. Same as ``calc_z``
+
+    Returns
+    -------
+    ZIsotherm
+    """
+    z_helper._get_z_model(model=zmodel)
+
+    # the pseudo-critical model runs once. Ppc follows from Pr at any pressure, Pr = P(psia) / Ppc
+    P_min, P_max = float(P_range[0]), float(P_range[1])
+    _, Tr, Pr = z_helper._initialize_pseudocritical_Tr_and_Pr(pmodel, sg, P_max, T, H2S, CO2, N2, None, None, ignore_conflict, **kwargs)
+    Ppc = (P_max + 14.7) / Pr
+
+    def solve(P):
+        return z_helper.calc_z_array(Pr=(P + 14.7) / Ppc, Tr=Tr, zmodel=zmodel)
+
+    def solve_derivative(P):
+        # central differences, with a step far below the spacing of the grid
+        dP = 1e-4 * max(P_max - P_min, 1.0) / max_nodes
+        return (solve(P + dP) - solve(P - dP)) / (2 * dP)
+
+    P = np.linspace(P_min, P_max, 17)
+    z = solve(P)
+    dz_dP = solve_derivative(P)
+    max_error = 0.0
+    while True:
+        P_mid = (P[:-1] + P[1:]) / 2
+        z_mid = solve(P_mid)
+        error = np.abs(_hermite_midpoints(P, z, dz_dP) - z_mid)
+        refine = np.flatnonzero(error > tol)
+        if refine.size == 0 or P.size + refine.size > max_nodes:
+            max_error = float(error.max())
+            break
+        # insert the midpoints of the intervals that failed. Their z-factors are already solved
+        P = np.insert(P, refine + 1, P_mid[refine])
+        z = np.insert(z, refine + 1, z_mid[refine])
+        dz_dP = np.insert(dz_dP, refine + 1, solve_derivative(P_mid[refine]))
+
+    return ZIsotherm(P, z, dz_dP, T, float(Tr), float(Ppc), zmodel, pmodel, max_error)
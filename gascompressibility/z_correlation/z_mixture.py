@@ -0,0 +1,106 @@
+from gascompressibility.pseudocritical import piper_pseudocritical
+from gascompressibility.pseudocritical import sutton_pseudocritical
+from gascompressibility.utilities.utilities import _as_float_input
+# module import, because z_helper is the public entry point of the z-factor calculations
+from gascompressibility.z_correlation import z_helper
+
+"""
+Gas mixture of a fixed composition.
+
+The composition of a well's gas is fixed for months, while its pressure and temperature change at every call. The
+pseudo-critical properties depend on the composition alone, so they are computed once, and each z-factor calculation
+reduces to the reduced pressure and temperature, and the solve of the z-model.
+"""
+
+
+class GasMixture(object):
+    """
+    Gas mixture of a fixed composition, with its pseudo-critical properties computed once at construction.
+
+    >>> import gascompressibility as gc
+    >>> gas = gc.GasMixture(sg=0.7, H2S=0.07, CO2=0.1)
+    >>> gas.z(P=2010, T=75)
+    0.7410426218024244
+    >>> gas.z(P=[1000, 2010, 3000], T=75)
+    array([0.84656985, 0.74104262, 0.73848559])
+
+    Parameters
+    ----------
+    sg : float
+        specific gravity of gas (dimensionless)
+    H2S : float
+        mole fraction of H2S (dimensionless)
+    CO2 : float
+        mole fraction of CO2 (dimensionless)
+    N2 : float
+        mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
+    pmodel : str
+        choice of a pseudo-critical model. Accepted inputs: ``'sutton'`` | ``'piper'``
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'`` | ``'auto'``
+
+    Attributes
+    ----------
+    Tpc : float
+        pseudo-critical temperature used to compute the reduced temperature, Tr = T(°R) / Tpc. This is the corrected
+        pseudo-critical temperature for ``pmodel='sutton'``
+    Ppc : float
+        pseudo-critical pressure used to compute the reduced pressure, Pr = P(psia) / Ppc. This is the corrected
+        pseudo-critical pressure for ``pmodel='sutton'``
+    ps_props : dict
+        all pseudo-critical properties of the mixture, as returned by ``piper_pseudocritical`` or
+        ``sutton_pseudocritical``
+    """
+
+    def __init__(self, sg, H2S=None, CO2=None, N2=None, pmodel='piper', zmodel='DAK'):
+        if zmodel != 'auto':
+            z_helper._get_z_model(model=zmodel)
+        if pmodel == 'piper':
+            ps_props = piper_pseudocritical(sg, H2S=H2S, CO2=CO2, N2=N2)
+            Tpc, Ppc = ps_props['Tpc'], ps_props['Ppc']
+        elif pmodel == 'sutton':
+            if N2 is not None:
+                raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
+            ps_props = sutton_pseudocritical(sg, H2S=H2S, CO2=CO2)
+            Tpc, Ppc = ps_props['Tpc_corrected'], ps_props['Ppc_corrected']
+        else:
+            raise KeyError(
+                'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, z_helper.pmodels_ks)
+            )
+        self.sg = sg
+        self.H2S = H2S
+        self.CO2 = CO2
+        self.N2 = N2
+        self.pmodel = pmodel
+        self.zmodel = zmodel
+        self.ps_props = {key: float(value) for key, value in ps_props.items()}
+        self.Tpc = float(Tpc)
+        self.Ppc = float(Ppc)
+
+    def __repr__(self):
+        return '<gascompressibility.GasMixture> sg=%s, H2S=%s, CO2=%s, N2=%s, pmodel="%s", zmodel="%s", Tpc=%s, Ppc=%s' % (
+            self.sg, self.H2S, self.CO2, self.N2, self.pmodel, self.zmodel, self.Tpc, self.Ppc
+        )
+
+    def calc_Tr_and_Pr(self, P, T):
+        """
+        Reduced temperature and pressure of the mixture at pressures P (psig) and temperatures T (°F). Works
+        elementwise on NumPy arrays (or lists) of any broadcastable shapes, and on floats
+        """
+        Tr = (_as_float_input(T) + 459.67) / self.Tpc
+        Pr = (_as_float_input(P) + 14.7) / self.Ppc
+        return Tr, Pr
+
+    def z(self, P, T, **kwargs):
+        """
+        Gas compressibility factor of the mixture at pressures P (psig) and temperatures T (°F). Returns a float for
+        scalar inputs, and an array in the broadcast shape of the inputs otherwise.
+
+        Single points without keyword arguments are solved like ``calc_z_scalar``. Otherwise, the keyword arguments
+        of the z-factor solve of ``calc_z`` are accepted (ex: ``guess``, ``solver``, ``engine``, ``ps_props``)
+        """
+        Tr, Pr = self.calc_Tr_and_Pr(P, T)
+        if not kwargs and self.zmodel != 'auto' and not z_helper._is_array_input(Pr, Tr):
+            return z_helper._solve_z_scalar_cached(float(Pr), float(Tr), self.zmodel)
+        return z_helper.calc_z(Pr=Pr, Tr=Tr, zmodel=self.zmodel, **kwargs)
@@ -0,0 +1,112 @@
+"""
+Compact result object of calc_z(..., ps_props=True).
+
+A dictionary per call costs several hundred bytes, and the attributes of the pseudo-critical objects another dictionary
+each. When the properties of millions of points are retained, the results are ``__slots__`` objects instead, with the
+names of their fields shared between all results of the same layout.
+"""
+
+# one tuple of field names per layout, shared by all the results with that layout
+_fields_cache = {}
+
+
+class ZResult(object):
+    """
+    Properties computed by :ref:`calc_z <calc_z>` with ``ps_props=True``: the z-factor, and the pseudo-critical
+    properties of the model used. A ``__slots__`` object, so it holds no dictionary per instance.
+
+    The properties are read as attributes or with the keys of the dictionary returned before, and ``as_dict()`` returns
+    the equivalent dictionary.
+
+    >>> import gascompressibility as gc
+    >>> result = gc.calc_z(sg=0.7, T=75, P=2010, ps_props=True)
+    >>> result.z, result['Tpc']
+    (0.7366562810878985, 371.4335560823552)
+    >>> result.as_dict()
+    {'z': 0.7366562810878985, 'Tpc': 371.4335560823552, 'Ppc': 660.6569792741872, 'J': 0.56221847, 'K': 14.450840999999999, 'Tr': 1.4394768357478496, 'Pr': 3.0646766226921294}
+
+    Parameters
+    ----------
+    props : dict
+        the properties, by name. Accepted names: ``'z'``, ``'Tpc'``, ``'Ppc'``, ``'J'``, ``'K'``, ``'e_correction'``,
+        ``'Tpc_corrected'``, ``'Ppc_corrected'``, ``'Tr'``, ``'Pr'``, ``'zmodel'``
+    """
+
+    __slots__ = ('_fields', 'z', 'Tpc', 'Ppc', 'J', 'K', 'e_correction', 'Tpc_corrected', 'Ppc_corrected', 'Tr', 'Pr',
+                 'zmodel')
+
+    def __init__(self, **props):
+        for key in props:
+            if key == '_fields' or key not in self.__slots__:
+                raise KeyError('"%s" is not a property of ZResult. Choose from the list of available properties: %s' % (
+                    key, list(self.__slots__[1:])))
+        self._set(tuple(props), tuple(props.values()))
+
+    @classmethod
+    def _make(cls, fields, values):
+        """creates a result from a tuple of field names and a sequence of their values, without a dictionary"""
+        result = cls.__new__(cls)
+        result._set(fields, values)
+        return result
+
+    def _set(self, fields, values):
+        self._fields = _fields_cache.setdefault(fields, fields)
+        for key, value in zip(fields, values):
+            setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, (ZResult, dict)):
+            return self.as_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'ZResult(%s)' % ', '.join('%s=%r' % (key, getattr(self, key)) for key in self._fields)
+
+    def __getstate__(self):
+        return self._fields, tuple(getattr(self, key) for key in self._fields)
+
+    def __setstate__(self, state):
+        self._set(*state)
+
+    def keys(self):
+        """names of the properties, in the order of the dictionary returned before"""
+        return self._fields
+
+    def values(self):
+        """values of the properties"""
+        return tuple(getattr(self, key) for key in self._fields)
+
+    def items(self):
+        """(name, value) pairs of the properties"""
+        return tuple((key, getattr(self, key)) for key in self._fields)
+
+    def get(self, key, default=None):
+        """value of a property, or default if the result doesn't have it"""
+        if key in self._fields:
+            return getattr(self, key)
+        return default
+
+    def as_dict(self):
+        """dictionary of the properties, same as the one returned by calc_z(..., ps_props=True) before"""
+        return {key: getattr(self, key) for key in self._fields}
@@ -0,0 +1,219 @@
+import numpy as np
+
+"""
+Element-wise root finders used by the batched z-factor solver (calc_z_array).
+
+Every function here operates on flat 1-D arrays. Only the points that haven't converged yet (the "active set") are
+advanced in each iteration, so converged points drop out of the computation. The convergence criteria follow
+scipy.optimize.newton: a point is converged when abs(x_new - x_old) <= tol + rtol * abs(x_new).
+"""
+
+
+def newton_array(func, x0, args=(), fprime=None, fprime2=None, tol=1.48e-08, rtol=0.0, maxiter=50):
+    """
+    Vectorized Newton-Raphson (or secant, if ``fprime`` is not provided, or Halley's, if ``fprime2`` is also provided)
+    method.
+
+    Parameters
+    ----------
+    func : callable
+        residual function, ``func(x, *args)``. Must accept 1-D arrays
+    x0 : array
+        1-D array of initial guesses
+    args : tuple
+        extra arguments passed to ``func`` (and ``fprime``). Each must be a 1-D array of the same size as ``x0``
+    fprime : callable
+        derivative of ``func``, ``fprime(x, *args)``. The secant method is used if not provided
+    fprime2 : callable
+        second derivative of ``func``, ``fprime2(x, *args)``. Halley's method is used if provided together with
+        ``fprime``. Like scipy.optimize.newton, a point falls back to the Newton step whenever the Halley correction
+        isn't close enough to 1 (or isn't finite)
+    tol : float
+        absolute tolerance on the step size
+    rtol : float
+        relative tolerance on the step size
+    maxiter : int
+        maximum number of iterations
+
+    Returns
+    -------
+    x : array
+        1-D array of roots. Values of points that failed to converge are undefined
+    converged : array
+        1-D boolean array, ``True`` for the points that converged
+    """
+    x = np.array(x0, dtype=float).ravel()
+    args = tuple(np.asarray(arg, dtype=float).ravel() for arg in args)
+    converged = np.zeros(x.size, dtype=bool)
+    active = np.arange(x.size)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+
+        if fprime is not None:
+            for _ in range(maxiter):
+                if active.size == 0:
+                    break
+                x_a = x[active]
+                args_a = tuple(arg[active] for arg in args)
+                fder = fprime(x_a, *args_a)
+                step = func(x_a, *args_a) / fder
+                if fprime2 is not None:
+                    adj = step * fprime2(x_a, *args_a) / fder / 2
+                    step = np.where(np.abs(adj) < 1, step / (1 - adj), step)
+                x_new = x_a - step
+                x[active] = x_new
+
+                finite = np.isfinite(x_new)
+                done = finite & (np.abs(step) <= tol + rtol * np.abs(x_new))
+                converged[active[done]] = True
+                active = active[finite & ~done]
+
+        else:
+            # same secant start-up as scipy.optimize.newton
+            p0 = x.copy()
+            p1 = x * (1 + 1e-4) + np.where(x >= 0, 1e-4, -1e-4)
+            q0 = func(p0, *args)
+            q1 = func(p1, *args)
+            for _ in range(maxiter):
+                if active.size == 0:
+                    break
+                args_a = tuple(arg[active] for arg in args)
+                p0_a, p1_a, q0_a, q1_a = p0[active], p1[active], q0[active], q1[active]
+                p = p1_a - q1_a * (p1_a - p0_a) / (q1_a - q0_a)
+                x[active] = p
+
+                finite = np.isfinite(p)
+                done = finite & (np.abs(p - p1_a) <= tol + rtol * np.abs(p))
+                converged[active[done]] = True
+                keep = finite & ~done
+                active = active[keep]
+
+                p0[active] = p1_a[keep]
+                q0[active] = q1_a[keep]
+                p1[active] = p[keep]
+                q1[active] = func(p[keep], *tuple(arg[keep] for arg in args_a))
+
+    return x, converged
+
+
+def bracket_array(func, x_candidates, args=()):
+    """
+    Brackets the first root of ``func`` where it changes sign from negative to positive, scanning increasing candidate
+    values of x. Points leave the scan as soon as they are bracketed, so each point costs at most one function
+    evaluation per candidate.
+
+    Parameters
+    ----------
+    func : callable
+        residual function, ``func(x, *args)``. Must accept 1-D arrays
+    x_candidates : array
+        2-D array of shape (n, k) of candidate values of x, increasing along the second axis
+    args : tuple
+        extra arguments passed to ``func``. Each must be a 1-D array of size n
+
+    Returns
+    -------
+    lo : array
+        1-D array of lower bounds of the brackets, where ``func(lo) < 0``
+    hi : array
+        1-D array of upper bounds of the brackets, where ``func(hi) > 0``
+    found : array
+        1-D boolean array, ``True`` for the points that were bracketed
+    """
+    args = tuple(np.asarray(arg, dtype=float).ravel() for arg in args)
+    n, k = x_candidates.shape
+    lo = x_candidates[:, 0].copy()
+    hi = np.full(n, np.nan)
+    found = np.zeros(n, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        active = np.flatnonzero(func(lo, *args) < 0)
+        for j in range(1, k):
+            if active.size == 0:
+                break
+            x_j = x_candidates[active, j]
+            f = func(x_j, *tuple(arg[active] for arg in args))
+            positive = f > 0
+            hi[active[positive]] = x_j[positive]
+            found[active[positive]] = True
+            negative = f < 0
+            lo[active[negative]] = x_j[negative]
+            active = active[~positive]
+
+    return lo, hi, found
+
+
+def bracket_newton_array(func, fprime, lo, hi, x0=None, args=(), tol=1.48e-08, rtol=0.0, maxiter=50):
+    """
+    Vectorized safeguarded Newton-bisection method ("rtsafe"). The root of each point must be bracketed,
+    ``func(lo) < 0 < func(hi)``. A Newton step is taken whenever it stays inside the bracket and shrinks the residual
+    fast enough, and a bisection step otherwise. The bracket shrinks in every iteration, so the method can't diverge.
+
+    Parameters
+    ----------
+    func : callable
+        residual function, ``func(x, *args)``. Must accept 1-D arrays
+    fprime : callable
+        derivative of ``func``, ``fprime(x, *args)``
+    lo : array
+        1-D array of lower bounds of the brackets
+    hi : array
+        1-D array of upper bounds of the brackets
+    x0 : array
+        1-D array of initial guesses. Guesses outside of the bracket are replaced by its midpoint. Midpoints are used
+        if not provided
+    args : tuple
+        extra arguments passed to ``func`` and ``fprime``. Each must be a 1-D array of the same size as ``lo``
+    tol : float
+        absolute tolerance on the step size
+    rtol : float
+        relative tolerance on the step size
+    maxiter : int
+        maximum number of iterations
+
+    Returns
+    -------
+    x : array
+        1-D array of roots
+    converged : array
+        1-D boolean array, ``True`` for the points that converged
+    """
+    lo = np.array(lo, dtype=float).ravel()
+    hi = np.array(hi, dtype=float).ravel()
+    args = tuple(np.asarray(arg, dtype=float).ravel() for arg in args)
+    if x0 is None:
+        x = 0.5 * (lo + hi)
+    else:
+        x0 = np.asarray(x0, dtype=float).ravel()
+        x = np.where((x0 > lo) & (x0 < hi), x0, 0.5 * (lo + hi))
+    dx_old = hi - lo
+    converged = np.zeros(x.size, dtype=bool)
+    active = np.arange(x.size)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(maxiter):
+            if active.size == 0:
+                break
+            x_a = x[active]
+            args_a = tuple(arg[active] for arg in args)
+            f = func(x_a, *args_a)
+            fder = fprime(x_a, *args_a)
+
+            lo_a = np.where(f < 0, x_a, lo[active])
+            hi_a = np.where(f > 0, x_a, hi[active])
+
+            x_newton = x_a - f / fder
+            bisect = ~((x_newton > lo_a) & (x_newton < hi_a)) | (np.abs(2 * f) > np.abs(dx_old[active] * fder))
+            x_new = np.where(bisect, 0.5 * (lo_a + hi_a), x_newton)
+            dx = np.abs(x_new - x_a)
+
+            x[active] = x_new
+            lo[active] = lo_a
+            hi[active] = hi_a
+            dx_old[active] = dx
+
+            done = (f == 0) | (dx <= tol + rtol * np.abs(x_new))
+            converged[active[done]] = True
+            active = active[~done]
+
+    return x, converged
@@ -0,0 +1,486 @@
+import json
+import os
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# module import, because z_helper imports this module for calc_z(..., engine='table')
+from gascompressibility.z_correlation import z_helper
+
+"""
+Precomputed Pr-Tr lookup tables of the z-factor.
+
+The z-factor depends only on (Pr, Tr) for a given z-model, so it is solved once on a uniform grid over the working
+range of the model, and evaluated anywhere in the grid with piecewise bicubic Hermite interpolation, with no iteration.
+Each node stores z and its derivatives in grid units, (z, dz/du, dz/dv, d2z/dudv), where u and v are the Pr and Tr
+indices of the grid.
+"""
+
+TABLE_FORMAT_VERSION = 1
+table_methods_ks = '["cubic", "monotone"]'
+
+# tolerance of the default tables of calc_z(..., engine='table'). The cells near the critical point that don't meet it
+# are solved instead
+DEFAULT_TABLE_TOL = 1e-5
+
+
+def _pchip_derivatives(z, axis):
+    """Fritsch-Carlson derivatives (in grid units) of a uniform grid along "axis". They keep monotone data monotone"""
+    delta = np.diff(z, axis=axis)
+    delta_lo = np.delete(delta, -1, axis=axis)
+    delta_hi = np.delete(delta, 0, axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interior = np.where(delta_lo * delta_hi > 0, 2 / (1 / delta_lo + 1 / delta_hi), 0)
+    first = np.take(delta, [0], axis=axis)
+    last = np.take(delta, [-1], axis=axis)
+    return np.concatenate([first, interior, last], axis=axis)
+
+
+def _max_neighbouring_slope(z, axis):
+    """larger of the absolute slopes (in grid units) of the two cells around each node along the axis"""
+    delta = np.abs(np.diff(z, axis=axis))
+    first = np.take(delta, [0], axis=axis)
+    last = np.take(delta, [-1], axis=axis)
+    return np.maximum(np.concatenate([first, delta], axis=axis), np.concatenate([delta, last], axis=axis))
+
+
+def _with_neighbours(mask):
+    """mask of the cells of "mask", and of the 8 cells around each of them"""
+    n, m = mask.shape
+    padded = np.pad(mask, 1)
+    return np.any([padded[a:a + n, b:b + m] for a in range(3) for b in range(3)], axis=0)
+
+
+def _hermite_basis(s):
+    """cubic Hermite basis functions (h00, h01, h10, h11) on [0, 1]"""
+    s2 = s * s
+    h01 = s2 * (3 - 2 * s)
+    h11 = s2 * (s - 1)
+    return 1 - h01, h01, h11 - s2 + s, h11
+
+
+class ZTable(object):
+    """
+    Lookup table of the z-factor over a uniform Pr-Tr grid, evaluated with bicubic Hermite interpolation.
+
+    >>> import gascompressibility as gc
+    >>> table = gc.ZTable(zmodel='DAK', Tr_range=(1.05, 3))
+    >>> table(Pr=3.0647, Tr=1.4395)
+    0.7366716764385396
+    >>> table.max_error
+    3.447357541813689e-05
+    >>> gc.calc_z(sg=0.7, P=2010, T=75, engine=table)
+    0.7366562816210233
+
+    Near the critical point (Tr close to 1, Pr close to 1) the implicit models jump from one root to another, and no
+    interpolation can follow the jump: errors in z reach ~0.1 there. ``max_error`` reports the largest error found,
+    and ``max_error_location`` where it was found. Narrow ``Tr_range`` (ex: ``Tr_range=(1.05, 3)``) to exclude that
+    region, or set ``tol`` to leave out the cells that don't meet it, like ``ChebyshevSurrogate``.
+
+    The default tables of ``calc_z(..., engine='table')`` cover the working range of the model with
+    ``tol=DEFAULT_TABLE_TOL`` (1e-5). The points in the cells left out get NaN, and are solved by ``calc_z``. The
+    largest error found elsewhere on 400,000 random points with Tr between 1 and 1.3 is ~8e-6 for "DAK", and ~6e-6
+    for "londono" and "hall_yarborough".
+
+    Tables are saved with ``save()`` into a ``.npy`` file (plus a ``.json`` file of the metadata), and memory-mapped
+    with ``ZTable.load()``, so that several worker processes share one copy of the table in memory.
+    Alternatively, ``share()`` copies a table into shared memory, which other processes attach to by name with
+    ``ZTable.attach()``.
+
+    Parameters
+    ----------
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |
+        ``'kareem'`` | ``'papay'`` | ``'beggs_brill'`` | ``'heidaryan'``
+    Pr_range : tuple
+        (min, max) of the reduced pressure. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Pr']``
+    Tr_range : tuple
+        (min, max) of the reduced temperature. Defaults to the working range of the model, ``MODEL_RANGES[zmodel]['Tr']``
+    n_Pr : int
+        number of grid points along Pr
+    n_Tr : int
+        number of grid points along Tr
+    method : str
+        ``'cubic'`` (default) uses derivatives of the solved z-factor at each node, which gives errors of ~1e-9 away
+        from the critical point with the default resolution. ``'monotone'`` uses Fritsch-Carlson (PCHIP) derivatives
+        from the grid values, which doesn't overshoot across the jumps near the critical point, but is less accurate
+        elsewhere. Accepted inputs: ``'cubic'`` | ``'monotone'``
+    check_error : bool
+        set this to ``False`` to skip computing ``max_error``, which solves the z-model once more at the center of
+        every cell. The error is always checked if ``tol`` is set
+    tol : float
+        cells whose interpolation error at the center exceeds ``tol`` are left out, along with the cells around them,
+        because the jumps between roots may fall between the centers. Points in those cells get NaN. ``None``
+        (default) keeps every cell
+
+    Attributes
+    ----------
+    data : array
+        array of shape (n_Tr, n_Pr, 4) of z and its derivatives in grid units, (z, dz/du, dz/dv, d2z/dudv), at each node
+    max_error : float
+        largest absolute interpolation error found at the cell centers, where the error of the interpolation is the
+        largest, excluding the cells left out by ``tol``. ``None`` if not checked
+    max_error_location : tuple
+        (Pr, Tr) of max_error
+    rejected : array
+        boolean array of shape (n_Tr - 1, n_Pr - 1) of the cells left out by ``tol``. ``None`` if no cell is left out
+    """
+
+    def __init__(self, zmodel='DAK', Pr_range=None, Tr_range=None, n_Pr=600, n_Tr=400, method='cubic', check_error=True,
+                 tol=None):
+
+        if zmodel not in z_helper.models.keys():
+            raise KeyError(
+                'Z-factor model "%s" is not implemented. Choose from the list of available models: %s' % (zmodel, z_helper.zmodels_ks)
+            )
+        if method not in ['cubic', 'monotone']:
+            raise KeyError(
+                'Table method "%s" is not implemented. Choose from the list of available methods: %s' % (method, table_methods_ks)
+            )
+
+        self.zmodel = zmodel
+        self.method = method
+        self.Pr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Pr'] if Pr_range is None else Pr_range))
+        self.Tr_range = tuple(float(x) for x in (z_helper.MODEL_RANGES[zmodel]['Tr'] if Tr_range is None else Tr_range))
+        self.n_Pr = int(n_Pr)
+        self.n_Tr = int(n_Tr)
+        self.tol = None if tol is None else float(tol)
+        self.max_error = None
+        self.max_error_location = None
+        self.rejected = None
+
+        self.data = self._build()
+        if check_error or tol is not None:
+            self.check_error()
+
+    def __repr__(self):
+        return '<gascompressibility.ZTable> zmodel="%s", method="%s", Pr_range=%s, Tr_range=%s, shape=(%d, %d), max_error=%s' % (
+            self.zmodel, self.method, self.Pr_range, self.Tr_range, self.n_Tr, self.n_Pr, self.max_error
+        )
+
+    @property
+    def Pr(self):
+        """grid points along Pr"""
+        return np.linspace(self.Pr_range[0], self.Pr_range[1], self.n_Pr)
+
+    @property
+    def Tr(self):
+        """grid points along Tr"""
+        return np.linspace(self.Tr_range[0], self.Tr_range[1], self.n_Tr)
+
+    def _solve(self, Pr, Tr):
+        return z_helper.calc_z_array(Pr=Pr, Tr=Tr, zmodel=self.zmodel)
+
+    def _build(self):
+        Pr, Tr = np.meshgrid(self.Pr, self.Tr)
+        z = self._solve(Pr, Tr)
+
+        if self.method == 'cubic':
+            # central differences of the solved z-factor, with a step of h grid units. Their error (~h^2) is far
+            # below the interpolation error
+            h = 1e-4
+            dPr = h * (self.Pr_range[1] - self.Pr_range[0]) / (self.n_Pr - 1)
+            dTr = h * (self.Tr_range[1] - self.Tr_range[0]) / (self.n_Tr - 1)
+            z_u = (self._solve(Pr + dPr, Tr) - self._solve(Pr - dPr, Tr)) / (2 * h)
+            z_v = (self._solve(Pr, Tr + dTr) - self._solve(Pr, Tr - dTr)) / (2 * h)
+            z_uv = (
+                self._solve(Pr + dPr, Tr + dTr) - self._solve(Pr + dPr, Tr - dTr)
+                - self._solve(Pr - dPr, Tr + dTr) + self._solve(Pr - dPr, Tr - dTr)
+            ) / (4 * h * h)
+
+            # nodes within h of a jump between roots get huge derivatives, which overshoot far into the cells around
+            # them. Use the monotone derivatives at the nodes where the derivative exceeds the neighbouring slopes
+            limited_u = np.abs(z_u) > 3 * _max_neighbouring_slope(z, axis=1)
+            limited_v = np.abs(z_v) > 3 * _max_neighbouring_slope(z, axis=0)
+            z_u = np.where(limited_u, _pchip_derivatives(z, axis=1), z_u)
+            z_v = np.where(limited_v, _pchip_derivatives(z, axis=0), z_v)
+            z_uv = np.where(limited_u | limited_v, 0, z_uv)
+        else:
+            z_u = _pchip_derivatives(z, axis=1)
+            z_v = _pchip_derivatives(z, axis=0)
+            z_uv = np.zeros_like(z)
+
+        return np.stack([z, z_u, z_v, z_uv], axis=-1)
+
+    def check_error(self):
+        """
+        Computes the interpolation error at the center of every cell against the solved z-factor, and stores the
+        largest one in ``max_error`` and ``max_error_location``. With ``tol``, the cells that don't meet it are left
+        out first. Returns ``max_error``
+        """
+        Pr = self.Pr
+        Tr = self.Tr
+        Pr, Tr = np.meshgrid((Pr[1:] + Pr[:-1]) / 2, (Tr[1:] + Tr[:-1]) / 2)
+        self.rejected = None
+        error = np.abs(self(Pr=Pr, Tr=Tr) - self._solve(Pr, Tr))
+        if self.tol is not None:
+            rejected = _with_neighbours(~(error <= self.tol))
+            if rejected.any():
+                self.rejected = rejected
+                error = np.where(rejected, 0, error)
+        i = np.unravel_index(np.argmax(error), error.shape)
+        self.max_error = float(error[i])
+        self.max_error_location = (float(Pr[i]), float(Tr[i]))
+        return self.max_error
+
+    def __call__(self, Pr=None, Tr=None):
+        """
+        Interpolates the z-factor. Pr and Tr are broadcast against each other. Points outside of the table, or in the
+        cells left out by ``tol``, get NaN. Returns a float for scalar inputs, and an array otherwise
+        """
+        Pr_, Tr_ = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+
+        u = (Pr_ - self.Pr_range[0]) / (self.Pr_range[1] - self.Pr_range[0]) * (self.n_Pr - 1)
+        v = (Tr_ - self.Tr_range[0]) / (self.Tr_range[1] - self.Tr_range[0]) * (self.n_Tr - 1)
+        outside = ~((u >= 0) & (u <= self.n_Pr - 1) & (v >= 0) & (v <= self.n_Tr - 1))
+
+        with np.errstate(invalid='ignore'):
+            i = np.where(outside, 0, np.clip(np.floor(u), 0, self.n_Pr - 2)).astype(np.intp)
+            j = np.where(outside, 0, np.clip(np.floor(v), 0, self.n_Tr - 2)).astype(np.intp)
+        if self.rejected is not None:
+            outside = outside | self.rejected[j, i]
+        s = u - i
+        t = v - j
+
+        h_s = _hermite_basis(s)
+        h_t = _hermite_basis(t)
+        nodes = self.data.reshape(-1, 4)
+        k = j * self.n_Pr + i
+
+        # interpolate z and dz/dv along Pr on the two bounding rows of Tr, and then along Tr between the two rows
+        Z = 0
+        for b in [0, 1]:
+            # the 4 values of a node are contiguous, so each corner is a single gather
+            z_0, z_u_0, z_v_0, z_uv_0 = np.moveaxis(np.take(nodes, k + b * self.n_Pr, axis=0), -1, 0)
+            z_1, z_u_1, z_v_1, z_uv_1 = np.moveaxis(np.take(nodes, k + b * self.n_Pr + 1, axis=0), -1, 0)
+            z_b = h_s[0] * z_0 + h_s[1] * z_1 + h_s[2] * z_u_0 + h_s[3] * z_u_1
+            z_v_b = h_s[0] * z_v_0 + h_s[1] * z_v_1 + h_s[2] * z_uv_0 + h_s[3] * z_uv_1
+            Z = Z + h_t[b] * z_b + h_t[2 + b] * z_v_b
+
+        Z = np.where(outside, np.nan, Z)
+        if Z.ndim == 0:
+            return float(Z)
+        return Z
+
+    def _meta(self):
+        return {
+            'format_version': TABLE_FORMAT_VERSION,
+            'zmodel': self.zmodel,
+            'method': self.method,
+            'Pr_range': self.Pr_range,
+            'Tr_range': self.Tr_range,
+            'n_Pr': self.n_Pr,
+            'n_Tr': self.n_Tr,
+            'max_error': self.max_error,
+            'max_error_location': self.max_error_location,
+            'tol': self.tol,
+            'rejected': None if self.rejected is None else _encode_cells(self.rejected),
+        }
+
+    @classmethod
+    def _from_meta(cls, meta, data, source):
+        if meta['format_version'] != TABLE_FORMAT_VERSION:
+            raise ValueError('Table "%s" has format version %s, expected %s' % (source, meta['format_version'], TABLE_FORMAT_VERSION))
+        table = cls.__new__(cls)
+        table.zmodel = meta['zmodel']
+        table.method = meta['method']
+        table.Pr_range = tuple(meta['Pr_range'])
+        table.Tr_range = tuple(meta['Tr_range'])
+        table.n_Pr = meta['n_Pr']
+        table.n_Tr = meta['n_Tr']
+        table.max_error = meta['max_error']
+        table.max_error_location = None if meta['max_error_location'] is None else tuple(meta['max_error_location'])
+        # tables saved before tol was added keep every cell
+        table.tol = meta.get('tol')
+        table.rejected = None
+        if isinstance(meta.get('rejected'), list):
+            table.rejected = _decode_cells(meta['rejected'], (table.n_Tr - 1, table.n_Pr - 1))
+        if data.shape != (table.n_Tr, table.n_Pr, 4):
+            raise ValueError('Table "%s" has shape %s, expected %s' % (source, data.shape, (table.n_Tr, table.n_Pr, 4)))
+        table.data = data
+        return table
+
+    def save(self, path):
+        """
+        Saves the table into ``path`` (a ``.npy`` file), and its metadata into a ``.json`` file of the same name
+        """
+        np.save(path, np.ascontiguousarray(self.data))
+        with open(_meta_path(path), 'w') as f:
+            json.dump(self._meta(), f, indent=4)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """
+        Loads a table saved with ``save()``. By default the table is memory-mapped read-only, so that processes that
+        load the same file share its pages. Set ``mmap_mode=None`` to read it into memory instead
+        """
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        return cls._from_meta(meta, np.load(path, mmap_mode=mmap_mode), path)
+
+    def share(self, name=None):
+        """
+        Copies the table into a new block of shared memory (``multiprocessing.shared_memory``) and returns a
+        ``ZTable`` that reads from it. Other processes of the host attach to the block with ``ZTable.attach(name)``
+        without copying it, so there's one copy of the table per host however many workers use it. Shared tables
+        are also pickled by name, so passing one to a ``multiprocessing.Pool`` worker attaches it instead of copying.
+
+        The block lives until ``unlink()`` is called. Call it once, from the process that created the block, when no
+        worker needs the table anymore.
+
+        >>> table = gc.ZTable(zmodel='DAK').share(name='ztable_DAK')
+        >>> # in each worker process:
+        >>> table = gc.ZTable.attach('ztable_DAK')
+        >>> gc.calc_z(sg=0.7, P=2010, T=75, engine=table)
+
+        Parameters
+        ----------
+        name : str
+            name of the block. A unique name is generated if not provided, which is available as ``table.name``
+
+        Returns
+        -------
+        ZTable
+        """
+        meta = self._meta()
+        # the cells left out by tol follow the table in the block, instead of the header
+        meta['rejected'] = None if self.rejected is None else 'shared'
+        header = json.dumps(meta).encode('utf-8')
+        if len(header) > _SHARED_HEADER_SIZE:
+            raise ValueError('Metadata of the table is too large for the shared memory header (%d bytes)' % len(header))
+        rejected_nbytes = 0 if self.rejected is None else self.rejected.size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_SHARED_HEADER_SIZE + self.data.nbytes + rejected_nbytes)
+        shm.buf[:len(header)] = header
+        shm.buf[len(header):_SHARED_HEADER_SIZE] = bytes(_SHARED_HEADER_SIZE - len(header))
+        data = np.ndarray(self.data.shape, dtype=np.float64, buffer=shm.buf, offset=_SHARED_HEADER_SIZE)
+        data[...] = self.data
+        data.flags.writeable = False
+        table = self._from_meta(meta, data, shm.name)
+        if self.rejected is not None:
+            table.rejected = _shared_rejected(shm, table)
+            table.rejected[...] = self.rejected
+            table.rejected.flags.writeable = False
+        table._shm = shm
+        return table
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attaches to a table shared by another process with ``share()``, without copying it. The returned table reads
+        from the shared block, which must outlive it. Call ``close()`` to detach
+
+        Parameters
+        ----------
+        name : str
+            name of the block, ``table.name`` of the shared table
+
+        Returns
+        -------
+        ZTable
+        """
+        shm = _attach_shared_memory(name)
+        meta = json.loads(bytes(shm.buf[:_SHARED_HEADER_SIZE]).rstrip(b'\0').decode('utf-8'))
+        shape = (meta['n_Tr'], meta['n_Pr'], 4)
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=_SHARED_HEADER_SIZE)
+        data.flags.writeable = False
+        table = cls._from_meta(meta, data, name)
+        if meta.get('rejected') == 'shared':
+            table.rejected = _shared_rejected(shm, table)
+            table.rejected.flags.writeable = False
+        table._shm = shm
+        return table
+
+    @property
+    def name(self):
+        """name of the shared memory block of a shared table, None otherwise"""
+        shm = getattr(self, '_shm', None)
+        return None if shm is None else shm.name
+
+    def close(self):
+        """detaches the table from its shared memory block. The table can't be evaluated afterwards"""
+        shm = getattr(self, '_shm', None)
+        if shm is not None:
+            # the views of the block must be released before it can be closed
+            self.data = None
+            self.rejected = None
+            self._shm = None
+            shm.close()
+
+    def unlink(self):
+        """detaches the table and destroys its shared memory block. Processes still attached keep a valid mapping"""
+        shm = getattr(self, '_shm', None)
+        if shm is not None:
+            self.close()
+            if sys.version_info < (3, 13):
+                # a process attached through the same resource tracker (this process, or a worker it started) has
+                # unregistered the block already. Registering it again keeps unlink()'s unregistration balanced
+                resource_tracker.register(shm._name, 'shared_memory')
+            shm.unlink()
+
+    def __reduce__(self):
+        if getattr(self, '_shm', None) is not None:
+            return ZTable.attach, (self._shm.name,)
+        return super(ZTable, self).__reduce__()
+
+
+def _meta_path(path):
+    return os.path.splitext(str(path))[0] + '.json'
+
+
+def _encode_cells(mask):
+    """[start, stop) runs of the flat indices of the cells of a mask, for the JSON metadata"""
+    edges = np.diff(np.concatenate([[0], mask.ravel().astype(np.int8), [0]]))
+    return np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)], axis=1).tolist()
+
+
+def _decode_cells(runs, shape):
+    """mask of the cells of the runs of _encode_cells()"""
+    mask = np.zeros(shape, dtype=bool)
+    for start, stop in runs:
+        mask.flat[start:stop] = True
+    return mask
+
+
+def _shared_rejected(shm, table):
+    """view of the mask of the cells left out by tol, stored after the table in a shared memory block"""
+    return np.ndarray((table.n_Tr - 1, table.n_Pr - 1), dtype=bool, buffer=shm.buf,
+                      offset=_SHARED_HEADER_SIZE + table.data.nbytes)
+
+
+# bytes reserved for the JSON metadata at the start of a shared memory block. The table follows, page-aligned
+_SHARED_HEADER_SIZE = 4096
+
+
+def _attach_shared_memory(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # before Python 3.13, attaching registers the block with the resource tracker of the process, which destroys it
+    # when the process exits. Only the creator should own the block, so this block alone is unregistered again. The
+    # tracker itself is left alone, so that blocks created by other threads meanwhile are registered as usual
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+# default tables used by calc_z(..., engine='table'), built on first use for each z-model
+_default_tables = {}
+
+
+def get_default_table(zmodel):
+    """
+    returns the default ZTable of "zmodel", and builds it on the first call. The cells that don't meet
+    DEFAULT_TABLE_TOL are left out, so that the points near the critical point are solved
+    """
+    if zmodel not in _default_tables:
+        _default_tables[zmodel] = ZTable(zmodel=zmodel, tol=DEFAULT_TABLE_TOL)
+    return _default_tables[zmodel]
+
+
+def set_default_table(table):
+    """
+    Makes ``table`` the default table of its z-model, used by ``calc_z(..., engine='table')``. Workers that attach a
+    shared table (``ZTable.attach()``) use this to skip building their own
+    """
+    _default_tables[table.zmodel] = table